@@ -18,11 +18,32 @@ class NautobotDataValidationEngineConfig(NautobotAppConfig):
     description = "Provides UI to build custom data validation rules for data in Nautobot."
     base_url = "nautobot-data-validation-engine"
     required_settings = []
-    min_version = "2.1.9"
+    min_version = "2.3.0"
     max_version = "2.9999"
-    default_settings = {}
+    default_settings = {
+        "async_compliance_evaluation": False,
+        "audit_chunk_size": 1000,
+        "builtin_rules_sql_pushdown": True,
+        "change_aware_validation": False,
+        "compliance_outbox_queue": "data_compliance",
+        "compliance_result_batch_size": 1000,
+        "compliance_snapshot_retention_days": 400,
+        "impact_analysis_time_budget": 10,
+        "log_rule_evaluations": False,
+        "regex_pattern_cache_size": 1024,
+        "rule_metrics": False,
+        "rule_statistics_window": 60,
+        "skip_unchanged_compliance_results": False,
+    }
     caching_config = {}
+    middleware = ["nautobot_data_validation_engine.middleware.ValidationScopeMiddleware"]
     docs_view_name = "plugins:nautobot_data_validation_engine:docs"
 
+    def ready(self):
+        """Connect the app's signal handlers once the app registry is ready."""
+        super().ready()
+        # pylint: disable-next=import-outside-toplevel,unused-import
+        from nautobot_data_validation_engine import signals  # noqa: F401
+
 
 config = NautobotDataValidationEngineConfig  # pylint:disable=invalid-name
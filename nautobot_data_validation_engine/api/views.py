@@ -1,12 +1,108 @@
 """API views."""
 
+import copy
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from nautobot.core.api.authentication import TokenPermissions
 from nautobot.extras.api.views import NautobotModelViewSet
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
 
 from nautobot_data_validation_engine import filters, models
 from nautobot_data_validation_engine.api import serializers
-
-
-class RegularExpressionValidationRuleViewSet(NautobotModelViewSet):
+from nautobot_data_validation_engine.export import EXPORT_FORMATS, get_export_response
+from nautobot_data_validation_engine.impact import MAX_SAMPLE_SIZE, iterate_rule_impact
+from nautobot_data_validation_engine.snapshots import MAX_TREND_DAYS, TREND_GROUP_BY_FIELDS, get_trend
+from nautobot_data_validation_engine.summary import GROUP_BY_FIELDS, get_summary
+
+
+class RuleImpactAnalysisViewSetMixin:
+    """Add actions analyzing the impact of a proposed rule, before creating it or editing an existing one."""
+
+    impact_analysis_actions = ("impact_analysis", "edit_impact_analysis")
+
+    class ImpactAnalysisPermissions(TokenPermissions):
+        """As nautobot.core.api.authentication.TokenPermissions, but enforcing view not add permission."""
+
+        perms_map = {
+            "POST": ["%(app_label)s.view_%(model_name)s"],
+        }
+
+    def restrict_queryset(self, request, *args, **kwargs):
+        """Restrict the rules an edit can be analyzed for to those the user can view, as nothing is written."""
+        if self.action in self.impact_analysis_actions and request.user.is_authenticated:
+            self.queryset = self.queryset.restrict(request.user, "view")
+        else:
+            super().restrict_queryset(request, *args, **kwargs)
+
+    def filter_queryset(self, queryset):
+        """Don't filter the rule an edit is analyzed for, as the query parameters of an analysis are not filters."""
+        if self.action in self.impact_analysis_actions:
+            return queryset
+        return super().filter_queryset(queryset)
+
+    @staticmethod
+    def get_impact_analysis_parameters(request):
+        """Return the `sample_size` and `time_budget` keyword arguments of `iterate_rule_impact()` from the query."""
+        try:
+            sample_size = int(request.query_params.get("sample_size", 10))
+            time_budget = float(request.query_params.get("time_budget", 0))
+        except ValueError as error:
+            raise ValidationError({"detail": "sample_size and time_budget must be numbers"}) from error
+        if not 0 <= sample_size <= MAX_SAMPLE_SIZE or time_budget < 0:
+            raise ValidationError(
+                {"detail": f"sample_size must be between 0 and {MAX_SAMPLE_SIZE} and time_budget positive"}
+            )
+        return {"sample_size": sample_size, "time_budget": time_budget or None}
+
+    def stream_rule_impact(self, request, serializer):
+        """Validate the proposed rule and stream the progress and result of its analysis as JSON lines."""
+        serializer.is_valid(raise_exception=True)
+        # As built by ValidatedModelSerializer.validate(), without saving it.
+        model = self.queryset.model
+        concrete_fields = {field.name for field in model._meta.concrete_fields}
+        attrs = {name: value for name, value in serializer.validated_data.items() if name in concrete_fields}
+        if serializer.instance is None:
+            rule = model(**attrs)
+        else:
+            rule = copy.copy(serializer.instance)
+            for name, value in attrs.items():
+                setattr(rule, name, value)
+        kwargs = self.get_impact_analysis_parameters(request)
+        model_class = rule.content_type.model_class()
+        queryset = model_class._default_manager.restrict(request.user, "view")  # pylint: disable=protected-access
+        lines = (
+            json.dumps(result, cls=DjangoJSONEncoder) + "\n"
+            for result in iterate_rule_impact(rule, queryset=queryset, **kwargs)
+        )
+        return StreamingHttpResponse(lines, content_type="application/x-ndjson")
+
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="impact-analysis",
+        permission_classes=[ImpactAnalysisPermissions],
+    )
+    def impact_analysis(self, request):
+        """Analyze how many existing objects would fail to validate against a new rule, without creating it."""
+        return self.stream_rule_impact(request, self.get_serializer(data=request.data))
+
+    @action(
+        detail=True,
+        methods=["post"],
+        url_path="impact-analysis",
+        url_name="edit-impact-analysis",
+        permission_classes=[ImpactAnalysisPermissions],
+    )
+    def edit_impact_analysis(self, request, pk):  # pylint: disable=unused-argument
+        """Analyze how many existing objects would fail to validate against an edited rule, without saving it."""
+        return self.stream_rule_impact(request, self.get_serializer(self.get_object(), data=request.data, partial=True))
+
+
+class RegularExpressionValidationRuleViewSet(RuleImpactAnalysisViewSetMixin, NautobotModelViewSet):
     """View to manage regular expression validation rules."""
 
     queryset = models.RegularExpressionValidationRule.objects.all()
@@ -14,7 +110,7 @@ class RegularExpressionValidationRuleViewSet(NautobotModelViewSet):
     filterset_class = filters.RegularExpressionValidationRuleFilterSet
 
 
-class MinMaxValidationRuleViewSet(NautobotModelViewSet):
+class MinMaxValidationRuleViewSet(RuleImpactAnalysisViewSetMixin, NautobotModelViewSet):
     """View to manage min max expression validation rules."""
 
     queryset = models.MinMaxValidationRule.objects.all()
@@ -43,3 +139,64 @@ class DataComplianceAPIView(NautobotModelViewSet):
 
     queryset = models.DataCompliance.objects.all()
     serializer_class = serializers.DataComplianceSerializer
+    filterset_class = filters.DataComplianceFilterSet
+
+    @action(detail=False, methods=["get"], url_path=f"export/(?P<export_format>{'|'.join(EXPORT_FORMATS)})")
+    def export(self, request, export_format):
+        """Stream the DataCompliance objects matching the filters given as query parameters, as CSV or NDJSON."""
+        return get_export_response(self.filter_queryset(self.get_queryset()), export_format)
+
+    @staticmethod
+    def get_group_by(request, fields):
+        """Return the `fields` given as `group_by` query parameters, in the order of `fields`, or 400 if unknown."""
+        group_by = request.query_params.getlist("group_by")
+        unknown_fields = set(group_by) - set(fields)
+        if unknown_fields:
+            raise ValidationError(
+                {"group_by": f"Unknown field(s) {', '.join(sorted(unknown_fields))}, expected {', '.join(fields)}."}
+            )
+        return tuple(field for field in fields if field in group_by)
+
+    @action(detail=False, methods=["get"])
+    def summary(self, request):
+        """
+        Return the numbers of valid and invalid DataCompliance objects, from the pre-aggregated summary.
+
+        The counts are grouped by the `group_by` query parameters, by default `content_type`, `compliance_class_name`
+        and `validated_attribute`, and can be restricted to the given `content_type` (as `<app_label>.<model>`) and
+        `compliance_class_name` query parameters. The counts aren't restricted by object permission constraints.
+        """
+        group_by = self.get_group_by(request, GROUP_BY_FIELDS) or GROUP_BY_FIELDS
+        rows = get_summary(
+            group_by=group_by,
+            content_types=request.query_params.getlist("content_type"),
+            compliance_class_names=request.query_params.getlist("compliance_class_name"),
+        )
+        valid = sum(row["valid"] for row in rows)
+        invalid = sum(row["invalid"] for row in rows)
+        return Response({"valid": valid, "invalid": invalid, "total": valid + invalid, "results": rows})
+
+    @action(detail=False, methods=["get"])
+    def trend(self, request):
+        """
+        Return the daily numbers of valid and invalid DataCompliance objects, from the daily snapshots.
+
+        The counts cover the last `days` days, 365 by default, and are grouped by the date and the `group_by` query
+        parameters, `content_type` and `compliance_class_name`, if any. They can be restricted to the given
+        `content_type` (as `<app_label>.<model>`) and `compliance_class_name` query parameters. The counts aren't
+        restricted by object permission constraints.
+        """
+        try:
+            days = int(request.query_params.get("days", 365))
+        except ValueError:
+            days = 0
+        if not 1 <= days <= MAX_TREND_DAYS:
+            raise ValidationError({"days": f"Must be an integer between 1 and {MAX_TREND_DAYS}."})
+        group_by = self.get_group_by(request, TREND_GROUP_BY_FIELDS)
+        rows = get_trend(
+            days=days,
+            group_by=group_by,
+            content_types=request.query_params.getlist("content_type"),
+            compliance_class_names=request.query_params.getlist("compliance_class_name"),
+        )
+        return Response({"results": rows})
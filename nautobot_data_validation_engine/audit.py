@@ -0,0 +1,477 @@
+"""Bulk evaluation of the built-in validation rules, used when auditing existing data."""
+
+from collections import defaultdict
+from functools import partial
+from operator import attrgetter, itemgetter
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Count, Q
+from nautobot.extras.plugins import CustomValidator
+from nautobot.extras.registry import registry
+
+from nautobot_data_validation_engine.custom_validators import get_compliance_classes
+from nautobot_data_validation_engine.models import DataCompliance
+from nautobot_data_validation_engine.pushdown import get_violation_filter
+from nautobot_data_validation_engine.rule_cache import rule_cache
+
+
+def iterate_in_chunks(queryset, chunk_size=None):
+    """
+    Yield every object of `queryset`, fetching them in pk-ordered chunks of `chunk_size` (defaults to the app setting).
+
+    Each chunk is fetched with a keyset query (`pk > <last pk of the previous chunk>`), so only one chunk is held in
+    memory at a time and the cost of fetching a chunk does not grow with its position in the table, unlike OFFSET
+    pagination. Any `select_related()` or `prefetch_related()` on the queryset is applied per chunk.
+    """
+    for chunk in iterate_chunks(queryset, chunk_size):
+        yield from chunk
+
+
+def iterate_chunks(queryset, chunk_size=None, get_pk=attrgetter("pk")):
+    """
+    Yield lists of at most `chunk_size` objects of `queryset`, fetched as in `iterate_in_chunks()`.
+
+    For querysets of something else than model instances, e.g. `values_list()` querysets, `get_pk` must return the pk
+    of each of their items.
+    """
+    chunk_size = chunk_size or settings.PLUGINS_CONFIG["nautobot_data_validation_engine"]["audit_chunk_size"]
+    queryset = queryset.order_by("pk")
+    last_pk = None
+    while True:
+        chunk = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        chunk = list(chunk[:chunk_size])
+        if chunk:
+            yield chunk
+        if len(chunk) < chunk_size:
+            return
+        last_pk = get_pk(chunk[-1])
+
+
+def get_pk_ranges(queryset, chunk_size=None):
+    """
+    Split `queryset` into pk ranges of at most `chunk_size` objects (defaults to the app setting).
+
+    Return a list of `(first_pk, last_pk)` tuples, both inclusive. Only the pks are fetched, in keyset-paginated
+    chunks like `iterate_in_chunks()`.
+    """
+    chunk_size = chunk_size or settings.PLUGINS_CONFIG["nautobot_data_validation_engine"]["audit_chunk_size"]
+    queryset = queryset.order_by("pk").values_list("pk", flat=True)
+    ranges = []
+    while True:
+        chunk = queryset if not ranges else queryset.filter(pk__gt=ranges[-1][1])
+        chunk = list(chunk[:chunk_size])
+        if chunk:
+            ranges.append((chunk[0], chunk[-1]))
+        if len(chunk) < chunk_size:
+            return ranges
+
+
+def iterate_orphaned_object_ids(content_type, chunk_size=None):
+    """
+    Yield lists of the `object_id`s of the DataCompliance results of `content_type` whose object no longer exists.
+
+    The distinct object ids of the results are fetched in keyset-paginated chunks of `chunk_size` (defaults to the app
+    setting), and each chunk is checked against the model's table with a single `pk__in` query.
+    """
+    chunk_size = chunk_size or settings.PLUGINS_CONFIG["nautobot_data_validation_engine"]["audit_chunk_size"]
+    model_class = content_type.model_class()
+    object_ids = (
+        DataCompliance.objects.filter(content_type=content_type)
+        .order_by("object_id")
+        .values_list("object_id", flat=True)
+        .distinct()
+    )
+    last_object_id = None
+    while True:
+        chunk = object_ids if last_object_id is None else object_ids.filter(object_id__gt=last_object_id)
+        chunk = list(chunk[:chunk_size])
+        if not chunk:
+            return
+        last_object_id = chunk[-1]
+
+        if model_class is None:
+            # The model itself is gone, e.g. its app was uninstalled.
+            yield chunk
+        else:
+            pks, orphaned = {}, []
+            for object_id in chunk:
+                try:
+                    pks[model_class._meta.pk.to_python(object_id)] = object_id
+                except ValidationError:
+                    orphaned.append(object_id)
+            manager = model_class._default_manager  # pylint: disable=protected-access
+            existing = set(manager.filter(pk__in=pks).values_list("pk", flat=True))
+            orphaned.extend(object_id for pk, object_id in pks.items() if pk not in existing)
+            if orphaned:
+                yield orphaned
+
+        if len(chunk) < chunk_size:
+            return
+
+
+def clean_compliance_rules_results_for_instance(instance, excluded_pks=None, excluded_attributes=None):
+    """Clean compliance results, except those with the given pks or for the given validated attributes."""
+    excluded_pks = excluded_pks or []
+    excluded_attributes = excluded_attributes or []
+    DataCompliance.objects.get_for_object(instance).filter(compliance_class_name__endswith="CustomValidator").exclude(
+        pk__in=excluded_pks
+    ).exclude(validated_attribute__in=excluded_attributes).delete()
+
+
+def get_builtin_rule_validators():
+    """Return `(validator, model_class)` tuples for every model targeted by at least one built-in validation rule."""
+    query = (
+        Q(uniquevalidationrule__isnull=False)
+        | Q(regularexpressionvalidationrule__isnull=False)
+        | Q(minmaxvalidationrule__isnull=False)
+        | Q(requiredvalidationrule__isnull=False)
+    )
+
+    model_classes = [ct.model_class() for ct in ContentType.objects.filter(query).distinct()]
+
+    validators = []
+    for model_class in model_classes:
+        model_custom_validators = registry["plugin_custom_validators"][model_class._meta.label_lower]
+        # Get only DataValidationCustomValidators
+        # otherwise, we would get all validators (more than those dynamically created)
+        validators.extend(
+            (cv, model_class)
+            for cv in model_custom_validators
+            if cv.__name__
+            == f"{model_class._meta.app_label.capitalize()}{model_class._meta.model_name.capitalize()}CustomValidator"
+            and getattr(cv, "clean") != getattr(CustomValidator, "clean")
+        )
+    return validators
+
+
+def get_unique_evaluator(model_class):
+    """Return a BulkUniquenessEvaluator of every UniqueValidationRule of the given model, enabled or not."""
+    return BulkUniquenessEvaluator(
+        model_class,
+        rule_cache.get_for_model(model_class._meta.label_lower, exclude_disabled_rules=False).unique_rules,
+    )
+
+
+def audit_with_compliance_class(compliance_class, objects, result_writer):
+    """Run the given DataComplianceRule class against each of `objects`, returning the number of objects audited."""
+    count = 0
+    for obj in objects:
+        ins = compliance_class(obj)
+        ins.enforce = False
+        ins.result_writer = result_writer
+        ins.clean()
+        count += 1
+    return count
+
+
+def audit_with_builtin_rules(validator, objects, result_writer, unique_evaluator=None):
+    """Run the built-in rules of the given validator against each of `objects`, returning the number audited."""
+    count = 0
+    for validated_object in objects:
+        count += 1
+        try:
+            validator(validated_object).clean(
+                exclude_disabled_rules=False, unique_evaluator=unique_evaluator, skip_unchanged_fields=False
+            )
+            clean_compliance_rules_results_for_instance(instance=validated_object)
+        except ValidationError as error:
+            attribute = list(error.message_dict.keys())[0]
+            validator.get_compliance_result(
+                validator,
+                instance=validated_object,
+                message=error.messages[0],
+                attribute=attribute,
+                valid=False,
+                result_writer=result_writer,
+            )
+            # The result itself is upserted when the writer is flushed.
+            clean_compliance_rules_results_for_instance(instance=validated_object, excluded_attributes=[attribute])
+    return count
+
+
+def audit_queryset_with_builtin_rules(validator, queryset, result_writer, unique_evaluator=None, chunk_size=None):
+    """
+    Run the built-in rules of the given validator against every object of `queryset`, returning the number audited.
+
+    The rules are evaluated column by column with `bulk_audit_with_builtin_rules()` whenever they allow it, and object
+    by object with `audit_with_builtin_rules()` otherwise. With the `builtin_rules_sql_pushdown` app setting, the
+    column by column evaluation is restricted to the objects that may violate a rule, as found by a database filter.
+    """
+    if get_bulk_audit_fields(validator, queryset.model, unique_evaluator=unique_evaluator) is not None:
+        if settings.PLUGINS_CONFIG["nautobot_data_validation_engine"]["builtin_rules_sql_pushdown"]:
+            violation_filter = get_violation_filter(validator, queryset.model)
+            if violation_filter is not None:
+                return pushdown_audit_with_builtin_rules(
+                    validator,
+                    queryset,
+                    violation_filter,
+                    result_writer,
+                    unique_evaluator=unique_evaluator,
+                    chunk_size=chunk_size,
+                )
+        return bulk_audit_with_builtin_rules(
+            validator, queryset, result_writer, unique_evaluator=unique_evaluator, chunk_size=chunk_size
+        )
+    queryset = select_template_relations(
+        queryset, rule_cache.get_for_model(validator.model, exclude_disabled_rules=False).regex_rules
+    )
+    return audit_with_builtin_rules(
+        validator, iterate_in_chunks(queryset, chunk_size), result_writer, unique_evaluator=unique_evaluator
+    )
+
+
+def select_template_relations(queryset, regex_rules):
+    """
+    Fetch along with the objects of `queryset` the related objects that the given regex rules render against.
+
+    The forward relations among the `context_object_attributes` of the context processed rules are added to
+    `select_related()`, the other relations to `prefetch_related()`, so that rendering each rule's template does not
+    query the database for every object.
+    """
+    select, prefetch = [], []
+    for rule in regex_rules:
+        for attribute in rule.context_object_attributes:
+            try:
+                field = queryset.model._meta.get_field(attribute)
+            except FieldDoesNotExist:
+                continue
+            if not field.is_relation:
+                continue
+            # Concrete relations are the forward foreign keys and one-to-one fields, the only ones a join can fetch.
+            related = select if field.concrete and not field.many_to_many else prefetch
+            if attribute not in related:
+                related.append(attribute)
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    return queryset
+
+
+def get_bulk_audit_fields(validator, model_class, unique_evaluator=None):
+    """
+    Return the names of the fields targeted by the built-in rules of `validator`, if they can be audited in bulk.
+
+    Return None if the objects must be audited one at a time instead, because evaluating the rules requires full model
+    instances: when a regular expression rule renders its expression against the object, when a rule targets anything
+    but a concrete non-relational field, when a unique rule is not covered by `unique_evaluator`, or when
+    DataComplianceRule classes, which `BaseValidator.clean()` runs as well, target the model.
+    """
+    model = validator.model
+    if get_compliance_classes(model):
+        return None
+    rules = rule_cache.get_for_model(model, exclude_disabled_rules=False)
+    if any(rule.context_processing for rule in rules.regex_rules):
+        return None
+    if rules.unique_rules and (
+        unique_evaluator is None or not all(rule in unique_evaluator for rule in rules.unique_rules)
+    ):
+        return None
+    fields = []
+    for rule in (*rules.regex_rules, *rules.min_max_rules, *rules.required_rules, *rules.unique_rules):
+        if not is_column_field(model_class, rule.field):
+            return None
+        if rule.field not in fields:
+            fields.append(rule.field)
+    return fields
+
+
+def is_column_field(model_class, field_name):
+    """Return whether `field_name` is a concrete non-relational field of `model_class`, as `values_list()` fetches it."""
+    try:
+        field = model_class._meta.get_field(field_name)
+    except FieldDoesNotExist:
+        return False
+    return field.concrete and not field.is_relation
+
+
+def bulk_audit_with_builtin_rules(validator, queryset, result_writer, unique_evaluator=None, chunk_size=None):
+    """
+    Run the built-in rules of the given validator against `queryset` column by column, returning the number audited.
+
+    Only the pk and the fields targeted by the rules are fetched, with `values_list()` in chunks of `chunk_size`, and
+    each rule is evaluated in turn over the rows of a chunk that passed the previous ones. As with
+    `audit_with_builtin_rules()`, only the first failing rule of an object is recorded, in the same order as
+    `BaseValidator.clean()`. Model instances are only fetched for the objects failing a rule, to record their result,
+    and the stale results of a chunk are deleted with one query per failing attribute, plus one for the passing objects.
+
+    The rules must allow it, see `get_bulk_audit_fields()`.
+    """
+    model_class = queryset.model
+    fields = get_bulk_audit_fields(validator, model_class, unique_evaluator=unique_evaluator)
+    checks = get_builtin_rule_checks(validator, unique_evaluator=unique_evaluator)
+    results = DataCompliance.objects.filter(
+        content_type=ContentType.objects.get_for_model(model_class), compliance_class_name__endswith="CustomValidator"
+    )
+    count = 0
+    for chunk in iterate_chunks(queryset.values_list("pk", *fields), chunk_size, get_pk=itemgetter(0)):
+        count += len(chunk)
+        rows = [SimpleNamespace(pk=values[0], **dict(zip(fields, values[1:]))) for values in chunk]
+        passing, failures = evaluate_checks(checks, rows)
+        if passing:
+            results.filter(object_id__in=[str(row.pk) for row in passing]).delete()
+        if failures:
+            record_failures(validator, model_class, failures, results, result_writer)
+    return count
+
+
+def get_builtin_rule_checks(validator, unique_evaluator=None):
+    """
+    Return `(check, rule)` tuples for every built-in rule of the given validator, in the order of `BaseValidator.clean()`.
+
+    Each check is called as `check(row, rule)` and raises a ValidationError if the row fails the rule. Evaluating the
+    rules over rows rather than model instances works as the rules only read the targeted fields and, for unique rules,
+    the pk.
+    """
+    rules = rule_cache.get_for_model(validator.model, exclude_disabled_rules=False)
+    validator_instance = validator(None)
+    # pylint: disable=protected-access
+    return [
+        *((validator_instance._validate_regex_rule, rule) for rule in rules.regex_rules),
+        *((validator_instance._validate_min_max_rule, rule) for rule in rules.min_max_rules),
+        *((validator_instance._validate_required_rule, rule) for rule in rules.required_rules),
+        *(
+            (partial(validator_instance._validate_unique_rule, unique_evaluator=unique_evaluator), rule)
+            for rule in rules.unique_rules
+        ),
+    ]
+
+
+def evaluate_checks(checks, rows):
+    """
+    Evaluate each check of `get_builtin_rule_checks()` in turn over the rows that passed the previous ones.
+
+    Return the list of rows passing every check, and a dictionary of the first ValidationError of each failing row, by
+    pk.
+    """
+    failures = {}
+    for check, rule in checks:
+        passing = []
+        for row in rows:
+            try:
+                check(row, rule)
+            except ValidationError as error:
+                failures[row.pk] = error
+            else:
+                passing.append(row)
+        rows = passing
+    return rows, failures
+
+
+def record_failures(validator, model_class, failures, results, result_writer):
+    """
+    Record the result of each object failing a built-in rule, from a dictionary of ValidationErrors by pk.
+
+    Model instances are fetched for the failing objects only, to record their result, and the stale `results` of the
+    objects are deleted with one query per failing attribute.
+    """
+    failing_object_ids = defaultdict(list)
+    manager = model_class._default_manager  # pylint: disable=protected-access
+    for pk, validated_object in manager.in_bulk(list(failures)).items():
+        error = failures[pk]
+        attribute = list(error.message_dict.keys())[0]
+        validator.get_compliance_result(
+            validator,
+            instance=validated_object,
+            message=error.messages[0],
+            attribute=attribute,
+            valid=False,
+            result_writer=result_writer,
+        )
+        failing_object_ids[attribute].append(str(pk))
+    for attribute, object_ids in failing_object_ids.items():
+        results.filter(object_id__in=object_ids).exclude(validated_attribute=attribute).delete()
+
+
+def pushdown_audit_with_builtin_rules(  # pylint: disable=too-many-arguments
+    validator, queryset, violation_filter, result_writer, *, unique_evaluator=None, chunk_size=None
+):
+    """
+    Run the built-in rules of the given validator against `queryset`, returning the number of objects audited.
+
+    Only the objects matching `violation_filter`, a filter from `get_violation_filter()` matching every object that may
+    violate a rule, are fetched and evaluated with `bulk_audit_with_builtin_rules()`. The other objects pass every rule,
+    so only their stale results are deleted: as only failures are recorded, these are found among the existing results,
+    whose distinct object ids are streamed and checked `chunk_size` at a time.
+    """
+    model_class = queryset.model
+    bulk_audit_with_builtin_rules(
+        validator,
+        queryset.filter(violation_filter),
+        result_writer,
+        unique_evaluator=unique_evaluator,
+        chunk_size=chunk_size,
+    )
+
+    chunk_size = chunk_size or settings.PLUGINS_CONFIG["nautobot_data_validation_engine"]["audit_chunk_size"]
+    results = DataCompliance.objects.filter(
+        content_type=ContentType.objects.get_for_model(model_class), compliance_class_name__endswith="CustomValidator"
+    )
+    passing = queryset.exclude(violation_filter).order_by()
+    pks = []
+    for object_id in results.order_by().values_list("object_id", flat=True).distinct().iterator(chunk_size=chunk_size):
+        try:
+            pks.append(model_class._meta.pk.to_python(object_id))
+        except ValidationError:
+            # Left to the DeleteOrphanedDataComplianceData job.
+            continue
+        if len(pks) == chunk_size:
+            delete_passing_results(passing, results, pks)
+            pks = []
+    if pks:
+        delete_passing_results(passing, results, pks)
+    return queryset.count()
+
+
+def delete_passing_results(passing, results, pks):
+    """Delete the `results` of the objects with the given pks that are among the `passing` objects."""
+    object_ids = [str(pk) for pk in passing.filter(pk__in=pks).values_list("pk", flat=True)]
+    if object_ids:
+        results.filter(object_id__in=object_ids).delete()
+
+
+class BulkUniquenessEvaluator:
+    """
+    Find every instance of a model that violates its UniqueValidationRules, with one GROUP BY query per rule.
+
+    Auditing objects one at a time runs a count query per unique rule per object. Instead, the values held by more
+    than `max_instances` objects are found up front, and only the objects holding them are marked as violating.
+    """
+
+    def __init__(self, model_class, unique_rules):
+        """Evaluate the given UniqueValidationRules against every instance of `model_class`."""
+        self.model_class = model_class
+        self._violations = {rule.pk: self._find_violations(rule) for rule in unique_rules}
+
+    def _find_violations(self, rule):
+        """Return the set of pks of the objects whose value for the rule's field is held by too many objects."""
+        manager = self.model_class._default_manager  # pylint: disable=protected-access
+        duplicate_values = [
+            value
+            for value in manager.order_by()
+            .values(rule.field)
+            .annotate(instance_count=Count("pk"))
+            .filter(instance_count__gt=rule.max_instances)
+            .values_list(rule.field, flat=True)
+            # Empty values are never checked for uniqueness, see BaseValidator.clean()
+            if value
+        ]
+        if not duplicate_values:
+            return frozenset()
+        return frozenset(manager.filter(**{f"{rule.field}__in": duplicate_values}).values_list("pk", flat=True))
+
+    def __contains__(self, rule):
+        """Return whether the given rule was evaluated by this evaluator."""
+        return rule.pk in self._violations
+
+    def is_violated(self, rule, obj):
+        """Return whether the given object violates the given rule."""
+        return obj.pk in self._violations[rule.pk]
+
+    @property
+    def violating_pks(self):
+        """The pks of every object violating at least one of the evaluated rules."""
+        return frozenset().union(*self._violations.values())
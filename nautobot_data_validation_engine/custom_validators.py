@@ -14,10 +14,16 @@ import logging
 import pkgutil
 import re
 import sys
-from typing import Optional
+from collections import Counter
+from functools import partial
+from typing import Optional, Sequence
 
+from django.apps import apps as global_apps
+from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
-from django.core.exceptions import ValidationError
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Case, CharField, TextField, Value, When
+from django.db.models.functions import Concat, Left, Lower, Substr, Upper
 from django.template.defaultfilters import pluralize
 from django.utils import timezone
 from nautobot.core.utils.data import render_jinja2
@@ -26,14 +32,11 @@ from nautobot.extras.models import GitRepository
 from nautobot.extras.plugins import CustomValidator, PluginCustomValidator
 from nautobot.extras.registry import registry
 
-from nautobot_data_validation_engine.models import (
-    DataCompliance,
-    MinMaxValidationRule,
-    RegularExpressionValidationRule,
-    RequiredValidationRule,
-    UniqueValidationRule,
-    validate_regex,
-)
+from nautobot_data_validation_engine.instrumentation import measure_rule
+from nautobot_data_validation_engine.models import DataCompliance
+from nautobot_data_validation_engine.results import DataComplianceResultWriter, format_attribute_value
+from nautobot_data_validation_engine.rule_cache import rule_cache
+from nautobot_data_validation_engine.summary import record_deltas
 
 LOGGER = logging.getLogger(__name__)
 
@@ -43,133 +46,206 @@ class BaseValidator(PluginCustomValidator):
 
     model = None
 
-    def clean(self, exclude_disabled_rules=True):  # pylint: disable=too-many-branches
-        """The clean method executes the actual rule enforcement logic for each model."""
-        obj = self.context["object"]
+    def clean(self, exclude_disabled_rules=True, unique_evaluator=None, skip_unchanged_fields=None):
+        """The clean method executes the actual rule enforcement logic for each model.
 
-        _f = [True] if exclude_disabled_rules else [True, False]
+        When auditing many objects, a BulkUniquenessEvaluator covering the model's unique rules can be passed in as
+        `unique_evaluator` to avoid running a count query per unique rule for every object.
 
-        # Regex rules
-        for rule in RegularExpressionValidationRule.objects.get_for_model(self.model).filter(enabled__in=_f):
-            field_value = getattr(obj, rule.field)
+        With `skip_unchanged_fields`, which defaults to the `change_aware_validation` setting, the rules whose field
+        of an existing object is unchanged since it was loaded, and the DataComplianceRule classes none of whose
+        `depends_on_fields` changed, are skipped.
+        """
+        if self.model not in get_models_with_rules(exclude_disabled_rules=exclude_disabled_rules):
+            return
 
-            if field_value is None:
-                # Coerce to a string for regex validation
-                field_value = ""
+        app_settings = settings.PLUGINS_CONFIG["nautobot_data_validation_engine"]
+        obj = self.context["object"]
+        rules = rule_cache.get_for_model(self.model, exclude_disabled_rules=exclude_disabled_rules)
+        # DataComplianceRules, of which only the enforcing ones are run here when the others are run asynchronously.
+        compliance_classes = [
+            compliance_class
+            for compliance_class in get_compliance_classes(self.model)
+            if compliance_class.enforce or not app_settings["async_compliance_evaluation"]
+        ]
+
+        if skip_unchanged_fields is None:
+            skip_unchanged_fields = app_settings["change_aware_validation"]
+        unchanged_fields = frozenset()
+        if skip_unchanged_fields and not obj._state.adding:  # pylint: disable=protected-access
+            unchanged_fields = get_unchanged_fields(obj, get_rule_dependencies(rules, compliance_classes))
+
+        for rule_type, rules_of_type, validate in (
+            ("regex", rules.regex_rules, self._validate_regex_rule),
+            ("min_max", rules.min_max_rules, self._validate_min_max_rule),
+            ("required", rules.required_rules, self._validate_required_rule),
+            ("unique", rules.unique_rules, partial(self._validate_unique_rule, unique_evaluator=unique_evaluator)),
+        ):
+            for rule in rules_of_type:
+                if rule.field in unchanged_fields and not getattr(rule, "context_processing", False):
+                    continue
+                with measure_rule(rule_type, rule.name, self.model):
+                    validate(obj, rule)
+
+        for compliance_class in compliance_classes:
+            if compliance_class.depends_on_fields is not None and unchanged_fields.issuperset(
+                compliance_class.depends_on_fields
+            ):
+                continue
+            compliance_class(obj).clean()
 
-            if rule.context_processing:
-                # Render the regular_expression as a jinja2 string and ensure it is valid
-                try:
-                    regular_expression = render_jinja2(rule.regular_expression, self.context)
-                    validate_regex(regular_expression)
-                # TODO: Switch to a less broad exception.
-                except Exception:  # pylint: disable=broad-exception-caught
-                    LOGGER.exception(
-                        "There was an error rendering the regular expression in the data validation rule '%s' and a ValidationError was raised!",
-                        rule,
-                    )
-                    self.validation_error(
-                        {
-                            rule.field: f"There was an error rendering the regular expression in the data validation rule '{rule}'. "
-                            "Either fix the validation rule or disable it in order to save this data."
-                        }
-                    )
-
-            else:
-                regular_expression = rule.regular_expression
-
-            if not re.match(regular_expression, field_value):
-                self.validation_error(
-                    {rule.field: rule.error_message or f"Value does not conform to regex: {regular_expression}"}
-                )
+    def _validate_regex_rule(self, obj, rule):
+        """Enforce a RegularExpressionValidationRule on `obj`."""
+        field_value = getattr(obj, rule.field)
 
-        # Min/Max rules
-        for rule in MinMaxValidationRule.objects.get_for_model(self.model).filter(enabled__in=_f):
-            field_value = getattr(obj, rule.field)
+        if field_value is None:
+            # Coerce to a string for regex validation
+            field_value = ""
 
-            if field_value is None:
-                self.validation_error(
-                    {
-                        rule.field: rule.error_message
-                        or f"Value does not conform to mix/max validation: min {rule.min}, max {rule.max}"
-                    }
+        if rule.context_processing:
+            # Render the regular_expression as a jinja2 string and ensure it is valid
+            try:
+                if rule.template is not None:
+                    # Same as render_jinja2(), minus parsing the template again on every evaluation.
+                    regular_expression = rule.template.render(context=self.context)
+                else:
+                    regular_expression = render_jinja2(rule.regular_expression, self.context)
+                pattern = rule.pattern_cache.compile(regular_expression)
+            # TODO: Switch to a less broad exception.
+            except Exception:  # pylint: disable=broad-exception-caught
+                LOGGER.exception(
+                    "There was an error rendering the regular expression in the data validation rule '%s' and a ValidationError was raised!",
+                    rule,
                 )
-
-            elif not isinstance(field_value, (int, float)):
                 self.validation_error(
                     {
-                        rule.field: f"Unable to validate against min/max rule {rule} because the field value is not numeric."
+                        rule.field: f"There was an error rendering the regular expression in the data validation rule '{rule}'. "
+                        "Either fix the validation rule or disable it in order to save this data."
                     }
                 )
 
-            elif rule.min is not None and field_value is not None and field_value < rule.min:
-                self.validation_error(
-                    {rule.field: rule.error_message or f"Value is less than minimum value: {rule.min}"}
-                )
+        else:
+            regular_expression = rule.regular_expression
+            pattern = rule.compiled_pattern or re.compile(regular_expression)
 
-            elif rule.max is not None and field_value is not None and field_value > rule.max:
-                self.validation_error(
-                    {rule.field: rule.error_message or f"Value is more than maximum value: {rule.max}"}
-                )
+        if not pattern.match(field_value):
+            self.validation_error(
+                {rule.field: rule.error_message or f"Value does not conform to regex: {regular_expression}"}
+            )
 
-        # Required rules
-        for rule in RequiredValidationRule.objects.get_for_model(self.model).filter(enabled__in=_f):
-            field_value = getattr(obj, rule.field)
-            if field_value is None or field_value == "":
-                self.validation_error({rule.field: rule.error_message or "This field cannot be blank."})
-
-        # Unique rules
-        for rule in UniqueValidationRule.objects.get_for_model(self.model).filter(enabled__in=_f):
-            field_value = getattr(obj, rule.field)
-            if field_value:
-                # Exclude the current object from the count
-                count_excluding_current = (
-                    obj.__class__._default_manager.filter(**{rule.field: field_value}).exclude(pk=obj.pk).count()  # pylint: disable=protected-access
-                )
+    def _validate_min_max_rule(self, obj, rule):
+        """Enforce a MinMaxValidationRule on `obj`."""
+        field_value = getattr(obj, rule.field)
 
-                if count_excluding_current >= rule.max_instances:
-                    self.validation_error(
-                        {
-                            rule.field: rule.error_message
-                            or f"There can only be {rule.max_instances} instance{pluralize(rule.max_instances)} with this value."
-                        }
-                    )
+        if field_value is None:
+            self.validation_error(
+                {
+                    rule.field: rule.error_message
+                    or f"Value does not conform to mix/max validation: min {rule.min}, max {rule.max}"
+                }
+            )
 
-        # DataComplianceRules
-        for compliance_class in get_data_compliance_rules_map().get(self.model, []):
-            compliance_class(obj).clean()
+        elif not isinstance(field_value, (int, float)):
+            self.validation_error(
+                {rule.field: f"Unable to validate against min/max rule {rule} because the field value is not numeric."}
+            )
 
-        for repo in GitRepository.objects.filter(
-            provided_contents__contains="nautobot_data_validation_engine.data_compliance_rules"
-        ):
-            for compliance_class in get_classes_from_git_repo(repo):
-                if (
-                    f"{self.context['object']._meta.app_label}.{self.context['object']._meta.model_name}"
-                    != compliance_class.model
-                ):
-                    continue
-                compliance_class(self.context["object"]).clean()
+        elif rule.min is not None and field_value is not None and field_value < rule.min:
+            self.validation_error({rule.field: rule.error_message or f"Value is less than minimum value: {rule.min}"})
 
-    def get_compliance_result(self, message=None, instance=None, attribute=None, valid=True):
-        """Generate a DataCompliance object based on the given parameters."""
+        elif rule.max is not None and field_value is not None and field_value > rule.max:
+            self.validation_error({rule.field: rule.error_message or f"Value is more than maximum value: {rule.max}"})
+
+    def _validate_required_rule(self, obj, rule):
+        """Enforce a RequiredValidationRule on `obj`."""
+        field_value = getattr(obj, rule.field)
+        if field_value is None or field_value == "":
+            self.validation_error({rule.field: rule.error_message or "This field cannot be blank."})
+
+    def _validate_unique_rule(self, obj, rule, unique_evaluator=None):
+        """Enforce a UniqueValidationRule on `obj`, using `unique_evaluator` if it covers the rule."""
+        field_value = getattr(obj, rule.field)
+        if not field_value:
+            return
+
+        if unique_evaluator is not None and rule in unique_evaluator:
+            violated = unique_evaluator.is_violated(rule, obj)
+        else:
+            # Exclude the current object from the count
+            count_excluding_current = (
+                obj.__class__._default_manager.filter(**{rule.field: field_value}).exclude(pk=obj.pk).count()  # pylint: disable=protected-access
+            )
+            violated = count_excluding_current >= rule.max_instances
+
+        if violated:
+            self.validation_error(
+                {
+                    rule.field: rule.error_message
+                    or f"There can only be {rule.max_instances} instance{pluralize(rule.max_instances)} with this value."
+                }
+            )
+
+    def get_compliance_result(  # pylint: disable=too-many-arguments
+        self, message=None, instance=None, attribute=None, valid=True, result_writer=None
+    ):
+        """Generate a DataCompliance object based on the given parameters.
+
+        If a DataComplianceResultWriter is given as `result_writer`, the result is queued on it instead and None is
+        returned. Otherwise it is written right away by a writer of its own, which keeps the summary counts up to date.
+        """
         attribute_value = getattr(instance, attribute, None)
         class_name = f"{instance._meta.app_label.capitalize()}{instance._meta.model_name.capitalize()}CustomValidator"
 
-        result, _ = DataCompliance.objects.update_or_create(
+        writer = DataComplianceResultWriter() if result_writer is None else result_writer
+        writer.add(class_name, instance, attribute, message=message, valid=valid, attribute_value=attribute_value)
+        if writer is result_writer:
+            return None
+        writer.flush()
+        return DataCompliance.objects.get(
             compliance_class_name=class_name,
             content_type=ContentType.objects.get_for_model(instance),
             object_id=instance.id,
             validated_attribute=attribute,
-            defaults={
-                "last_validation_date": timezone.now(),
-                "validated_object_str": str(instance),
-                "validated_attribute_value": str(attribute_value) if attribute_value else "",
-                "message": message,
-                "valid": valid,
-            },
         )
 
-        return result
+
+def get_rule_dependencies(rules, compliance_classes):
+    """Return the names of the fields whose changes may change the outcome of the given rules and classes.
+
+    Context processed regular expression rules depend on the whole object and are left out, as are the
+    DataComplianceRule classes that don't declare their `depends_on_fields`.
+    """
+    fields = {
+        rule.field
+        for rule in (*rules.regex_rules, *rules.min_max_rules, *rules.required_rules, *rules.unique_rules)
+        if not getattr(rule, "context_processing", False)
+    }
+    for compliance_class in compliance_classes:
+        fields.update(compliance_class.depends_on_fields or ())
+    return fields
+
+
+def get_unchanged_fields(obj, field_names):
+    """Return the names, out of `field_names`, of the fields of `obj` whose value is the one stored in the database.
+
+    The stored values are fetched with a single query. Only concrete fields, including foreign keys, are compared;
+    any other field is considered changed, as are all fields of an object missing from the database.
+    """
+    attnames = {}
+    for name in field_names:
+        try:
+            field = obj._meta.get_field(name)
+        except FieldDoesNotExist:
+            continue
+        if field.concrete and not field.many_to_many:
+            attnames[name] = field.attname
+    if not attnames:
+        return frozenset()
+    manager = obj.__class__._default_manager  # pylint: disable=protected-access
+    stored = manager.filter(pk=obj.pk).values(*set(attnames.values())).first()
+    if stored is None:
+        return frozenset()
+    return frozenset(name for name, attname in attnames.items() if getattr(obj, attname) == stored[attname])
 
 
 def is_data_compliance_rule(obj):
@@ -189,8 +265,87 @@ def get_data_compliance_rules_map():
     return compliance_rulesets
 
 
-def get_classes_from_git_repo(repo: GitRepository):
-    """Get list of DataComplianceRule classes found within the custom_validators folder of the given repo."""
+def get_models_with_rules(exclude_disabled_rules=True):
+    """Get the set of models (as `<app_label>.<model>` strings) targeted by any built-in rule or DataComplianceRule class."""
+    return rule_cache.get(
+        ("models_with_rules", exclude_disabled_rules),
+        partial(_load_models_with_rules, exclude_disabled_rules=exclude_disabled_rules),
+    )
+
+
+def _load_models_with_rules(exclude_disabled_rules):
+    models = set(rule_cache.models_with_rules(exclude_disabled_rules=exclude_disabled_rules))
+    models.update(get_data_compliance_rules_map())
+    models.update(get_git_data_compliance_rules_map())
+    return frozenset(models)
+
+
+def get_compliance_classes(model):
+    """Return the registered and Git-provided DataComplianceRule classes of the given model (`<app_label>.<model>`)."""
+    return rule_cache.get(("compliance_classes", model), partial(_load_compliance_classes, model))
+
+
+def _load_compliance_classes(model):
+    return (
+        *get_data_compliance_rules_map().get(model, []),
+        *get_git_data_compliance_rules_map().get(model, []),
+    )
+
+
+def get_git_data_compliance_rules_map():
+    """Generate a dictionary of the DataComplianceRule classes provided by Git repositories, keyed by their models."""
+    return rule_cache.get("git_data_compliance_rules_map", _load_git_data_compliance_rules_map)
+
+
+def _load_git_data_compliance_rules_map():
+    compliance_rulesets = {}
+    for repo in GitRepository.objects.filter(
+        provided_contents__contains="nautobot_data_validation_engine.data_compliance_rules"
+    ):
+        for compliance_class in get_classes_from_git_repo(repo):
+            compliance_rulesets.setdefault(compliance_class.model, [])
+            compliance_rulesets[compliance_class.model].append(compliance_class)
+
+    return compliance_rulesets
+
+
+def get_data_compliance_rule_by_name(name):
+    """Return the registered or Git-provided DataComplianceRule class with the given class name, or None."""
+    for rules_map in (get_data_compliance_rules_map(), get_git_data_compliance_rules_map()):
+        for compliance_classes in rules_map.values():
+            for compliance_class in compliance_classes:
+                if compliance_class.__name__ == name:
+                    return compliance_class
+    return None
+
+
+# DataComplianceRule classes already imported from Git repositories, keyed by (repository pk, current_head).
+_git_repo_classes = {}
+
+
+def get_classes_from_git_repo(repo: GitRepository, refresh=False):
+    """Get list of DataComplianceRule classes found within the custom_validators folder of the given repo.
+
+    The classes are imported once per repository and commit and reused afterwards, unless `refresh` is set.
+    """
+    key = (repo.pk, repo.current_head)
+    if not refresh and key in _git_repo_classes:
+        return list(_git_repo_classes[key])
+
+    class_list = load_classes_from_git_repo(repo)
+    forget_git_repo_classes(repo)
+    _git_repo_classes[key] = tuple(class_list)
+    return class_list
+
+
+def forget_git_repo_classes(repo: GitRepository):
+    """Drop any DataComplianceRule classes previously loaded from the given repo."""
+    for key in [key for key in _git_repo_classes if key[0] == repo.pk]:
+        _git_repo_classes.pop(key, None)
+
+
+def load_classes_from_git_repo(repo: GitRepository):
+    """Import and return the DataComplianceRule classes found within the custom_validators folder of the given repo."""
     ensure_git_repository(repo, head=repo.current_head)
     class_list = []
     for importer, discovered_module_name, _ in pkgutil.iter_modules([f"{repo.filesystem_path}/custom_validators"]):
@@ -213,6 +368,12 @@ class DataComplianceRule(CustomValidator):
     model: str
     result_date: timezone
     enforce = False
+    # The fields read by the audit. Unless None, an existing object is only audited when saved if one of them changed.
+    depends_on_fields: Optional[Sequence[str]] = None
+    result_writer: Optional[DataComplianceResultWriter] = None
+    # Related objects accessed by the audit, fetched along with the audited objects when run by a job.
+    select_related: Sequence[str] = ()
+    prefetch_related: Sequence[str] = ()
 
     def __init__(self, obj):
         """Initialize an DataComplianceRule object."""
@@ -220,6 +381,16 @@ class DataComplianceRule(CustomValidator):
         self.name = self.name or self.__class__.__name__
         self.result_date = timezone.now()
 
+    @classmethod
+    def get_queryset(cls):
+        """Return the queryset of every object audited by this class, with its related object hints applied."""
+        queryset = global_apps.get_model(cls.model).objects.all()
+        if cls.select_related:
+            queryset = queryset.select_related(*cls.select_related)
+        if cls.prefetch_related:
+            queryset = queryset.prefetch_related(*cls.prefetch_related)
+        return queryset
+
     def audit(self):
         """Not implemented. Should raise a ComplianceError if an attribute is found to be invalid."""
         raise NotImplementedError
@@ -234,22 +405,88 @@ class DataComplianceRule(CustomValidator):
         instance = self.context["object"]
         if not exclude_attributes:
             exclude_attributes = []
-        attributes = (
-            DataCompliance.objects.filter(
-                compliance_class_name=self.name,
-                content_type=ContentType.objects.get_for_model(instance),
-                object_id=instance.id,
-            )
+        results = (
+            DataCompliance.objects.get_for_object(instance)
+            .filter(compliance_class_name=self.name)
             .exclude(validated_attribute__in=["__all__"] + exclude_attributes)
-            .values_list("validated_attribute", flat=True)
         )
-        for attribute in attributes:
-            self.compliance_result(message=f"{attribute.capitalize()} is valid.", attribute=attribute)
+        existing = {
+            attribute: current
+            for attribute, *current in results.values_list(
+                "validated_attribute", "valid", "message", "validated_attribute_value", "validated_object_str"
+            )
+        }
+        if not existing:
+            return
+
+        object_str = format_attribute_value(instance)
+        values = {attribute: format_attribute_value(getattr(instance, attribute)) for attribute in existing}
+        changed = set(existing)
+        app_settings = settings.PLUGINS_CONFIG["nautobot_data_validation_engine"]
+        if self.result_writer is not None:
+            skip_unchanged = self.result_writer.skip_unchanged
+        else:
+            skip_unchanged = app_settings["skip_unchanged_compliance_results"]
+        if skip_unchanged:
+            # Like the results of the writer, unchanged results only get their `last_validation_date` bumped.
+            changed = {
+                attribute
+                for attribute, current in existing.items()
+                if current != [True, f"{attribute.capitalize()} is valid.", values[attribute], object_str]
+            }
+            unchanged = set(existing) - changed
+            if unchanged:
+                results.filter(validated_attribute__in=unchanged).update(last_validation_date=self.result_date)
+
+        if changed:
+            # A single UPDATE for all changed attributes; the message is `f"{attribute.capitalize()} is valid."`, built
+            # in SQL.
+            results.filter(validated_attribute__in=changed).update(
+                valid=True,
+                message=Concat(
+                    Upper(Left("validated_attribute", 1)),
+                    Lower(Substr("validated_attribute", 2)),
+                    Value(" is valid."),
+                    output_field=TextField(),
+                ),
+                validated_attribute_value=Case(
+                    *(When(validated_attribute=attribute, then=Value(values[attribute])) for attribute in changed),
+                    default=Value(""),
+                    output_field=CharField(),
+                ),
+                validated_object_str=object_str,
+                last_validation_date=self.result_date,
+                last_updated=timezone.now(),
+            )
+        content_type_id = ContentType.objects.get_for_model(instance).pk
+        deltas = Counter()
+        for attribute, (valid, *_) in existing.items():
+            if not valid:
+                deltas[(content_type_id, self.name, attribute, False)] -= 1
+                deltas[(content_type_id, self.name, attribute, True)] += 1
+        record_deltas(deltas)
 
     def clean(self):
-        """Override the clean method to run the audit function."""
+        """Override the clean method to run the audit function.
+
+        Results are written through `result_writer` when one was provided, e.g. by a job sharing a single writer across
+        many objects, and otherwise through a writer of its own that is flushed before returning.
+        """
+        if self.result_writer is not None:
+            self._audit_and_record_results()
+            return
+
+        self.result_writer = DataComplianceResultWriter()
         try:
-            self.audit()
+            self._audit_and_record_results()
+        finally:
+            self.result_writer.flush()
+            self.result_writer = None
+
+    def _audit_and_record_results(self):
+        try:
+            with measure_rule("compliance_class", self.name, self.model):
+                self.audit()
             self.mark_existing_attributes_as_valid()
             self.compliance_result(message=f"All {self.name} class rules for {self.context['object']} are valid.")
         except ComplianceError as ex:
@@ -287,20 +524,18 @@ class DataComplianceRule(CustomValidator):
             attribute_value = getattr(instance, attribute)
         else:
             attribute = "__all__"
-        result, _ = DataCompliance.objects.update_or_create(
-            compliance_class_name=self.name,
-            content_type=ContentType.objects.get_for_model(instance),
-            object_id=instance.id,
-            validated_attribute=attribute,
-            defaults={
-                "last_validation_date": self.result_date,
-                "validated_object_str": str(instance),
-                "validated_attribute_value": str(attribute_value) if attribute_value else "",
-                "message": message,
-                "valid": valid,
-            },
+        writer = DataComplianceResultWriter() if self.result_writer is None else self.result_writer
+        writer.add(
+            self.name,
+            instance,
+            attribute,
+            message=message,
+            valid=valid,
+            attribute_value=attribute_value,
+            result_date=self.result_date,
         )
-        result.validated_save()
+        if writer is not self.result_writer:
+            writer.flush()
 
 
 class CustomValidatorIterator:
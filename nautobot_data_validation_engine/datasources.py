@@ -3,13 +3,19 @@
 from nautobot.extras.choices import LogLevelChoices
 from nautobot.extras.registry import DatasourceContent
 
-from nautobot_data_validation_engine.custom_validators import get_classes_from_git_repo
+from nautobot_data_validation_engine.custom_validators import forget_git_repo_classes, get_classes_from_git_repo
+from nautobot_data_validation_engine.rule_cache import rule_cache
 
 
-def refresh_git_data_compliance_rules(repository_record, job_result, delete=False):  # pylint: disable=W0613
+def refresh_git_data_compliance_rules(repository_record, job_result, delete=False):
     """Callback for repo refresh."""
+    rule_cache.invalidate()
+    if delete:
+        forget_git_repo_classes(repository_record)
+        return
+
     job_result.log("Successfully pulled git repo", level_choice=LogLevelChoices.LOG_INFO)
-    for compliance_class in get_classes_from_git_repo(repository_record):
+    for compliance_class in get_classes_from_git_repo(repository_record, refresh=True):
         job_result.log(f"Found class {str(compliance_class.__name__)}", level_choice=LogLevelChoices.LOG_INFO)
 
 
@@ -0,0 +1,79 @@
+"""
+Streaming export of DataCompliance results.
+
+The standard export of a list view builds every row, then the whole CSV, in memory. Instead, the results are read as
+`values()` dictionaries through `iterator()`, which uses a server-side cursor on PostgreSQL, a chunk of rows at a time,
+and each row is written to a `StreamingHttpResponse` as soon as it is read, as CSV or as newline-delimited JSON. The
+memory used is bounded by the chunk size, however many results are exported.
+"""
+
+import csv
+import json
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+EXPORT_FIELDS = (
+    "id",
+    "content_type",
+    "compliance_class_name",
+    "object_id",
+    "validated_object_str",
+    "validated_attribute",
+    "validated_attribute_value",
+    "valid",
+    "message",
+    "last_validation_date",
+)
+# The content type of each export format.
+EXPORT_FORMATS = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+
+def iterate_export_rows(queryset, chunk_size=None):
+    """
+    Yield a dictionary of the `EXPORT_FIELDS` of each DataCompliance result of `queryset`, in no particular order.
+
+    The results are fetched `chunk_size` (defaults to the `audit_chunk_size` setting) rows at a time. The content type
+    is given as its `<app_label>.<model>` name.
+    """
+    chunk_size = chunk_size or settings.PLUGINS_CONFIG["nautobot_data_validation_engine"]["audit_chunk_size"]
+    # Unordered, so that the database streams the rows as it finds them instead of sorting them first.
+    for values in queryset.order_by().values(*EXPORT_FIELDS).iterator(chunk_size=chunk_size):
+        content_type = ContentType.objects.get_for_id(values["content_type"])
+        values["content_type"] = f"{content_type.app_label}.{content_type.model}"
+        yield values
+
+
+class _Echo:
+    """File-like object returning what is written to it, for `csv.writer` to format a row without buffering it."""
+
+    def write(self, value):
+        """Return the formatted row."""
+        return value
+
+
+def iterate_csv(queryset, chunk_size=None):
+    """Yield the header then each DataCompliance result of `queryset`, as CSV lines."""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for values in iterate_export_rows(queryset, chunk_size=chunk_size):
+        values["last_validation_date"] = values["last_validation_date"].isoformat()
+        yield writer.writerow([values[field] for field in EXPORT_FIELDS])
+
+
+def iterate_ndjson(queryset, chunk_size=None):
+    """Yield each DataCompliance result of `queryset`, as a JSON object per line."""
+    for values in iterate_export_rows(queryset, chunk_size=chunk_size):
+        yield json.dumps(values, cls=DjangoJSONEncoder) + "\n"
+
+
+def get_export_response(queryset, export_format):
+    """Return a response streaming the DataCompliance results of `queryset` in `export_format`, a key of `EXPORT_FORMATS`."""
+    lines = iterate_csv(queryset) if export_format == "csv" else iterate_ndjson(queryset)
+    return StreamingHttpResponse(
+        lines,
+        content_type=EXPORT_FORMATS[export_format],
+        headers={"Content-Disposition": f'attachment; filename="data_compliance.{export_format}"'},
+    )
@@ -0,0 +1,27 @@
+"""App home page panels."""
+
+from nautobot.apps.ui import HomePagePanel
+
+from nautobot_data_validation_engine.summary import get_summary, get_top_failing
+
+# The number of compliance classes and attributes listed by the home page panel.
+PANEL_TOP_FAILING_LIMIT = 5
+
+
+def get_data_compliance_summary(request):  # pylint: disable=unused-argument
+    """Callback function to collect the overall Data Compliance counts and the top failing rules for the panel."""
+    [totals] = get_summary(group_by=()) or [{"valid": 0, "invalid": 0, "total": 0}]
+    if totals["total"]:
+        totals["compliance"] = 100 * totals["valid"] / totals["total"]
+    return {"totals": totals, "top_failing": get_top_failing(limit=PANEL_TOP_FAILING_LIMIT)}
+
+
+layout = (
+    HomePagePanel(
+        name="Data Compliance",
+        permissions=["nautobot_data_validation_engine.view_datacompliance"],
+        weight=750,
+        custom_data={"data_compliance_summary": get_data_compliance_summary},
+        custom_template="panel_data_compliance.html",
+    ),
+)
@@ -0,0 +1,223 @@
+"""
+Impact analysis of proposed built-in validation rules.
+
+Before creating or editing a rule, its impact can be analyzed: the proposed rule, an unsaved instance, is evaluated
+against the existing objects of its model to count those that would fail to save once it is in place, without writing
+anything. The evaluation reuses the paths of the Data Compliance job: the rule is pushed down into a database filter
+when possible, otherwise its field is evaluated over `values_list()` rows, and only context processed regular
+expression rules are evaluated against full objects.
+
+The analysis is stopped once its time budget is spent, in which case the counts only cover the objects evaluated so far.
+The counting queries, and those finding the duplicate values of unique rules, which may scan the whole table, are
+themselves cancelled by the database once the time budget is spent, on PostgreSQL and MySQL.
+"""
+
+import re
+import time
+from operator import itemgetter
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections, transaction
+
+from nautobot_data_validation_engine.audit import BulkUniquenessEvaluator, is_column_field, iterate_chunks
+from nautobot_data_validation_engine.custom_validators import BaseValidator
+from nautobot_data_validation_engine.models import (
+    MinMaxValidationRule,
+    RegularExpressionValidationRule,
+    RequiredValidationRule,
+    UniqueValidationRule,
+)
+from nautobot_data_validation_engine.pushdown import get_rule_violation_filter
+from nautobot_data_validation_engine.rule_cache import CompiledPatternCache
+
+# Largest number of violating objects returned by an analysis.
+MAX_SAMPLE_SIZE = 100
+
+
+def prepare_rule(rule):
+    """Attach to a proposed regex rule the compiled pattern or caches that the rule cache attaches to saved rules."""
+    if isinstance(rule, RegularExpressionValidationRule):
+        rule.compiled_pattern = None if rule.context_processing else re.compile(rule.regular_expression)
+        rule.pattern_cache = CompiledPatternCache(
+            settings.PLUGINS_CONFIG["nautobot_data_validation_engine"]["regex_pattern_cache_size"]
+        )
+        # Rendered without a precompiled template, which the rule cache keys by the saved rule.
+        rule.template = None
+        rule.context_object_attributes = ()
+    return rule
+
+
+def get_rule_check(validator, rule, model_class, seconds, using=None):
+    """
+    Return the method of `validator` enforcing `rule` on an object, called as `check(obj, rule)`.
+
+    The duplicate values of a unique rule are found up front, on the `using` database, and None is returned if they
+    could not be found within `seconds`.
+    """
+    if isinstance(rule, RegularExpressionValidationRule):
+        return validator._validate_regex_rule  # pylint: disable=protected-access
+    if isinstance(rule, MinMaxValidationRule):
+        return validator._validate_min_max_rule  # pylint: disable=protected-access
+    if isinstance(rule, RequiredValidationRule):
+        return validator._validate_required_rule  # pylint: disable=protected-access
+    if isinstance(rule, UniqueValidationRule):
+        unique_evaluator = run_within(lambda: BulkUniquenessEvaluator(model_class, [rule]), seconds, using=using)
+        if unique_evaluator is None:
+            return None
+
+        def check(obj, rule):
+            validator._validate_unique_rule(obj, rule, unique_evaluator=unique_evaluator)  # pylint: disable=protected-access
+
+        return check
+    raise TypeError(f"{rule.__class__.__name__} is not a built-in validation rule")
+
+
+def run_within(func, seconds, using=None):
+    """
+    Return the result of `func()`, or None if the database could not run each of its queries within `seconds`.
+
+    The queries are cancelled through the `statement_timeout` setting on PostgreSQL, set for their own savepoint, and
+    the `max_execution_time` session variable on MySQL. They are not limited on other databases.
+    """
+    using = using or DEFAULT_DB_ALIAS
+    connection = connections[using]
+    milliseconds = max(int(seconds * 1000), 1)
+    try:
+        with transaction.atomic(using=using), connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                cursor.execute("SELECT current_setting('statement_timeout')")
+                previous = cursor.fetchone()[0]
+                # As SET LOCAL, undone with the savepoint if a query is cancelled.
+                cursor.execute("SELECT set_config('statement_timeout', %s, true)", [f"{milliseconds}ms"])
+                result = func()
+                cursor.execute("SELECT set_config('statement_timeout', %s, true)", [previous])
+            elif connection.vendor == "mysql":
+                cursor.execute("SELECT @@SESSION.max_execution_time")
+                previous = cursor.fetchone()[0]
+                cursor.execute("SET SESSION max_execution_time = %s", [milliseconds])
+                try:
+                    result = func()
+                finally:
+                    cursor.execute("SET SESSION max_execution_time = %s", [previous])
+            else:
+                result = func()
+    except OperationalError:
+        return None
+    return result
+
+
+def count_within(queryset, seconds):
+    """Return the number of objects of `queryset`, or None if the database could not count them within `seconds`."""
+    return run_within(queryset.count, seconds, using=queryset.db)
+
+
+def iterate_rule_impact(rule, queryset=None, sample_size=10, time_budget=None, chunk_size=None):  # pylint: disable=too-many-locals
+    """
+    Evaluate the proposed `rule` against the objects of `queryset`, by default every object of its model.
+
+    The analysis is stopped after `time_budget` seconds, at most the `impact_analysis_time_budget` setting.
+
+    Yield a progress dictionary after each chunk of objects evaluated, with the number of objects `evaluated` out of
+    `total` and the number of `violations`, then a final result dictionary which adds whether the analysis is
+    `complete`, the evaluation `method`, the `elapsed_seconds` and a `sample` of at most `sample_size` violating objects.
+    The `total` is None if the objects could not be counted within the time budget, in which case none are evaluated,
+    as is the case if the duplicate values of a unique rule could not be found within the time budget.
+    """
+    started = time.monotonic()
+    # The setting caps the budget of every analysis.
+    max_time_budget = settings.PLUGINS_CONFIG["nautobot_data_validation_engine"]["impact_analysis_time_budget"]
+    time_budget = min(time_budget or max_time_budget, max_time_budget)
+    sample_size = min(sample_size, MAX_SAMPLE_SIZE)
+    model_class = rule.content_type.model_class()
+    if queryset is None:
+        queryset = model_class._default_manager.all()  # pylint: disable=protected-access
+    prepare_rule(rule)
+
+    total = count_within(queryset, time_budget - (time.monotonic() - started))
+    evaluated = violations = 0
+    violating = {}
+    validator = BaseValidator(None)
+    check = None
+    if total is not None:
+        check = get_rule_check(
+            validator, rule, model_class, time_budget - (time.monotonic() - started), using=queryset.db
+        )
+    context_processing = isinstance(rule, RegularExpressionValidationRule) and rule.context_processing
+    if check is None:
+        method = None
+        chunks = ()
+    elif context_processing or not is_column_field(model_class, rule.field):
+        method = "objects"
+        chunks = iterate_chunks(queryset, chunk_size)
+    else:
+        method = "columns"
+        violation_filter = get_rule_violation_filter(rule, model_class)
+        if violation_filter is not None:
+            # Filtered with a regular expression, the count can scan the whole table.
+            matching = count_within(queryset.filter(violation_filter), time_budget - (time.monotonic() - started))
+            if matching is not None:
+                method = "pushdown"
+                queryset = queryset.filter(violation_filter)
+                # The objects not matching the filter are known to pass the rule.
+                evaluated = total - matching
+        chunks = (
+            [SimpleNamespace(pk=pk, **{rule.field: value}) for pk, value in chunk]
+            for chunk in iterate_chunks(queryset.values_list("pk", rule.field), chunk_size, get_pk=itemgetter(0))
+        )
+
+    complete = check is not None
+    for chunk in chunks:
+        for obj in chunk:
+            # Rendered by context processed regex rules.
+            validator.context["object"] = obj
+            try:
+                check(obj, rule)
+            except ValidationError as error:
+                violations += 1
+                if len(violating) < sample_size:
+                    violating[obj.pk] = (getattr(obj, rule.field, None), error.messages[0])
+        evaluated += len(chunk)
+        yield {"evaluated": evaluated, "total": total, "violations": violations}
+        if time.monotonic() - started > time_budget:
+            complete = False
+            break
+
+    yield {
+        "evaluated": evaluated,
+        "total": total,
+        "violations": violations,
+        "complete": complete,
+        "method": method,
+        "elapsed_seconds": time.monotonic() - started,
+        "sample": get_sample(model_class, violating),
+    }
+
+
+def get_sample(model_class, violating):
+    """Return the sample of violating objects from their (value, message) by pk, skipping those deleted since."""
+    objects = model_class._default_manager.in_bulk(list(violating))  # pylint: disable=protected-access
+    sample = []
+    for pk, (value, message) in violating.items():
+        obj = objects.get(pk)
+        if obj is None:
+            continue
+        sample.append(
+            {
+                "id": pk,
+                "display": str(obj),
+                "url": obj.get_absolute_url() if hasattr(obj, "get_absolute_url") else None,
+                "value": value,
+                "message": message,
+            }
+        )
+    return sample
+
+
+def get_rule_impact(rule, **kwargs):
+    """Return the final result of `iterate_rule_impact()`."""
+    result = None
+    for result in iterate_rule_impact(rule, **kwargs):
+        pass
+    return result
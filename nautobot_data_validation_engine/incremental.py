@@ -0,0 +1,99 @@
+"""
+Incremental Data Compliance runs.
+
+An incremental run only audits the objects whose `last_updated` is later than the start of the previous run of the
+same compliance class (or of the built-in rules of the same model). The start of each run is stored in the Django
+cache together with a fingerprint of what was run: the source code of the compliance class, or the definitions of the
+built-in rules. Whenever there is no previous run on record, the fingerprint differs, or the model has no
+`last_updated` field, every object is audited again.
+
+The start of the previous run is stored without expiry, but it is lost if the cache is flushed or evicts it, e.g. on a
+Redis instance with a `maxmemory` eviction policy: the next run then audits every object again, which only makes it
+slower.
+"""
+
+import hashlib
+import inspect
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import CharField, Exists, OuterRef, Q
+from django.db.models.functions import Cast
+from django.utils.dateparse import parse_datetime
+
+from nautobot_data_validation_engine.models import DataCompliance
+from nautobot_data_validation_engine.rule_cache import rule_cache
+
+STATE_CACHE_KEY = "nautobot_data_validation_engine.incremental.{}"
+
+
+def get_compliance_class_fingerprint(compliance_class):
+    """Return a fingerprint of the source code of a DataComplianceRule class, or None if it is unavailable."""
+    try:
+        source = inspect.getsource(compliance_class)
+    except (OSError, TypeError):
+        return None
+    return hashlib.sha256(source.encode()).hexdigest()
+
+
+def get_builtin_rules_fingerprint(model_class):
+    """Return a fingerprint of the definitions of every built-in validation rule targeting `model_class`."""
+    rules = rule_cache.get_for_model(model_class._meta.label_lower, exclude_disabled_rules=False)
+    definitions = sorted(
+        f"{rule._meta.label_lower}:{rule.pk}:{rule.last_updated}"
+        for rule in (*rules.regex_rules, *rules.min_max_rules, *rules.required_rules, *rules.unique_rules)
+    )
+    return hashlib.sha256("\n".join(definitions).encode()).hexdigest()
+
+
+def get_changed_since(name, model_class, fingerprint):
+    """Return the start of the previous run of `name`, or None if all objects of `model_class` must be audited."""
+    if fingerprint is None:
+        return None
+    try:
+        model_class._meta.get_field("last_updated")
+    except FieldDoesNotExist:
+        return None
+    state = cache.get(STATE_CACHE_KEY.format(name))
+    if not state or state["fingerprint"] != fingerprint:
+        return None
+    return parse_datetime(state["started"])
+
+
+def record_run(name, fingerprint, started):
+    """Record that `name` was successfully run, starting at `started`, with the given fingerprint."""
+    if fingerprint is None:
+        return
+    cache.set(STATE_CACHE_KEY.format(name), {"fingerprint": fingerprint, "started": started.isoformat()}, timeout=None)
+
+
+def filter_changed_objects(queryset, changed_since):
+    """Restrict `queryset` to the objects changed since `changed_since`, if any."""
+    if changed_since is None:
+        return queryset
+    return queryset.filter(last_updated__gte=changed_since)
+
+
+def filter_changed_objects_for_builtin_rules(queryset, validator, changed_since, unique_evaluator=None):
+    """
+    Restrict `queryset` to the objects to audit again with the built-in rules of `validator`, if any.
+
+    Besides the objects changed since `changed_since`, objects can go in or out of compliance with a UniqueValidationRule
+    through changes to other objects, so the objects currently violating a unique rule and the objects with an invalid
+    result are audited again as well. The latter are found with a correlated subquery rather than a list of pks, which
+    would hold every invalid object in memory.
+    """
+    if changed_since is None:
+        return queryset
+    invalid_results = DataCompliance.objects.filter(
+        compliance_class_name=validator.__name__,
+        content_type=ContentType.objects.get_for_model(queryset.model),
+        # object_id is a CharField, so the pk is compared as text.
+        object_id=Cast(OuterRef("pk"), output_field=CharField()),
+        valid=False,
+    )
+    condition = Q(last_updated__gte=changed_since) | Q(Exists(invalid_results))
+    if unique_evaluator is not None:
+        condition |= Q(pk__in=unique_evaluator.violating_pks)
+    return queryset.filter(condition)
@@ -0,0 +1,191 @@
+"""
+Per-rule instrumentation of the validators.
+
+Every evaluation of a built-in validation rule by `BaseValidator.clean`, and of a DataComplianceRule class's `audit`,
+is timed and its database queries counted. The measurements are:
+
+- exported as Prometheus metrics, through Nautobot's `/metrics` endpoint;
+- optionally logged as structured log lines, one per evaluation;
+- aggregated per process and periodically merged into one-minute buckets in the Django cache, from which the
+  "slowest rules" view reports over a rolling window.
+
+Merging the buckets is a read-modify-write of the cache, so concurrent flushes from several processes can
+occasionally lose each other's counts. This is acceptable for a diagnostic view, unlike for the Prometheus metrics.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import connection
+from prometheus_client import Counter, Histogram
+
+LOGGER = logging.getLogger("nautobot_data_validation_engine.rules")
+
+STATS_CACHE_KEY = "nautobot_data_validation_engine.rule_stats.{}"
+STATS_BUCKET_SECONDS = 60
+STATS_FLUSH_INTERVAL = 30
+
+RULE_LABELS = ["rule_type", "rule", "model"]
+
+RULE_EVALUATION_SECONDS = Histogram(
+    "nautobot_data_validation_engine_rule_evaluation_seconds",
+    "Time spent evaluating a validation rule or Data Compliance class against an object.",
+    RULE_LABELS,
+)
+RULE_EVALUATION_QUERIES = Counter(
+    "nautobot_data_validation_engine_rule_queries",
+    "Number of database queries run while evaluating a validation rule or Data Compliance class.",
+    RULE_LABELS,
+)
+RULE_EVALUATIONS = Counter(
+    "nautobot_data_validation_engine_rule_evaluations",
+    "Number of evaluations of a validation rule or Data Compliance class, by result (pass, fail or error).",
+    [*RULE_LABELS, "result"],
+)
+
+# Indexes of the aggregated statistics of a rule.
+EVALUATIONS, FAILURES, SECONDS, MAX_SECONDS, QUERIES = range(5)
+
+
+class RuleStatistics:
+    """Per-process aggregation of the rule evaluation measurements, periodically merged into the Django cache."""
+
+    def __init__(self):
+        """Initialize empty RuleStatistics."""
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    def record(self, key, seconds, queries, failed):
+        """Add a measurement for the rule identified by `key`, a (rule_type, rule, model) tuple."""
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = [0, 0, 0.0, 0.0, 0]
+            stats[EVALUATIONS] += 1
+            stats[FAILURES] += int(failed)
+            stats[SECONDS] += seconds
+            stats[MAX_SECONDS] = max(stats[MAX_SECONDS], seconds)
+            stats[QUERIES] += queries
+            flush = time.monotonic() - self._last_flush >= STATS_FLUSH_INTERVAL
+        if flush:
+            self.flush()
+
+    def flush(self):
+        """Merge the measurements of this process into the current bucket in the cache."""
+        with self._lock:
+            pending, self._stats = self._stats, {}
+            self._last_flush = time.monotonic()
+        if not pending:
+            return
+        key = STATS_CACHE_KEY.format(int(time.time() // STATS_BUCKET_SECONDS))
+        bucket = cache.get(key) or {}
+        for rule, stats in pending.items():
+            merged = bucket.get(rule)
+            bucket[rule] = stats if merged is None else merge_statistics(merged, stats)
+        cache.set(key, bucket, timeout=get_app_settings()["rule_statistics_window"] * 60 + STATS_BUCKET_SECONDS)
+
+    def get_slowest_rules(self, limit=20, window=None):
+        """Return the statistics of the `limit` rules that took the most time over the last `window` minutes."""
+        self.flush()
+        window = window or get_app_settings()["rule_statistics_window"]
+        current = int(time.time() // STATS_BUCKET_SECONDS)
+        buckets = cache.get_many([STATS_CACHE_KEY.format(current - i) for i in range(window)])
+        totals = {}
+        for bucket in buckets.values():
+            for rule, stats in bucket.items():
+                merged = totals.get(rule)
+                totals[rule] = list(stats) if merged is None else merge_statistics(merged, stats)
+        rows = [
+            {
+                "rule_type": rule_type,
+                "rule": rule,
+                "model": model,
+                "evaluations": stats[EVALUATIONS],
+                "failures": stats[FAILURES],
+                "total_ms": stats[SECONDS] * 1000,
+                "mean_ms": stats[SECONDS] * 1000 / stats[EVALUATIONS],
+                "max_ms": stats[MAX_SECONDS] * 1000,
+                "queries": stats[QUERIES],
+            }
+            for (rule_type, rule, model), stats in totals.items()
+        ]
+        rows.sort(key=lambda row: row["total_ms"], reverse=True)
+        return rows[:limit]
+
+
+def merge_statistics(stats, other):
+    """Return the statistics `stats` and `other` merged together."""
+    return [
+        stats[EVALUATIONS] + other[EVALUATIONS],
+        stats[FAILURES] + other[FAILURES],
+        stats[SECONDS] + other[SECONDS],
+        max(stats[MAX_SECONDS], other[MAX_SECONDS]),
+        stats[QUERIES] + other[QUERIES],
+    ]
+
+
+def get_app_settings():
+    """Return the settings of this app."""
+    return settings.PLUGINS_CONFIG["nautobot_data_validation_engine"]
+
+
+rule_statistics = RuleStatistics()
+
+
+@contextmanager
+def measure_rule(rule_type, rule, model):
+    """Measure the evaluation of a rule, which fails by raising a ValidationError, inside the `with` block."""
+    app_settings = get_app_settings()
+    if not app_settings["rule_metrics"]:
+        yield
+        return
+
+    queries = 0
+
+    def count_queries(execute, sql, params, many, context):
+        nonlocal queries
+        queries += 1
+        return execute(sql, params, many, context)
+
+    result = "pass"
+    start = time.perf_counter()
+    try:
+        with connection.execute_wrapper(count_queries):
+            yield
+    except ValidationError:
+        result = "fail"
+        raise
+    except Exception:
+        result = "error"
+        raise
+    finally:
+        seconds = time.perf_counter() - start
+        RULE_EVALUATION_SECONDS.labels(rule_type, rule, model).observe(seconds)
+        if queries:
+            RULE_EVALUATION_QUERIES.labels(rule_type, rule, model).inc(queries)
+        RULE_EVALUATIONS.labels(rule_type, rule, model, result).inc()
+        rule_statistics.record((rule_type, rule, model), seconds, queries, result != "pass")
+        if app_settings["log_rule_evaluations"]:
+            LOGGER.info(
+                "rule_evaluation rule_type=%s rule=%r model=%s result=%s duration_ms=%.3f queries=%d",
+                rule_type,
+                rule,
+                model,
+                result,
+                seconds * 1000,
+                queries,
+                extra={
+                    "rule_type": rule_type,
+                    "rule": rule,
+                    "model": model,
+                    "result": result,
+                    "duration_ms": seconds * 1000,
+                    "queries": queries,
+                },
+            )
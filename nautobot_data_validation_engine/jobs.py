@@ -1,16 +1,41 @@
 """Jobs for nautobot_data_validation_engine."""
 
-from django.apps import apps as global_apps
+from celery import chord
 from django.contrib.contenttypes.models import ContentType
-from django.db.models import Q
+from django.utils import timezone
 from nautobot.core.celery import register_jobs
-from nautobot.extras.jobs import BooleanVar, Job, MultiChoiceVar, get_task_logger
+from nautobot.extras.jobs import BooleanVar, DryRunVar, IntegerVar, Job, MultiChoiceVar, get_task_logger
 from nautobot.extras.models import GitRepository
-from nautobot.extras.plugins import CustomValidator, ValidationError
-from nautobot.extras.registry import registry
 
+from nautobot_data_validation_engine.audit import (
+    audit_queryset_with_builtin_rules,
+    audit_with_compliance_class,
+    get_builtin_rule_validators,
+    get_pk_ranges,
+    get_unique_evaluator,
+    iterate_in_chunks,
+    iterate_orphaned_object_ids,
+)
 from nautobot_data_validation_engine.custom_validators import get_classes_from_git_repo, get_data_compliance_rules_map
+from nautobot_data_validation_engine.incremental import (
+    filter_changed_objects,
+    filter_changed_objects_for_builtin_rules,
+    get_builtin_rules_fingerprint,
+    get_changed_since,
+    get_compliance_class_fingerprint,
+    record_run,
+)
+from nautobot_data_validation_engine.instrumentation import rule_statistics
 from nautobot_data_validation_engine.models import DataCompliance
+from nautobot_data_validation_engine.results import DataComplianceResultWriter
+from nautobot_data_validation_engine.rule_cache import validation_scope
+from nautobot_data_validation_engine.snapshots import record_snapshot
+from nautobot_data_validation_engine.summary import rebuild_summary
+from nautobot_data_validation_engine.tasks import (
+    finish_parallel_run,
+    run_builtin_rules_chunk,
+    run_data_compliance_rule_chunk,
+)
 
 logger = get_task_logger(__name__)
 
@@ -23,6 +48,18 @@ def get_data_compliance_rules():
     return validators
 
 
+def get_logged_changed_since(name, model_class, fingerprint):
+    """Return the start of the previous incremental run of `name`, logging whether it is an incremental run."""
+    changed_since = get_changed_since(name, model_class, fingerprint)
+    if changed_since is None:
+        logger.info("Auditing every %s object with %s", model_class._meta.verbose_name, name)
+    else:
+        logger.info(
+            "Auditing the %s objects changed since %s with %s", model_class._meta.verbose_name, changed_since, name
+        )
+    return changed_since
+
+
 def get_choices():
     """Get choices from registry."""
     choices = []
@@ -37,16 +74,6 @@ def get_choices():
     return choices
 
 
-def clean_compliance_rules_results_for_instance(instance, excluded_pks):
-    """Clean compliance results."""
-    excluded_pks = excluded_pks or []
-    DataCompliance.objects.filter(
-        object_id=instance.id,
-        content_type=ContentType.objects.get_for_model(instance),
-        compliance_class_name__endswith="CustomValidator",
-    ).exclude(pk__in=excluded_pks).delete()
-
-
 class RunRegisteredDataComplianceRules(Job):
     """Run the validate function on all registered DataComplianceRule classes and, optionally, the built-in data validation rules."""
 
@@ -64,10 +91,64 @@ class RunRegisteredDataComplianceRules(Job):
         label="Run built-in validation rules?", description="Include created, built-in data validation rules in report."
     )
 
+    chunk_size = IntegerVar(
+        label="Chunk size",
+        required=False,
+        min_value=1,
+        description="Number of objects fetched from the database at a time. Defaults to the app's audit_chunk_size.",
+    )
+
+    parallel = BooleanVar(
+        label="Run in parallel?",
+        description="Split the objects into chunks that are audited concurrently by the available Celery workers.",
+    )
+
+    incremental = BooleanVar(
+        label="Only audit changed objects?",
+        description="Skip the objects that have not changed since the previous run, unless the rules changed.",
+    )
+
     def run(self, *args, **kwargs):
         """Run the validate function on all given DataComplianceRule classes."""
-        selected_data_compliance_rules = kwargs.get("selected_data_compliance_rules", None)
+        # The rules and Data Compliance classes are resolved once for the whole run.
+        with validation_scope():
+            self.run_compliance_rules(**kwargs)
+
+    def run_compliance_rules(self, **kwargs):
+        """Run the selected DataComplianceRule classes and, optionally, the built-in data validation rules."""
+        chunk_size = kwargs.get("chunk_size", None)
+        run_builtin_rules_in_report = kwargs.get("run_builtin_rules_in_report", False)
+        incremental = kwargs.get("incremental", False)
+        started = timezone.now()
+        compliance_classes = self.get_compliance_classes(kwargs.get("selected_data_compliance_rules", None))
+
+        if kwargs.get("parallel", False):
+            # The run is finished by the callback of the subtasks.
+            self.run_in_parallel(
+                compliance_classes,
+                run_builtin_rules_in_report,
+                chunk_size=chunk_size,
+                incremental=incremental,
+                started=started,
+            )
+            return
 
+        self.report_for_compliance_classes(
+            compliance_classes, chunk_size=chunk_size, incremental=incremental, started=started
+        )
+        if run_builtin_rules_in_report:
+            logger.info("Running built-in data validation rules")
+            self.report_for_validation_rules(chunk_size=chunk_size, incremental=incremental, started=started)
+
+        # Make the rule timings of this run visible in the Slowest Rules view right away.
+        rule_statistics.flush()
+        # Bring today's point of the Compliance Trend up to date with the results of this run.
+        record_snapshot()
+        logger.info("View Data Compliance results [here](/plugins/nautobot-data-validation-engine/data-compliance/)")
+
+    @staticmethod
+    def get_compliance_classes(selected_data_compliance_rules=None):
+        """Return the registered and Git-provided DataComplianceRule classes, restricted to the selected ones if any."""
         compliance_classes = []
         compliance_classes.extend(get_data_compliance_rules())
 
@@ -75,69 +156,124 @@ class RunRegisteredDataComplianceRules(Job):
             if "nautobot_data_validation_engine.data_compliance_rules" in repo.provided_contents:
                 compliance_classes.extend(get_classes_from_git_repo(repo))
 
-        for compliance_class in compliance_classes:
-            if selected_data_compliance_rules and compliance_class.__name__ not in selected_data_compliance_rules:
-                continue
-            logger.info(f"Running {compliance_class.__name__}")
-            app_label, model = compliance_class.model.split(".")
-            for obj in global_apps.get_model(app_label, model).objects.all():
-                ins = compliance_class(obj)
-                ins.enforce = False
-                ins.clean()
+        return [
+            compliance_class
+            for compliance_class in compliance_classes
+            if not selected_data_compliance_rules or compliance_class.__name__ in selected_data_compliance_rules
+        ]
 
-        run_builtin_rules_in_report = kwargs.get("run_builtin_rules_in_report", False)
+    @staticmethod
+    def report_for_compliance_classes(compliance_classes, chunk_size=None, incremental=False, started=None):
+        """Run the given DataComplianceRule classes against their objects and add to report."""
+        started = started or timezone.now()
+        runs = []
+        with DataComplianceResultWriter() as result_writer:
+            for compliance_class in compliance_classes:
+                logger.info("Running %s", compliance_class.__name__)
+                queryset = compliance_class.get_queryset()
+                fingerprint = get_compliance_class_fingerprint(compliance_class)
+                if incremental:
+                    changed_since = get_logged_changed_since(compliance_class.__name__, queryset.model, fingerprint)
+                    queryset = filter_changed_objects(queryset, changed_since)
+                audit_with_compliance_class(compliance_class, iterate_in_chunks(queryset, chunk_size), result_writer)
+                runs.append((compliance_class.__name__, fingerprint))
+        for name, fingerprint in runs:
+            record_run(name, fingerprint, started)
+
+    def run_in_parallel(  # pylint: disable=too-many-arguments
+        self, compliance_classes, run_builtin_rules_in_report, chunk_size=None, incremental=False, started=None
+    ):
+        """
+        Dispatch every (compliance class, pk range) chunk as a Celery subtask, and return without waiting for them.
+
+        The subtasks run as a chord, whose callback, `finish_parallel_run`, sums up their results once they have all
+        completed and records the run. The job itself doesn't occupy a worker while the subtasks run.
+        """
+        started = started or timezone.now()
+        fingerprints, labels, signatures = {}, [], []
+        for compliance_class in compliance_classes:
+            name = compliance_class.__name__
+            fingerprints[name] = get_compliance_class_fingerprint(compliance_class)
+            for signature in self.get_compliance_class_signatures(
+                compliance_class, fingerprints[name], incremental, chunk_size
+            ):
+                labels.append(name)
+                signatures.append(signature)
         if run_builtin_rules_in_report:
-            logger.info("Running built-in data validation rules")
-            self.report_for_validation_rules()
-
-        logger.info("View Data Compliance results [here](/plugins/nautobot-data-validation-engine/data-compliance/)")
+            for validator, model_class in get_builtin_rule_validators():
+                name = validator.__name__
+                fingerprints[name] = get_builtin_rules_fingerprint(model_class)
+                for signature in self.get_builtin_rules_signatures(
+                    validator, model_class, fingerprints[name], incremental, chunk_size
+                ):
+                    labels.append(name)
+                    signatures.append(signature)
+
+        callback = finish_parallel_run.s(str(self.job_result.pk), labels, fingerprints, started.isoformat())
+        if not signatures:
+            logger.info("Nothing to audit")
+            callback.apply(args=([],))
+            return
+        logger.info("Dispatching %s chunks, the results are logged once they have all completed", len(signatures))
+        chord(signatures)(callback)
 
     @staticmethod
-    def report_for_validation_rules():
-        """Run built-in data validation rules and add to report."""
-        query = (
-            Q(uniquevalidationrule__isnull=False)
-            | Q(regularexpressionvalidationrule__isnull=False)
-            | Q(minmaxvalidationrule__isnull=False)
-            | Q(requiredvalidationrule__isnull=False)
+    def get_compliance_class_signatures(compliance_class, fingerprint, incremental=False, chunk_size=None):
+        """Return the signatures of the subtasks auditing the objects of a DataComplianceRule class, a pk range each."""
+        name = compliance_class.__name__
+        queryset = compliance_class.get_queryset()
+        changed_since = get_logged_changed_since(name, queryset.model, fingerprint) if incremental else None
+        return [
+            run_data_compliance_rule_chunk.si(
+                name, str(first_pk), str(last_pk), changed_since.isoformat() if changed_since else None
+            )
+            for first_pk, last_pk in get_pk_ranges(filter_changed_objects(queryset, changed_since), chunk_size)
+        ]
+
+    def get_builtin_rules_signatures(  # pylint: disable=too-many-arguments
+        self, validator, model_class, fingerprint, incremental=False, chunk_size=None
+    ):
+        """Return the signatures of the subtasks auditing a model with its built-in rules, a pk range each."""
+        changed_since = get_logged_changed_since(validator.__name__, model_class, fingerprint) if incremental else None
+        queryset = filter_changed_objects_for_builtin_rules(
+            model_class.objects.all(),
+            validator,
+            changed_since,
+            unique_evaluator=get_unique_evaluator(model_class) if changed_since else None,
         )
-
-        model_classes = [ct.model_class() for ct in ContentType.objects.filter(query).distinct()]
-
-        # Gather custom validators of built-in rules
-        validator_dicts = []
-        for model_class in model_classes:
-            model_custom_validators = registry["plugin_custom_validators"][model_class._meta.label_lower]
-            # Get only DataValidationCustomValidators
-            # otherwise, we would get all validators (more than those dynamically created)
-            validator_dicts.extend(
-                [
-                    {cv: model_class}
-                    for cv in model_custom_validators
-                    if cv.__name__
-                    == f"{model_class._meta.app_label.capitalize()}{model_class._meta.model_name.capitalize()}CustomValidator"
-                ]
+        return [
+            run_builtin_rules_chunk.si(
+                str(self.job_result.pk),
+                model_class._meta.label_lower,
+                str(first_pk),
+                str(last_pk),
+                changed_since.isoformat() if changed_since else None,
             )
+            for first_pk, last_pk in get_pk_ranges(queryset, chunk_size)
+        ]
 
+    @staticmethod
+    def report_for_validation_rules(chunk_size=None, incremental=False, started=None):
+        """Run built-in data validation rules and add to report."""
+        started = started or timezone.now()
+        runs = []
         # Run validation on existing objects and add to report
-        for validator_dict in validator_dicts:
-            for validator, class_name in validator_dict.items():
-                if getattr(validator, "clean") == getattr(CustomValidator, "clean"):
-                    continue
-
-                for validated_object in class_name.objects.all():
-                    try:
-                        validator(validated_object).clean(exclude_disabled_rules=False)
-                        clean_compliance_rules_results_for_instance(instance=validated_object, excluded_pks=[])
-                    except ValidationError as error:
-                        result = validator.get_compliance_result(
-                            validator,
-                            instance=validated_object,
-                            message=error.messages[0],
-                            attribute=list(error.message_dict.keys())[0],
-                            valid=False,
-                        )
-                        clean_compliance_rules_results_for_instance(instance=validated_object, excluded_pks=[result.pk])
+        with DataComplianceResultWriter() as result_writer:
+            for validator, model_class in get_builtin_rule_validators():
+                unique_evaluator = get_unique_evaluator(model_class)
+                fingerprint = get_builtin_rules_fingerprint(model_class)
+                queryset = model_class.objects.all()
+                if incremental:
+                    changed_since = get_logged_changed_since(validator.__name__, model_class, fingerprint)
+                    queryset = filter_changed_objects_for_builtin_rules(
+                        queryset, validator, changed_since, unique_evaluator=unique_evaluator
+                    )
+                audit_queryset_with_builtin_rules(
+                    validator, queryset, result_writer, unique_evaluator=unique_evaluator, chunk_size=chunk_size
+                )
+                runs.append((validator.__name__, fingerprint))
+        for name, fingerprint in runs:
+            record_run(name, fingerprint, started)
 
 
 class DeleteOrphanedDataComplianceData(Job):
@@ -146,19 +282,63 @@ class DeleteOrphanedDataComplianceData(Job):
     name = "Delete Orphaned Data Compliance Data"
     description = "Delete any Data Compliance objects where its validated object no longer exists."
 
+    dryrun = DryRunVar(description="Only count the orphaned Data Compliance objects, without deleting them.")
+
     def run(self, *args, **kwargs):
         """Delete DataCompliance objects where its validated_object no longer exists."""
+        dryrun = kwargs.get("dryrun", False)
         number_deleted = 0
-        for obj in DataCompliance.objects.all():
-            if obj.validated_object is None:
-                logger.info("Deleting %s.", obj)
-                obj.delete()
-                number_deleted += 1
-        logger.info("Deleted %s orphaned DataCompliance objects.", number_deleted)
+        content_type_ids = DataCompliance.objects.order_by().values_list("content_type", flat=True).distinct()
+        for content_type in ContentType.objects.filter(pk__in=list(content_type_ids)):
+            number_orphaned = 0
+            for object_ids in iterate_orphaned_object_ids(content_type):
+                orphaned = DataCompliance.objects.filter(content_type=content_type, object_id__in=object_ids)
+                if dryrun:
+                    number_orphaned += orphaned.count()
+                else:
+                    number_orphaned += orphaned.delete()[1].get(DataCompliance._meta.label, 0)
+            if number_orphaned:
+                logger.info(
+                    "%s %s orphaned DataCompliance objects of %s.",
+                    "Found" if dryrun else "Deleted",
+                    number_orphaned,
+                    content_type,
+                )
+            number_deleted += number_orphaned
+        if dryrun:
+            logger.info("Found %s orphaned DataCompliance objects.", number_deleted)
+        else:
+            logger.info("Deleted %s orphaned DataCompliance objects.", number_deleted)
+
+
+class RebuildDataComplianceSummary(Job):
+    """Utility job to count every Data Compliance object again, replacing the Data Compliance summary."""
+
+    name = "Rebuild Data Compliance Summary"
+    description = "Count every Data Compliance object again, in case the summary counts drifted."
+
+    def run(self, *args, **kwargs):
+        """Replace the DataComplianceSummary counts with new counts of the DataCompliance objects."""
+        number_summaries = rebuild_summary()
+        logger.info("Rebuilt the Data Compliance summary, with %s counts.", number_summaries)
+
+
+class RecordDataComplianceSnapshot(Job):
+    """Utility job to record today's numbers of valid and invalid Data Compliance objects, for the Compliance Trend."""
+
+    name = "Record Data Compliance Snapshot"
+    description = "Record today's Data Compliance counts for the Compliance Trend. Meant to be scheduled daily."
+
+    def run(self, *args, **kwargs):
+        """Record the DataComplianceSnapshot rows of today from the DataComplianceSummary counts."""
+        number_snapshots = record_snapshot()
+        logger.info("Recorded the Data Compliance snapshot of today, with %s counts.", number_snapshots)
 
 
 jobs = (
     RunRegisteredDataComplianceRules,
     DeleteOrphanedDataComplianceData,
+    RebuildDataComplianceSummary,
+    RecordDataComplianceSnapshot,
 )
 register_jobs(*jobs)
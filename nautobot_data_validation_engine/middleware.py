@@ -0,0 +1,16 @@
+"""Middleware for nautobot_data_validation_engine."""
+
+from nautobot_data_validation_engine.rule_cache import validation_scope
+
+
+class ValidationScopeMiddleware:
+    """Run each request within a validation scope, so that validating many objects reuses the same cached rules."""
+
+    def __init__(self, get_response):
+        """Initialize the middleware with the next handler of the request."""
+        self.get_response = get_response
+
+    def __call__(self, request):
+        """Handle the request within a validation scope."""
+        with validation_scope():
+            return self.get_response(request)
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("nautobot_data_validation_engine", "0007_alter_datacompliance_compliance_class_name_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="datacompliance",
+            index=models.Index(fields=["content_type", "object_id"], name="nautobot_dve_dc_object_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="datacompliance",
+            index=models.Index(
+                condition=models.Q(("valid", False)),
+                fields=["compliance_class_name", "content_type"],
+                name="nautobot_dve_dc_invalid_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="datacompliance",
+            index=models.Index(fields=["last_validation_date"], name="nautobot_dve_dc_validated_idx"),
+        ),
+    ]
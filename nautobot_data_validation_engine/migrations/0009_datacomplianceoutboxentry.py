@@ -0,0 +1,38 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:39
+
+import uuid
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("nautobot_data_validation_engine", "0008_datacompliance_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DataComplianceOutboxEntry",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4, editable=False, primary_key=True, serialize=False, unique=True
+                    ),
+                ),
+                ("object_id", models.CharField(max_length=255)),
+                ("created", models.DateTimeField(auto_now_add=True)),
+                (
+                    "content_type",
+                    models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to="contenttypes.contenttype"),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "Data Compliance outbox entries",
+                "indexes": [models.Index(fields=["created"], name="nautobot_dve_outbox_idx")],
+                "unique_together": {("content_type", "object_id")},
+            },
+        ),
+    ]
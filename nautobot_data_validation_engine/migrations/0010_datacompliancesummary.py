@@ -0,0 +1,63 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:49
+
+import uuid
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def count_data_compliance(apps, schema_editor):
+    """Count the existing DataCompliance results into the new summary."""
+    DataCompliance = apps.get_model("nautobot_data_validation_engine", "DataCompliance")
+    DataComplianceSummary = apps.get_model("nautobot_data_validation_engine", "DataComplianceSummary")
+    fields = ("content_type", "compliance_class_name", "validated_attribute", "valid")
+    counts = DataCompliance.objects.using(schema_editor.connection.alias).order_by().values_list(*fields)
+    DataComplianceSummary.objects.using(schema_editor.connection.alias).bulk_create(
+        [
+            DataComplianceSummary(
+                content_type_id=content_type_id,
+                compliance_class_name=compliance_class_name,
+                validated_attribute=validated_attribute,
+                valid=valid,
+                count=count,
+            )
+            for content_type_id, compliance_class_name, validated_attribute, valid, count in counts.annotate(
+                count=Count("pk")
+            )
+        ]
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("nautobot_data_validation_engine", "0009_datacomplianceoutboxentry"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DataComplianceSummary",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4, editable=False, primary_key=True, serialize=False, unique=True
+                    ),
+                ),
+                ("compliance_class_name", models.CharField(max_length=255)),
+                ("validated_attribute", models.CharField(blank=True, default="", max_length=255)),
+                ("valid", models.BooleanField()),
+                ("count", models.BigIntegerField(default=0)),
+                (
+                    "content_type",
+                    models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to="contenttypes.contenttype"),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "Data Compliance summaries",
+                "unique_together": {("content_type", "compliance_class_name", "validated_attribute", "valid")},
+            },
+        ),
+        migrations.RunPython(count_data_compliance, migrations.RunPython.noop),
+    ]
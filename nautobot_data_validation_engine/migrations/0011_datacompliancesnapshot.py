@@ -0,0 +1,39 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:53
+
+import uuid
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("nautobot_data_validation_engine", "0010_datacompliancesummary"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DataComplianceSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4, editable=False, primary_key=True, serialize=False, unique=True
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("compliance_class_name", models.CharField(max_length=255)),
+                ("valid", models.BigIntegerField(default=0)),
+                ("invalid", models.BigIntegerField(default=0)),
+                (
+                    "content_type",
+                    models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to="contenttypes.contenttype"),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "Data Compliance snapshots",
+                "unique_together": {("date", "content_type", "compliance_class_name")},
+            },
+        ),
+    ]
@@ -7,15 +7,21 @@ from django.contrib.contenttypes.models import ContentType
 from django.core.validators import MinValueValidator, ValidationError
 from django.db import models
 from django.shortcuts import reverse
+from django.template import engines
+from jinja2 import TemplateSyntaxError, nodes
 
 try:
     from nautobot.apps.constants import CHARFIELD_MAX_LENGTH
 except ImportError:
     CHARFIELD_MAX_LENGTH = 255
+from nautobot.core.models import BaseModel
 from nautobot.core.models.generics import PrimaryModel
 from nautobot.core.models.querysets import RestrictedQuerySet
 from nautobot.extras.utils import FeatureQuery, extras_features
 
+# The columns identifying the DataComplianceSummary count that a DataCompliance result belongs to.
+SUMMARY_KEY_ATTNAMES = ("content_type_id", "compliance_class_name", "validated_attribute", "valid")
+
 
 def validate_regex(value):
     """
@@ -29,6 +35,24 @@ def validate_regex(value):
         raise ValidationError(f"{value} is not a valid regular expression.") from e
 
 
+def get_template_object_attributes(template_code):
+    """
+    Statically analyze a Jinja2 template and return the sorted names of the `object` attributes it reads.
+
+    Only direct accesses are reported, e.g. `location` and `name` for `{{ object.location.name }}{{ object["name"] }}`.
+    Raises `jinja2.TemplateSyntaxError` if the template cannot be parsed.
+    """
+    attributes = set()
+    for node in engines["jinja"].env.parse(template_code).find_all((nodes.Getattr, nodes.Getitem)):
+        if not isinstance(node.node, nodes.Name) or node.node.name != "object":
+            continue
+        if isinstance(node, nodes.Getattr):
+            attributes.add(node.attr)
+        elif isinstance(node.arg, nodes.Const) and isinstance(node.arg.value, str):
+            attributes.add(node.arg.value)
+    return sorted(attributes)
+
+
 class ValidationRuleManager(RestrictedQuerySet):
     """Adds a helper method for getting all active instances for a given content type."""
 
@@ -98,9 +122,14 @@ class RegularExpressionValidationRule(ValidationRule):
 
     def clean(self):
         """Ensure field is valid for the model and has not been blacklisted."""
-        # Only validate the regular_expression if context processing is disabled
+        # Only validate the regular_expression if context processing is disabled, otherwise validate the template
         if not self.context_processing:
             validate_regex(self.regular_expression)
+        else:
+            try:
+                get_template_object_attributes(self.regular_expression)
+            except TemplateSyntaxError as e:
+                raise ValidationError({"regular_expression": f"Invalid Jinja2 template: {e}"}) from e
 
         # Check that field exists on model
         if self.field not in [f.name for f in self.content_type.model_class()._meta.get_fields()]:
@@ -320,6 +349,14 @@ class UniqueValidationRule(ValidationRule):
             raise ValidationError({"field": "This field is already unique by default."})
 
 
+class DataComplianceQuerySet(RestrictedQuerySet):
+    """Adds a helper method for getting all results for a given object."""
+
+    def get_for_object(self, obj):
+        """Return all DataCompliance results of the given object, using the (content_type, object_id) index."""
+        return self.filter(content_type=ContentType.objects.get_for_model(obj), object_id=str(obj.pk))
+
+
 class DataCompliance(PrimaryModel):
     """Model to represent the results of an audit method."""
 
@@ -334,6 +371,8 @@ class DataCompliance(PrimaryModel):
     valid = models.BooleanField(blank=False, null=False)
     message = models.TextField(blank=True, default="")
 
+    objects = DataComplianceQuerySet.as_manager()
+
     class Meta:
         """Meta class for Audit model."""
 
@@ -345,6 +384,26 @@ class DataCompliance(PrimaryModel):
             "object_id",
             "validated_attribute",
         )
+        indexes = [
+            # The content_type foreign key index only narrows lookups down to a model, and the unique_together index
+            # leads with compliance_class_name, so neither serves per-object lookups.
+            models.Index(fields=["content_type", "object_id"], name="nautobot_dve_dc_object_idx"),
+            models.Index(
+                fields=["compliance_class_name", "content_type"],
+                condition=models.Q(valid=False),
+                name="nautobot_dve_dc_invalid_idx",
+            ),
+            models.Index(fields=["last_validation_date"], name="nautobot_dve_dc_validated_idx"),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Load a result, remembering the summary key it was loaded with to count its changes once saved."""
+        instance = super().from_db(db, field_names, values)
+        loaded = dict(zip(field_names, values))
+        if all(name in loaded for name in SUMMARY_KEY_ATTNAMES):
+            instance._loaded_summary_key = tuple(loaded[name] for name in SUMMARY_KEY_ATTNAMES)  # pylint: disable=protected-access
+        return instance
 
     def __str__(self):
         """Return a string representation of this DataCompliance object."""
@@ -353,3 +412,74 @@ class DataCompliance(PrimaryModel):
     def get_absolute_url(self, api=False):
         """Return the absolute URL to this Audit object."""
         return reverse("plugins:nautobot_data_validation_engine:datacompliance", args=[self.pk])
+
+
+class DataComplianceOutboxEntry(BaseModel):
+    """An object saved since its asynchronous DataComplianceRule classes were last run, waiting to be audited."""
+
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE, blank=False, null=False)
+    object_id = models.CharField(max_length=CHARFIELD_MAX_LENGTH, blank=False, null=False)
+    created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        """Meta class for DataComplianceOutboxEntry model."""
+
+        verbose_name_plural = "Data Compliance outbox entries"
+
+        # An object saved again before it is audited is only audited once.
+        unique_together = ("content_type", "object_id")
+        indexes = [models.Index(fields=["created"], name="nautobot_dve_outbox_idx")]
+
+    def __str__(self):
+        """Return a string representation of this DataComplianceOutboxEntry object."""
+        return f"{self.content_type.app_label}.{self.content_type.model} {self.object_id}"
+
+
+class DataComplianceSummary(BaseModel):
+    """The number of DataCompliance results of a compliance class and validated attribute, by content type and validity."""
+
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE, blank=False, null=False)
+    compliance_class_name = models.CharField(max_length=CHARFIELD_MAX_LENGTH, blank=False, null=False)
+    validated_attribute = models.CharField(max_length=CHARFIELD_MAX_LENGTH, blank=True, default="")
+    valid = models.BooleanField(blank=False, null=False)
+    # Not a PositiveBigIntegerField: a count that drifted below zero must not fail the write path updating it.
+    count = models.BigIntegerField(default=0)
+
+    class Meta:
+        """Meta class for DataComplianceSummary model."""
+
+        verbose_name_plural = "Data Compliance summaries"
+
+        unique_together = ("content_type", "compliance_class_name", "validated_attribute", "valid")
+
+    def __str__(self):
+        """Return a string representation of this DataComplianceSummary object."""
+        return (
+            f"{self.compliance_class_name}: {self.count} {'valid' if self.valid else 'invalid'} "
+            f"{self.validated_attribute} results for {self.content_type.app_label}.{self.content_type.model}"
+        )
+
+
+class DataComplianceSnapshot(BaseModel):
+    """The numbers of valid and invalid DataCompliance results of a compliance class and content type on a given day."""
+
+    date = models.DateField(blank=False, null=False)
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE, blank=False, null=False)
+    compliance_class_name = models.CharField(max_length=CHARFIELD_MAX_LENGTH, blank=False, null=False)
+    valid = models.BigIntegerField(default=0)
+    invalid = models.BigIntegerField(default=0)
+
+    class Meta:
+        """Meta class for DataComplianceSnapshot model."""
+
+        verbose_name_plural = "Data Compliance snapshots"
+
+        # Leads with the date, so that a trend is read with a range scan of the index.
+        unique_together = ("date", "content_type", "compliance_class_name")
+
+    def __str__(self):
+        """Return a string representation of this DataComplianceSnapshot object."""
+        return (
+            f"{self.compliance_class_name}: {self.invalid} invalid of {self.valid + self.invalid} results for "
+            f"{self.content_type.app_label}.{self.content_type.model} on {self.date}"
+        )
@@ -75,6 +75,21 @@ menu_items = (
                         name="Data Compliance",
                         permissions=["nautobot_data_validation_engine.view_datacompliance"],
                     ),
+                    NavMenuItem(
+                        link="plugins:nautobot_data_validation_engine:top_failing_rules",
+                        name="Top Failing Rules",
+                        permissions=["nautobot_data_validation_engine.view_datacompliance"],
+                    ),
+                    NavMenuItem(
+                        link="plugins:nautobot_data_validation_engine:compliance_trend",
+                        name="Compliance Trend",
+                        permissions=["nautobot_data_validation_engine.view_datacompliance"],
+                    ),
+                    NavMenuItem(
+                        link="plugins:nautobot_data_validation_engine:slowest_rules",
+                        name="Slowest Rules",
+                        permissions=["nautobot_data_validation_engine.view_datacompliance"],
+                    ),
                 ),
             ),
         ),
@@ -0,0 +1,179 @@
+"""
+Asynchronous evaluation of the non-enforcing DataComplianceRule classes.
+
+A DataComplianceRule class with `enforce = False` can never prevent an object from being saved, so, when the
+`async_compliance_evaluation` setting is enabled, `BaseValidator.clean` no longer runs it. Instead, once the
+transaction saving an object is committed, the object is recorded in the `DataComplianceOutboxEntry` table, which holds
+a single entry per object however many times it is saved, and a Celery task auditing the objects of the outbox in
+batches is scheduled on the `compliance_outbox_queue` queue. A single task is scheduled at a time, a few seconds
+later, so that the objects saved in the meantime are audited together.
+
+Enforcing DataComplianceRule classes and the built-in validation rules are still evaluated while saving.
+"""
+
+import logging
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import connections, transaction
+from nautobot.core.celery import nautobot_task
+
+from nautobot_data_validation_engine.audit import audit_with_compliance_class
+from nautobot_data_validation_engine.custom_validators import get_compliance_classes
+from nautobot_data_validation_engine.instrumentation import rule_statistics
+from nautobot_data_validation_engine.models import DataComplianceOutboxEntry
+from nautobot_data_validation_engine.results import DataComplianceResultWriter
+from nautobot_data_validation_engine.rule_cache import validation_scope
+from nautobot_data_validation_engine.utils import is_on_commit_pending
+
+LOGGER = logging.getLogger(__name__)
+
+DRAIN_SCHEDULED_CACHE_KEY = "nautobot_data_validation_engine.outbox.drain_scheduled"
+# Seconds between the first object recorded in the outbox and the task auditing it, during which more objects coalesce.
+DRAIN_DELAY = 5
+# Seconds after which a drain is scheduled again even if the previously scheduled one never started.
+DRAIN_SCHEDULED_TIMEOUT = 300
+
+# The objects saved within the transaction currently open on each database connection of this thread.
+_local = threading.local()
+
+
+def is_async_compliance_enabled():
+    """Return whether the non-enforcing DataComplianceRule classes are evaluated asynchronously."""
+    return settings.PLUGINS_CONFIG["nautobot_data_validation_engine"]["async_compliance_evaluation"]
+
+
+def get_async_compliance_classes(model):
+    """Return the non-enforcing DataComplianceRule classes of the given model (`<app_label>.<model>`)."""
+    return [compliance_class for compliance_class in get_compliance_classes(model) if not compliance_class.enforce]
+
+
+class _TransactionObjects:
+    """The objects saved within a transaction, recorded in the outbox together once it is committed."""
+
+    def __init__(self, using):
+        """Initialize an empty set of objects saved within the transaction open on the `using` database."""
+        self.using = using
+        self.objects = set()
+
+    def __call__(self):
+        """Record the objects in the outbox, as an on_commit callback."""
+        if _local.pending.get(self.using) is self:
+            del _local.pending[self.using]
+        record_objects(self.objects, using=self.using)
+
+
+def defer_compliance_evaluation(instance, using):
+    """Record `instance` in the outbox once the current transaction on the `using` database is committed."""
+    obj = (ContentType.objects.get_for_model(instance).pk, str(instance.pk))
+    # Outside of a transaction, the object is already committed.
+    if not connections[using].in_atomic_block:
+        record_objects({obj}, using=using)
+        return
+    if not hasattr(_local, "pending"):
+        _local.pending = {}
+    transaction_objects = _local.pending.get(using)
+    # A rolled back transaction drops its on_commit callbacks, including the one of `transaction_objects`.
+    if transaction_objects is None or not is_on_commit_pending(transaction_objects, using=using):
+        transaction_objects = _local.pending[using] = _TransactionObjects(using)
+        transaction.on_commit(transaction_objects, using=using)
+    transaction_objects.objects.add(obj)
+
+
+def record_objects(objects, using=None):
+    """Record the given (content type pk, object id) pairs in the outbox and schedule a task auditing them."""
+    DataComplianceOutboxEntry.objects.using(using).bulk_create(
+        [
+            DataComplianceOutboxEntry(content_type_id=content_type_id, object_id=object_id)
+            for content_type_id, object_id in objects
+        ],
+        ignore_conflicts=True,
+    )
+    schedule_drain()
+
+
+def schedule_drain():
+    """Schedule a task auditing the objects of the outbox, unless one is already scheduled."""
+    if cache.add(DRAIN_SCHEDULED_CACHE_KEY, True, timeout=DRAIN_SCHEDULED_TIMEOUT):
+        drain_compliance_outbox.apply_async(
+            countdown=DRAIN_DELAY,
+            queue=settings.PLUGINS_CONFIG["nautobot_data_validation_engine"]["compliance_outbox_queue"],
+        )
+
+
+def audit_entries(entries, result_writer):
+    """Audit the objects of the given (content type pk, object id) outbox entries, returning the number of audits."""
+    count = 0
+    object_ids = defaultdict(list)
+    for content_type_id, object_id in entries:
+        object_ids[content_type_id].append(object_id)
+    for content_type_id, ids in object_ids.items():
+        model_class = ContentType.objects.get_for_id(content_type_id).model_class()
+        if model_class is None:
+            continue
+        for compliance_class in get_async_compliance_classes(model_class._meta.label_lower):
+            # Objects deleted since they were recorded are skipped.
+            objects = compliance_class.get_queryset().filter(pk__in=ids)
+            count += audit_with_compliance_class(compliance_class, objects, result_writer)
+    return count
+
+
+def audit_claimed_entries(entries):
+    """Audit the objects of the given outbox entries in a savepoint, returning the number of audits.
+
+    If the audit fails, the entries are audited again one at a time, each in a savepoint of its own, so that a single
+    failing object only loses its own results. Its failure is logged and the object is dropped from the outbox, to be
+    audited again the next time it is saved.
+    """
+    try:
+        with transaction.atomic(), DataComplianceResultWriter() as result_writer:
+            return audit_entries(entries, result_writer)
+    except Exception:  # pylint: disable=broad-exception-caught
+        if len(entries) == 1:
+            content_type_id, object_id = entries[0]
+            LOGGER.exception(
+                "Auditing the object %s of content type %s from the compliance outbox failed, dropping it",
+                object_id,
+                content_type_id,
+            )
+            return 0
+    return sum(audit_claimed_entries([entry]) for entry in entries)
+
+
+def drain_outbox(batch_size=None):
+    """Audit the objects of the outbox with their non-enforcing DataComplianceRule classes until it is empty.
+
+    Return the number of audits run. Each batch of entries is claimed with `SELECT ... FOR UPDATE SKIP LOCKED` and
+    removed from the outbox in the transaction auditing its objects, so that the entries are kept if the transaction
+    fails, and an object saved again in the meantime is recorded and audited anew once the transaction is committed.
+    """
+    batch_size = batch_size or settings.PLUGINS_CONFIG["nautobot_data_validation_engine"]["audit_chunk_size"]
+    count = 0
+    with validation_scope():
+        while True:
+            with transaction.atomic():
+                entries = list(
+                    DataComplianceOutboxEntry.objects.select_for_update(skip_locked=True)
+                    .order_by("created")
+                    .values_list("pk", "content_type_id", "object_id")[:batch_size]
+                )
+                if not entries:
+                    break
+                DataComplianceOutboxEntry.objects.filter(pk__in=[pk for pk, _, _ in entries]).delete()
+                count += audit_claimed_entries([entry[1:] for entry in entries])
+    # Objects recorded from now on need another drain, as do those recorded since the outbox was last found empty.
+    cache.delete(DRAIN_SCHEDULED_CACHE_KEY)
+    if DataComplianceOutboxEntry.objects.exists():
+        schedule_drain()
+    return count
+
+
+@nautobot_task
+def drain_compliance_outbox():
+    """Audit the objects saved since they were last audited by their asynchronous DataComplianceRule classes."""
+    count = drain_outbox()
+    rule_statistics.flush()
+    return {"audits": count}
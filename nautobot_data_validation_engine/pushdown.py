@@ -0,0 +1,262 @@
+"""
+Translation of the built-in validation rules into database filters, used when auditing existing data.
+
+Each rule is compiled into a `Q` object matching every object that may violate it, so that the objects matching none
+of them are known to pass every rule without being fetched. The filters are allowed to match objects that do pass the
+rules, as the matching objects are evaluated again in Python, but must never miss an object violating one of them.
+
+Regular expressions are only translated when they are limited to a portable subset of the syntax, for which the
+database either agrees with Python's `re.match()` or is stricter.
+"""
+
+import math
+import re
+
+from django.db import connections, router
+from django.db.models import (
+    BooleanField,
+    CharField,
+    Count,
+    DateField,
+    DecimalField,
+    DurationField,
+    FloatField,
+    IntegerField,
+    Q,
+    TextField,
+    TimeField,
+    UUIDField,
+)
+
+from nautobot_data_validation_engine.models import (
+    MinMaxValidationRule,
+    RegularExpressionValidationRule,
+    RequiredValidationRule,
+    UniqueValidationRule,
+)
+from nautobot_data_validation_engine.rule_cache import rule_cache
+
+# Characters with a special meaning in a regular expression, outside of a bracket expression.
+REGEX_SPECIAL_CHARACTERS = set(".^$*+?{}[]\\|()")
+# Largest bound of a `{m,n}` quantifier supported by every database.
+REGEX_MAX_REPEAT = 255
+# The ranges allowed in a bracket expression, whose meaning doesn't depend on the database collation.
+REGEX_RANGES = ("0123456789", "abcdefghijklmnopqrstuvwxyz", "ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+# The fields whose values are never strings, including the DateTimeField subclass of DateField.
+NON_STRING_FIELDS = (
+    BooleanField,
+    DateField,
+    DecimalField,
+    DurationField,
+    FloatField,
+    IntegerField,
+    TimeField,
+    UUIDField,
+)
+
+
+class _RegexParser:
+    """Recursive descent parser checking that a regular expression only uses the portable subset of the syntax."""
+
+    def __init__(self, pattern):
+        """Initialize a parser of `pattern`."""
+        self.pattern = pattern
+        self.position = 0
+
+    def peek(self):
+        """Return the next character, or None at the end of the pattern."""
+        return self.pattern[self.position] if self.position < len(self.pattern) else None
+
+    def take(self):
+        """Consume and return the next character."""
+        character = self.peek()
+        self.position += 1
+        return character
+
+    def parse_alternation(self):
+        """Parse branches separated by `|`, each of which must match at least one atom."""
+        self.parse_branch()
+        while self.peek() == "|":
+            self.take()
+            self.parse_branch()
+
+    def parse_branch(self):
+        """Parse a non-empty sequence of atoms, each optionally followed by a quantifier."""
+        if self.peek() in (None, "|", ")"):
+            raise ValueError("Empty branch")
+        while self.peek() not in (None, "|", ")"):
+            self.parse_atom()
+            if self.peek() in ("*", "+", "?"):
+                self.take()
+            elif self.peek() == "{":
+                self.parse_repeat()
+
+    def parse_atom(self):
+        """Parse a literal, `.`, an escaped punctuation character, a bracket expression or a group."""
+        character = self.take()
+        if character == "\\":
+            escaped = self.take()
+            if escaped is None or escaped.isalnum() or not escaped.isascii():
+                raise ValueError("Unsupported escape")
+        elif character == "[":
+            self.parse_bracket()
+        elif character == "(":
+            if self.peek() == "?":
+                raise ValueError("Unsupported group")
+            self.parse_alternation()
+            if self.take() != ")":
+                raise ValueError("Unbalanced group")
+        elif character in REGEX_SPECIAL_CHARACTERS and character != ".":
+            raise ValueError(f"Unsupported {character}")
+
+    def parse_bracket(self):
+        """Parse a non-negated bracket expression of literals, escaped punctuation and ASCII alphanumeric ranges."""
+        if self.peek() in ("^", "]"):
+            raise ValueError("Unsupported bracket expression")
+        while self.peek() != "]":
+            first = self.parse_bracket_character()
+            if self.peek() == "-" and self.pattern[self.position + 1 : self.position + 2] != "]":
+                self.take()
+                last = self.parse_bracket_character()
+                if not any(first in chars and last in chars and first <= last for chars in REGEX_RANGES):
+                    raise ValueError("Unsupported range")
+        self.take()
+
+    def parse_bracket_character(self):
+        """Parse a single character of a bracket expression."""
+        character = self.take()
+        if character is None or character in "[-":
+            raise ValueError("Unsupported bracket expression")
+        if character == "\\":
+            character = self.take()
+            if character is None or character.isalnum() or not character.isascii():
+                raise ValueError("Unsupported escape")
+        return character
+
+    def parse_repeat(self):
+        """Parse a `{m}`, `{m,}` or `{m,n}` quantifier."""
+        match = re.compile(r"\{(\d+)(,(\d*))?\}").match(self.pattern, self.position)
+        if not match:
+            raise ValueError("Unsupported quantifier")
+        low = int(match.group(1))
+        high = int(match.group(3)) if match.group(3) else low
+        if low > REGEX_MAX_REPEAT or high > REGEX_MAX_REPEAT or high < low:
+            raise ValueError("Unsupported quantifier")
+        self.position = match.end()
+
+
+def get_database_regex(pattern, vendor):
+    """
+    Return a regular expression for the database `vendor` matching at least the values that `pattern` does not match.
+
+    Return None if `pattern` uses anything but literals, `.`, escaped punctuation, simple bracket expressions,
+    groups, alternation and greedy quantifiers, or a leading `^` and trailing `$`.
+    """
+    if vendor not in ("postgresql", "mysql"):
+        return None
+    body = pattern[1:] if pattern.startswith("^") else pattern
+    anchored_end = body.endswith("$") and not body.endswith("\\$")
+    if anchored_end:
+        if vendor == "mysql":
+            # MySQL's `$` also matches before line terminators Python doesn't consider as such.
+            return None
+        body = body[:-1]
+    parser = _RegexParser(body)
+    try:
+        parser.parse_alternation()
+        if parser.position != len(body):
+            raise ValueError("Unbalanced group")
+    except (ValueError, IndexError):
+        return None
+    # `re.match()` only matches at the start of the value.
+    database_pattern = f"^({body}){'$' if anchored_end else ''}"
+    if vendor == "postgresql":
+        # Stop `.` from matching newlines, as in Python.
+        database_pattern = f"(?p){database_pattern}"
+    return database_pattern
+
+
+def is_string_field(field):
+    """Return whether the given model field holds strings."""
+    return isinstance(field, (CharField, TextField))
+
+
+def get_violation_filter(validator, model_class):
+    """
+    Return a `Q` matching every object of `model_class` that may violate a built-in rule of `validator`.
+
+    Return None if a rule cannot be translated into a database filter.
+    """
+    rules = rule_cache.get_for_model(validator.model, exclude_disabled_rules=False)
+    condition = Q(pk__in=[])
+    for rule in (*rules.regex_rules, *rules.min_max_rules, *rules.required_rules, *rules.unique_rules):
+        rule_condition = get_rule_violation_filter(rule, model_class)
+        if rule_condition is None:
+            return None
+        condition |= rule_condition
+    return condition
+
+
+def get_rule_violation_filter(rule, model_class):
+    """
+    Return a `Q` matching every object of `model_class` that may violate the given built-in rule.
+
+    Return None if the rule cannot be translated into a database filter.
+    """
+    for rule_class, get_filter in (
+        (RegularExpressionValidationRule, _get_regex_violation_filter),
+        (MinMaxValidationRule, _get_min_max_violation_filter),
+        (RequiredValidationRule, _get_required_violation_filter),
+        (UniqueValidationRule, _get_unique_violation_filter),
+    ):
+        if isinstance(rule, rule_class):
+            return get_filter(rule, model_class)
+    return None
+
+
+def _get_regex_violation_filter(rule, model_class):
+    field = model_class._meta.get_field(rule.field)
+    vendor = connections[router.db_for_read(model_class)].vendor
+    database_regex = None if rule.context_processing else get_database_regex(rule.regular_expression, vendor)
+    if database_regex is None or not is_string_field(field):
+        return None
+    # Negating a lookup also matches NULL, which Python matches as "".
+    return ~Q(**{f"{rule.field}__regex": database_regex})
+
+
+def _get_min_max_violation_filter(rule, model_class):
+    field = model_class._meta.get_field(rule.field)
+    # Other numbers, e.g. Decimal, are never considered numeric by the rule.
+    if not isinstance(field, (IntegerField, FloatField)):
+        return None
+    condition = Q(**{f"{rule.field}__isnull": True})
+    # The bounds are floats, which the database would truncate when compared to an integer field.
+    integer = isinstance(field, IntegerField)
+    if rule.min is not None:
+        condition |= Q(**{f"{rule.field}__lt": math.ceil(rule.min) if integer else rule.min})
+    if rule.max is not None:
+        condition |= Q(**{f"{rule.field}__gt": math.floor(rule.max) if integer else rule.max})
+    return condition
+
+
+def _get_required_violation_filter(rule, model_class):
+    field = model_class._meta.get_field(rule.field)
+    condition = Q(**{f"{rule.field}__isnull": True})
+    if is_string_field(field):
+        return condition | Q(**{rule.field: ""})
+    # Only the fields whose values are never equal to "" are known to be missing exactly when NULL; the emptiness of
+    # other fields, e.g. a JSONField holding "", can't be expressed exactly.
+    if isinstance(field, NON_STRING_FIELDS):
+        return condition
+    return None
+
+
+def _get_unique_violation_filter(rule, model_class):
+    duplicate_values = (
+        model_class._default_manager.order_by()  # pylint: disable=protected-access
+        .values(rule.field)
+        .annotate(instance_count=Count("pk"))
+        .filter(instance_count__gt=rule.max_instances)
+        .values(rule.field)
+    )
+    return Q(**{f"{rule.field}__in": duplicate_values})
@@ -0,0 +1,152 @@
+"""Buffered writing of DataCompliance results."""
+
+from collections import Counter
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import connections, router
+from django.utils import timezone
+
+from nautobot_data_validation_engine.models import CHARFIELD_MAX_LENGTH, DataCompliance
+from nautobot_data_validation_engine.summary import get_summary_key, record_deltas
+
+UNIQUE_FIELDS = ("compliance_class_name", "content_type", "object_id", "validated_attribute")
+UPDATE_FIELDS = (
+    "last_validation_date",
+    "validated_object_str",
+    "validated_attribute_value",
+    "message",
+    "valid",
+    "last_updated",
+)
+# The fields compared by a writer skipping unchanged results.
+COMPARED_FIELDS = ("validated_object_str", "validated_attribute_value", "message", "valid")
+
+
+def format_attribute_value(value):
+    """Return the string stored as the `validated_attribute_value` (or `validated_object_str`) for `value`."""
+    return str(value)[:CHARFIELD_MAX_LENGTH] if value else ""
+
+
+class DataComplianceResultWriter:
+    """
+    Collect DataCompliance results and write them in batches.
+
+    Each batch is written with a single `bulk_create(update_conflicts=True)` statement, which inserts new results and
+    updates existing ones in place, instead of an `update_or_create()` (and full clean) per result. When the same
+    result is added more than once before a flush, the last one wins.
+
+    The existing results of each batch are loaded first, with a single query, to keep the DataComplianceSummary
+    counts up to date. With `skip_unchanged`, only the new or changed results are written: results whose validity,
+    message and values are unchanged only get their `last_validation_date` bumped, with a single bulk UPDATE, and keep
+    their `last_updated` date.
+
+    The writer can be used as a context manager, in which case any remaining results are flushed on exit.
+    """
+
+    def __init__(self, batch_size=None, skip_unchanged=None):
+        """Initialize a writer flushing automatically every `batch_size` results.
+
+        Both `batch_size` and `skip_unchanged` default to the corresponding app settings.
+        """
+        app_settings = settings.PLUGINS_CONFIG["nautobot_data_validation_engine"]
+        self.batch_size = batch_size or app_settings["compliance_result_batch_size"]
+        if skip_unchanged is None:
+            skip_unchanged = app_settings["skip_unchanged_compliance_results"]
+        self.skip_unchanged = skip_unchanged
+        self.written = 0
+        self.unchanged = 0
+        self._pending = {}
+
+    def __enter__(self):
+        """Return the writer itself."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Flush any remaining results."""
+        self.flush()
+
+    def __len__(self):
+        """Return the number of results waiting to be written."""
+        return len(self._pending)
+
+    def add(  # pylint: disable=too-many-arguments
+        self, compliance_class_name, instance, attribute, *, message, valid, attribute_value=None, result_date=None
+    ):
+        """Queue the result of validating `attribute` of `instance`, flushing if the batch is full."""
+        content_type = ContentType.objects.get_for_model(instance)
+        object_id = str(instance.pk)
+        self._pending[(compliance_class_name, content_type.pk, object_id, attribute)] = DataCompliance(
+            compliance_class_name=compliance_class_name,
+            content_type=content_type,
+            object_id=object_id,
+            validated_attribute=attribute,
+            last_validation_date=result_date or timezone.now(),
+            validated_object_str=format_attribute_value(instance),
+            validated_attribute_value=format_attribute_value(attribute_value),
+            message=message,
+            valid=valid,
+        )
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Write all queued results to the database."""
+        if not self._pending:
+            return
+        pending = self._pending
+        self._pending = {}
+        existing = self._get_existing(pending)
+        if self.skip_unchanged:
+            pending = self._skip_unchanged(pending, existing)
+            if not pending:
+                return
+        results = list(pending.values())
+        using = router.db_for_write(DataCompliance)
+        connection = connections[using]
+        # Upserting with update_conflicts requires Django 4.1, hence Nautobot 2.3.
+        DataCompliance.objects.bulk_create(
+            results,
+            update_conflicts=True,
+            # MySQL always upserts on any unique constraint and doesn't accept a conflict target
+            unique_fields=UNIQUE_FIELDS if connection.features.supports_update_conflicts_with_target else None,
+            update_fields=UPDATE_FIELDS,
+        )
+        self.written += len(results)
+
+        # A new result adds to the count of its validity, a changed validity moves an existing result between counts.
+        deltas = Counter()
+        for key, result in pending.items():
+            previous = existing.get(key)
+            if previous is None or previous[-1] != result.valid:
+                deltas[get_summary_key(result)] += 1
+                if previous is not None:
+                    deltas[(key[1], key[0], key[3], previous[-1])] -= 1
+        record_deltas(deltas, using=using)
+
+    @staticmethod
+    def _get_existing(pending):
+        """Return the pk and `COMPARED_FIELDS` values of the existing results of `pending`, by key."""
+        existing = DataCompliance.objects.filter(
+            compliance_class_name__in={key[0] for key in pending},
+            content_type__in={key[1] for key in pending},
+            object_id__in={key[2] for key in pending},
+        ).values_list("pk", *UNIQUE_FIELDS, *COMPARED_FIELDS)
+        return {
+            tuple(values[: len(UNIQUE_FIELDS)]): (pk, *values[len(UNIQUE_FIELDS) :])
+            for pk, *values in existing
+            if tuple(values[: len(UNIQUE_FIELDS)]) in pending
+        }
+
+    def _skip_unchanged(self, pending, existing):
+        """Bump the validation date of the unchanged results in `pending` and return the remaining ones."""
+        unchanged_pks = []
+        for key, (pk, *values) in existing.items():
+            result = pending[key]
+            if tuple(values) == tuple(getattr(result, field) for field in COMPARED_FIELDS):
+                unchanged_pks.append(pk)
+                del pending[key]
+        if unchanged_pks:
+            DataCompliance.objects.filter(pk__in=unchanged_pks).update(last_validation_date=timezone.now())
+            self.unchanged += len(unchanged_pks)
+        return pending
@@ -0,0 +1,319 @@
+"""
+Per-process cache of the built-in validation rules.
+
+Every save of a model with custom validators runs `BaseValidator.clean`, which needs the regex, min/max, required
+and unique rules that target that model. Rather than querying the four rule tables on every save, all rules are
+loaded together once and kept in memory, grouped by content type.
+
+The cache is invalidated locally by the signal handlers in `signals.py` whenever a rule is created, updated or
+deleted. Other processes (web workers, Celery workers) notice the change through a generation counter stored in the
+Django cache, which is bumped once the transaction that changed the rule has been committed.
+
+Values derived from the rules, such as the set of models that have any rules at all, are cached the same way.
+
+Regular expression rules are compiled when they are loaded. Rules with `context_processing` enabled render to a
+different pattern for each object, so each of them gets a bounded LRU of compiled patterns keyed by the rendered
+string instead, which outlives reloads of the cache as long as the rule itself is unchanged. Their Jinja2 template is
+compiled once per rule pk and `last_updated`, and statically analyzed for the `object` attributes it reads.
+
+Checking that the cache is still current costs a round trip to the Django cache on every lookup. Within a
+`validation_scope()`, such as a web request or a job, it is only checked by the first lookup, so that validating many
+objects, e.g. in a bulk edit or import, costs about as much as the checks themselves. Rule changes made within the
+scope are still seen right away, while those made by other processes are only seen by the next scope.
+"""
+
+import contextvars
+import re
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.template import engines
+from jinja2 import TemplateSyntaxError
+
+from nautobot_data_validation_engine.models import (
+    MinMaxValidationRule,
+    RegularExpressionValidationRule,
+    RequiredValidationRule,
+    UniqueValidationRule,
+    get_template_object_attributes,
+)
+from nautobot_data_validation_engine.utils import is_on_commit_pending
+
+GENERATION_CACHE_KEY = "nautobot_data_validation_engine.rule_cache.generation"
+
+# The current validation scope, if any, holding the cached values it uses once they were first looked up.
+_scope = contextvars.ContextVar("nautobot_data_validation_engine_validation_scope", default=None)
+
+
+@contextmanager
+def validation_scope():
+    """Use the same cached rules for the duration of the block, e.g. a request, a job or a bulk operation.
+
+    Nested scopes share the values of the outermost one.
+    """
+    if _scope.get() is not None:
+        yield
+        return
+    token = _scope.set(SimpleNamespace(entries=None))
+    try:
+        yield
+    finally:
+        _scope.reset(token)
+
+
+class CompiledPatternCache:
+    """Bounded LRU cache mapping regular expression strings to their compiled pattern objects."""
+
+    def __init__(self, maxsize):
+        """Initialize an empty CompiledPatternCache holding at most `maxsize` patterns."""
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._patterns = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        """Return the number of patterns currently cached."""
+        return len(self._patterns)
+
+    def compile(self, regular_expression):
+        """Return the compiled pattern for `regular_expression`, compiling it on a miss. Raises `re.error` if invalid."""
+        with self._lock:
+            pattern = self._patterns.get(regular_expression)
+            if pattern is not None:
+                self._patterns.move_to_end(regular_expression)
+                self.hits += 1
+                return pattern
+            self.misses += 1
+
+        pattern = re.compile(regular_expression)
+        with self._lock:
+            self._patterns[regular_expression] = pattern
+            while len(self._patterns) > self.maxsize:
+                self._patterns.popitem(last=False)
+        return pattern
+
+
+class CompiledRuleSet:
+    """All built-in validation rules, grouped by rule type, that target a single model."""
+
+    __slots__ = ("regex_rules", "min_max_rules", "required_rules", "unique_rules")
+
+    def __init__(self, regex_rules=(), min_max_rules=(), required_rules=(), unique_rules=()):
+        """Initialize a CompiledRuleSet from iterables of rule instances."""
+        self.regex_rules = tuple(regex_rules)
+        self.min_max_rules = tuple(min_max_rules)
+        self.required_rules = tuple(required_rules)
+        self.unique_rules = tuple(unique_rules)
+
+    def __bool__(self):
+        """A rule set is truthy when it contains at least one rule."""
+        return bool(self.regex_rules or self.min_max_rules or self.required_rules or self.unique_rules)
+
+    def enabled(self):
+        """Return a new CompiledRuleSet containing only the enabled rules of this one."""
+        return CompiledRuleSet(
+            regex_rules=[rule for rule in self.regex_rules if rule.enabled],
+            min_max_rules=[rule for rule in self.min_max_rules if rule.enabled],
+            required_rules=[rule for rule in self.required_rules if rule.enabled],
+            unique_rules=[rule for rule in self.unique_rules if rule.enabled],
+        )
+
+
+EMPTY_RULESET = CompiledRuleSet()
+
+
+class RuleCache:
+    """Lazily loaded mapping of content type strings (`<app_label>.<model>`) to their CompiledRuleSets.
+
+    Values derived from the rules (or from anything else whose changes invalidate the cache) can be stored alongside
+    them with `get()`, so that they are dropped and recomputed together with the rules.
+    """
+
+    def __init__(self):
+        """Initialize an empty RuleCache."""
+        self._entries = None
+        self._generation = None
+        # Tracks, per thread (and therefore per database connection), the on_commit callback of a rule changed inside
+        # a transaction that has not finished yet. Until it does, the cache can neither be trusted nor refilled,
+        # since the change may still be rolled back.
+        self._local = threading.local()
+        # Rendered-pattern LRUs of the context processed regex rules, keyed by (rule pk, regular_expression).
+        self._pattern_caches = {}
+        # Compiled templates and the `object` attributes they read, keyed by (rule pk, last_updated).
+        self._templates = {}
+
+    def get(self, key, loader):
+        """Return the value cached under `key`, calling `loader()` to compute it if it is missing or stale."""
+        entries = self._get_entries()
+        if entries is None:
+            return loader()
+        if key not in entries:
+            entries[key] = loader()
+        return entries[key]
+
+    def get_for_model(self, content_type, exclude_disabled_rules=True):
+        """Given a content type string (<app_label>.<model>), return the CompiledRuleSet for that model."""
+        rulesets = self.get("rulesets", self._load_rulesets)
+        all_rules, enabled_rules = rulesets.get(content_type, (EMPTY_RULESET, EMPTY_RULESET))
+        return enabled_rules if exclude_disabled_rules else all_rules
+
+    def models_with_rules(self, exclude_disabled_rules=True):
+        """Return the set of content type strings that have at least one (enabled) built-in rule."""
+        rulesets = self.get("rulesets", self._load_rulesets)
+        return frozenset(
+            content_type
+            for content_type, (all_rules, enabled_rules) in rulesets.items()
+            if (enabled_rules if exclude_disabled_rules else all_rules)
+        )
+
+    def invalidate(self):
+        """Drop everything cached by this process and, once committed, signal other processes to do the same."""
+        self._entries = None
+        self._clear_scope()
+        if not connection.in_atomic_block:
+            self._bump_generation()
+            return
+        pending = getattr(self._local, "pending", None)
+        if pending is not None and is_on_commit_pending(pending):
+            return
+
+        def bump_generation():
+            # Once committed, the cache can be filled again by this thread.
+            if getattr(self._local, "pending", None) is bump_generation:
+                self._local.pending = None
+            self._bump_generation()
+
+        self._local.pending = bump_generation
+        transaction.on_commit(bump_generation)
+
+    def clear(self):
+        """Reset this process's cache entirely, including any pending transaction state."""
+        self._entries = None
+        self._generation = None
+        self._local.pending = None
+        self._clear_scope()
+
+    @staticmethod
+    def _clear_scope():
+        """Have the current validation scope, if any, look the cached values up again."""
+        scope = _scope.get()
+        if scope is not None:
+            scope.entries = None
+
+    def _get_entries(self):
+        """Return the dict of cached values, or None if the cache must be bypassed."""
+        scope = _scope.get()
+        if scope is not None and scope.entries is not None:
+            return scope.entries
+        entries = self._get_current_entries()
+        if scope is not None:
+            scope.entries = entries
+        return entries
+
+    def _get_current_entries(self):
+        """Return the dict of cached values of the current generation, or None if the cache must be bypassed."""
+        pending = getattr(self._local, "pending", None)
+        if pending is not None:
+            if is_on_commit_pending(pending):
+                return None
+            # The transaction, or savepoint, that changed a rule was rolled back.
+            self._local.pending = None
+            self._entries = None
+
+        generation = cache.get(GENERATION_CACHE_KEY)
+        entries = self._entries
+        if entries is None or generation != self._generation:
+            entries = {}
+            self._entries, self._generation = entries, generation
+        return entries
+
+    @staticmethod
+    def _bump_generation():
+        try:
+            cache.incr(GENERATION_CACHE_KEY)
+        except ValueError:
+            cache.set(GENERATION_CACHE_KEY, 1, timeout=None)
+
+    def get_pattern_cache(self, rule):
+        """Return the CompiledPatternCache for the given context processed RegularExpressionValidationRule."""
+        key = (rule.pk, rule.regular_expression)
+        pattern_cache = self._pattern_caches.get(key)
+        if pattern_cache is None:
+            maxsize = settings.PLUGINS_CONFIG["nautobot_data_validation_engine"]["regex_pattern_cache_size"]
+            pattern_cache = self._pattern_caches.setdefault(key, CompiledPatternCache(maxsize))
+        return pattern_cache
+
+    def get_template(self, rule):
+        """Return the compiled template and the `object` attributes read by a context processed regex rule.
+
+        Raises `jinja2.TemplateSyntaxError` if the rule's template is invalid.
+        """
+        key = (rule.pk, rule.last_updated)
+        template = self._templates.get(key)
+        if template is None:
+            template = (
+                engines["jinja"].from_string(rule.regular_expression),
+                tuple(get_template_object_attributes(rule.regular_expression)),
+            )
+            self._templates[key] = template
+        return template
+
+    def _prepare_regex_rules(self, rules):
+        """Attach compiled patterns or templates to the given regex rules and prune those no longer used."""
+        pattern_cache_keys, template_keys = set(), set()
+        for rule in rules:
+            rule.compiled_pattern = None
+            rule.pattern_cache = None
+            rule.template = None
+            rule.context_object_attributes = ()
+            if rule.context_processing:
+                rule.pattern_cache = self.get_pattern_cache(rule)
+                pattern_cache_keys.add((rule.pk, rule.regular_expression))
+                try:
+                    rule.template, rule.context_object_attributes = self.get_template(rule)
+                    template_keys.add((rule.pk, rule.last_updated))
+                except TemplateSyntaxError:
+                    # Left uncompiled, so that the error surfaces when the rule is evaluated.
+                    pass
+            else:
+                try:
+                    rule.compiled_pattern = re.compile(rule.regular_expression)
+                except re.error:
+                    # Left uncompiled, so that the error surfaces when the rule is evaluated.
+                    pass
+        for key in set(self._pattern_caches) - pattern_cache_keys:
+            self._pattern_caches.pop(key, None)
+        for key in set(self._templates) - template_keys:
+            self._templates.pop(key, None)
+
+    def _load_rulesets(self):
+        """Load every rule of every type from the database, using a single query per rule type."""
+        grouped = {}
+        for attribute, rule_model in (
+            ("regex_rules", RegularExpressionValidationRule),
+            ("min_max_rules", MinMaxValidationRule),
+            ("required_rules", RequiredValidationRule),
+            ("unique_rules", UniqueValidationRule),
+        ):
+            for rule in rule_model.objects.select_related("content_type"):
+                content_type = f"{rule.content_type.app_label}.{rule.content_type.model}"
+                grouped.setdefault(content_type, {}).setdefault(attribute, []).append(rule)
+
+        self._prepare_regex_rules(
+            [rule for rules in grouped.values() for rule in rules.get("regex_rules", [])],
+        )
+
+        rulesets = {}
+        for content_type, rules in grouped.items():
+            ruleset = CompiledRuleSet(**rules)
+            rulesets[content_type] = (ruleset, ruleset.enabled())
+        return rulesets
+
+
+rule_cache = RuleCache()
@@ -0,0 +1,67 @@
+"""Signal handlers for nautobot_data_validation_engine."""
+
+from collections import Counter
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from nautobot.extras.models import GitRepository
+
+from nautobot_data_validation_engine.models import (
+    DataCompliance,
+    MinMaxValidationRule,
+    RegularExpressionValidationRule,
+    RequiredValidationRule,
+    UniqueValidationRule,
+)
+from nautobot_data_validation_engine.outbox import (
+    defer_compliance_evaluation,
+    get_async_compliance_classes,
+    is_async_compliance_enabled,
+)
+from nautobot_data_validation_engine.rule_cache import rule_cache
+from nautobot_data_validation_engine.summary import get_summary_key, record_deltas
+
+
+@receiver(post_save, sender=RegularExpressionValidationRule)
+@receiver(post_delete, sender=RegularExpressionValidationRule)
+@receiver(post_save, sender=MinMaxValidationRule)
+@receiver(post_delete, sender=MinMaxValidationRule)
+@receiver(post_save, sender=RequiredValidationRule)
+@receiver(post_delete, sender=RequiredValidationRule)
+@receiver(post_save, sender=UniqueValidationRule)
+@receiver(post_delete, sender=UniqueValidationRule)
+@receiver(post_save, sender=GitRepository)
+@receiver(post_delete, sender=GitRepository)
+def invalidate_rule_cache(sender, **kwargs):  # pylint: disable=unused-argument
+    """Invalidate the cached validation rules whenever a rule or a Git repository is created, updated or deleted."""
+    rule_cache.invalidate()
+
+
+@receiver(post_save)
+def defer_async_compliance_evaluation(sender, instance, raw=False, using=None, **kwargs):  # pylint: disable=unused-argument
+    """Queue a saved object for auditing by its non-enforcing DataComplianceRule classes, when they run asynchronously."""
+    if raw or not is_async_compliance_enabled() or not get_async_compliance_classes(sender._meta.label_lower):
+        return
+    defer_compliance_evaluation(instance, using)
+
+
+@receiver(post_save, sender=DataCompliance)
+def count_saved_data_compliance(sender, instance, created, using=None, **kwargs):  # pylint: disable=unused-argument
+    """Update the DataComplianceSummary counts with a DataCompliance result saved on its own.
+
+    A result updated in place moves from the count it was loaded with, e.g. by `update_or_create()`, to its current one.
+    """
+    previous = instance.__dict__.get("_loaded_summary_key")
+    current = get_summary_key(instance)
+    if created or previous is not None:
+        deltas = Counter({current: 1})
+        if not created:
+            deltas[previous] -= 1
+        record_deltas(deltas, using=using)
+    instance._loaded_summary_key = current  # pylint: disable=protected-access
+
+
+@receiver(post_delete, sender=DataCompliance)
+def count_deleted_data_compliance(sender, instance, using=None, **kwargs):  # pylint: disable=unused-argument
+    """Update the DataComplianceSummary counts with a deleted DataCompliance result, including by a queryset delete."""
+    record_deltas({get_summary_key(instance): -1}, using=using)
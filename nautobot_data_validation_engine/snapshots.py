@@ -0,0 +1,86 @@
+"""
+Daily snapshots of the Data Compliance counts, for trend reporting.
+
+DataCompliance only holds the latest result of each audit. `record_snapshot()` copies the DataComplianceSummary
+counts, summed up per content type and compliance class, into a single DataComplianceSnapshot row each for the day,
+instead of copying the results themselves; recording the snapshot of a day again replaces it. It is run by the "Record
+Data Compliance Snapshot" job, meant to be scheduled daily, and at the end of every "Run Registered Data Compliance
+Rules" job. Snapshots older than the `compliance_snapshot_retention_days` setting are deleted as new ones are recorded.
+
+A trend is read from at most one row per day, content type and compliance class, however many results there are.
+"""
+
+import datetime
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from nautobot_data_validation_engine.models import DataComplianceSnapshot, DataComplianceSummary
+from nautobot_data_validation_engine.summary import filter_content_types
+
+# The fields a trend can be grouped by, besides the date.
+TREND_GROUP_BY_FIELDS = ("content_type", "compliance_class_name")
+# Largest number of days a trend covers.
+MAX_TREND_DAYS = 3660
+
+
+def record_snapshot(date=None):
+    """Record the current counts as the snapshot of `date`, by default today, and return its number of rows."""
+    date = date or timezone.localdate()
+    counts = {}
+    for content_type_id, compliance_class_name, valid, count in (
+        DataComplianceSummary.objects.order_by()
+        .values_list("content_type", "compliance_class_name", "valid")
+        .annotate(count=Sum("count"))
+    ):
+        snapshot = counts.setdefault(
+            (content_type_id, compliance_class_name),
+            DataComplianceSnapshot(
+                date=date, content_type_id=content_type_id, compliance_class_name=compliance_class_name
+            ),
+        )
+        if valid:
+            snapshot.valid += count
+        else:
+            snapshot.invalid += count
+
+    retention_days = settings.PLUGINS_CONFIG["nautobot_data_validation_engine"]["compliance_snapshot_retention_days"]
+    with transaction.atomic():
+        DataComplianceSnapshot.objects.filter(date=date).delete()
+        DataComplianceSnapshot.objects.bulk_create(counts.values())
+        if retention_days:
+            DataComplianceSnapshot.objects.filter(date__lte=date - datetime.timedelta(days=retention_days)).delete()
+    return len(counts)
+
+
+def get_trend(days=365, group_by=(), content_types=None, compliance_class_names=None):
+    """
+    Return the daily numbers of valid and invalid DataCompliance results over the last `days` days, oldest first.
+
+    Each row is a dictionary of the `date`, of the `group_by` fields, among `TREND_GROUP_BY_FIELDS`, with the content
+    type as its `<app_label>.<model>` name, and of the `valid`, `invalid` and `total` counts. Days without a snapshot
+    are left out. The results can be restricted to the given content types, as `<app_label>.<model>` names, and
+    compliance class names.
+    """
+    snapshots = DataComplianceSnapshot.objects.filter(date__gt=timezone.localdate() - datetime.timedelta(days=days))
+    if content_types:
+        snapshots = filter_content_types(snapshots, content_types)
+    if compliance_class_names:
+        snapshots = snapshots.filter(compliance_class_name__in=compliance_class_names)
+
+    rows = []
+    for date, *values, valid, invalid in (
+        snapshots.order_by("date", *group_by)
+        .values_list("date", *group_by)
+        .annotate(valid_count=Sum("valid"), invalid_count=Sum("invalid"))
+    ):
+        row = {"date": date, **dict(zip(group_by, values)), "valid": valid, "invalid": invalid}
+        if "content_type" in row:
+            content_type = ContentType.objects.get_for_id(row["content_type"])
+            row["content_type"] = f"{content_type.app_label}.{content_type.model}"
+        row["total"] = valid + invalid
+        rows.append(row)
+    return rows
@@ -0,0 +1,186 @@
+"""
+Pre-aggregated counts of the DataCompliance results.
+
+The `DataComplianceSummary` table holds the number of DataCompliance results per content type, compliance class,
+validated attribute and validity, so that dashboards read a handful of rows instead of counting the whole
+DataCompliance table. The counts are kept up to date incrementally by the write paths: `DataComplianceResultWriter`
+and `mark_existing_attributes_as_valid()` record the changes made by their bulk queries, while the results saved or
+deleted one at a time, including by a queryset `delete()`, are accounted for by signal handlers. A result updated
+on its own is moved from the count it was loaded from the database with, without querying it again; one saved without
+having been loaded, other than created, isn't counted.
+
+The changes recorded within a transaction are summed up and applied once it is committed, with one query per count
+changed, so that the summary rows aren't locked for the duration of the transaction. Changes recorded within a
+savepoint that is rolled back are discarded with it.
+
+Concurrent audits of the same object can make the counts drift; `rebuild_summary()`, also run by the "Rebuild Data
+Compliance Summary" job, counts every result again.
+"""
+
+import threading
+from collections import Counter
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import connections, router, transaction
+from django.db.models import Count, F, Q
+from django.urls import reverse
+from django.utils.http import urlencode
+
+from nautobot_data_validation_engine.models import DataCompliance, DataComplianceSummary
+from nautobot_data_validation_engine.utils import is_on_commit_pending
+
+SUMMARY_KEY_FIELDS = ("content_type", "compliance_class_name", "validated_attribute", "valid")
+# The fields the counts can be grouped by, besides the validity.
+GROUP_BY_FIELDS = ("content_type", "compliance_class_name", "validated_attribute")
+# The number of rows returned by get_top_failing() by default.
+TOP_FAILING_LIMIT = 25
+
+# The count changes recorded within the transaction currently open on each database connection of this thread.
+_local = threading.local()
+
+
+def get_summary_key(result):
+    """Return the key of the count that the DataCompliance `result` belongs to."""
+    return (result.content_type_id, result.compliance_class_name, result.validated_attribute, result.valid)
+
+
+class _TransactionDeltas:
+    """The count changes recorded within a transaction, or one of its savepoints, applied once it is committed."""
+
+    def __init__(self, using, savepoint_ids):
+        """Initialize empty changes recorded within the given savepoints of the transaction open on `using`."""
+        self.using = using
+        self.savepoint_ids = savepoint_ids
+        self.deltas = Counter()
+
+    def __call__(self):
+        """Apply the changes, as an on_commit callback."""
+        if _local.pending.get(self.using) is self:
+            del _local.pending[self.using]
+        apply_deltas(self.deltas, using=self.using)
+
+
+def record_deltas(deltas, using=None):
+    """
+    Record changes of the counts, a mapping of `get_summary_key()` keys to the number of results added or removed.
+
+    The changes are applied once the current transaction on the `using` database is committed, right away outside of
+    a transaction.
+    """
+    using = using or router.db_for_write(DataCompliance)
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    connection = connections[using]
+    if not connection.in_atomic_block:
+        apply_deltas(deltas, using=using)
+        return
+    if not hasattr(_local, "pending"):
+        _local.pending = {}
+    transaction_deltas = _local.pending.get(using)
+    savepoint_ids = list(connection.savepoint_ids)
+    # A rolled back transaction or savepoint drops the on_commit callbacks registered within it.
+    if (
+        transaction_deltas is None
+        or transaction_deltas.savepoint_ids != savepoint_ids
+        or not is_on_commit_pending(transaction_deltas, using=using)
+    ):
+        transaction_deltas = _local.pending[using] = _TransactionDeltas(using, savepoint_ids)
+        transaction.on_commit(transaction_deltas, using=using)
+    transaction_deltas.deltas.update(deltas)
+
+
+def apply_deltas(deltas, using=None):
+    """Apply changes of the counts, a mapping of `get_summary_key()` keys to the number of results added or removed."""
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    summaries = DataComplianceSummary.objects.using(using)
+    with transaction.atomic(using=using):
+        summaries.bulk_create(
+            [
+                DataComplianceSummary(
+                    content_type_id=content_type_id,
+                    compliance_class_name=compliance_class_name,
+                    validated_attribute=validated_attribute,
+                    valid=valid,
+                )
+                for content_type_id, compliance_class_name, validated_attribute, valid in deltas
+            ],
+            ignore_conflicts=True,
+        )
+        # Always updated in the same order, so that concurrent transactions don't deadlock.
+        for key in sorted(deltas):
+            summaries.filter(**dict(zip(SUMMARY_KEY_FIELDS, key))).update(count=F("count") + deltas[key])
+        summaries.filter(count__lte=0).delete()
+
+
+def rebuild_summary(using=None):
+    """Count every DataCompliance result again, replacing the summary. Return the number of summary rows."""
+    counts = DataCompliance.objects.using(using).order_by().values_list(*SUMMARY_KEY_FIELDS).annotate(count=Count("pk"))
+    with transaction.atomic(using=using):
+        DataComplianceSummary.objects.using(using).all().delete()
+        summaries = DataComplianceSummary.objects.using(using).bulk_create(
+            [
+                DataComplianceSummary(
+                    content_type_id=content_type_id,
+                    compliance_class_name=compliance_class_name,
+                    validated_attribute=validated_attribute,
+                    valid=valid,
+                    count=count,
+                )
+                for content_type_id, compliance_class_name, validated_attribute, valid, count in counts
+            ]
+        )
+    return len(summaries)
+
+
+def filter_content_types(queryset, content_types):
+    """Filter `queryset` on the given content types, as `<app_label>.<model>` names."""
+    content_type_filter = Q(pk__in=[])
+    for name in content_types:
+        app_label, _, model = name.lower().partition(".")
+        content_type_filter |= Q(app_label=app_label, model=model)
+    return queryset.filter(content_type__in=ContentType.objects.filter(content_type_filter))
+
+
+def get_summary(group_by=GROUP_BY_FIELDS, content_types=None, compliance_class_names=None):
+    """
+    Return the numbers of valid and invalid DataCompliance results, grouped by the given `GROUP_BY_FIELDS`.
+
+    Each row is a dictionary of the `group_by` fields, with the content type as its `<app_label>.<model>` name, and of
+    the `valid`, `invalid` and `total` counts. Rows are sorted by decreasing number of invalid results. The results can
+    be restricted to the given content types, as `<app_label>.<model>` names, and compliance class names.
+    """
+    summaries = DataComplianceSummary.objects.all()
+    if content_types:
+        summaries = filter_content_types(summaries, content_types)
+    if compliance_class_names:
+        summaries = summaries.filter(compliance_class_name__in=compliance_class_names)
+
+    rows = {}
+    for *values, valid, count in summaries.values_list(*group_by, "valid", "count"):
+        row = rows.setdefault(tuple(values), {**dict(zip(group_by, values)), "valid": 0, "invalid": 0})
+        row["valid" if valid else "invalid"] += count
+    rows = list(rows.values())
+    for row in rows:
+        if "content_type" in row:
+            content_type = ContentType.objects.get_for_id(row["content_type"])
+            row["content_type"] = f"{content_type.app_label}.{content_type.model}"
+        row["total"] = row["valid"] + row["invalid"]
+    rows.sort(key=lambda row: row["invalid"], reverse=True)
+    return rows
+
+
+def get_top_failing(limit=TOP_FAILING_LIMIT):
+    """
+    Return the `limit` compliance classes and validated attributes with the most invalid results, as `get_summary()`.
+
+    Each row also has the `compliance` percentage of valid results and the `url` of the list of its invalid results.
+    """
+    rows = [row for row in get_summary() if row["invalid"]][:limit]
+    for row in rows:
+        row["compliance"] = 100 * row["valid"] / row["total"]
+        query = urlencode({**{field: row[field] for field in GROUP_BY_FIELDS}, "valid": False})
+        row["url"] = f"{reverse('plugins:nautobot_data_validation_engine:datacompliance_list')}?{query}"
+    return rows
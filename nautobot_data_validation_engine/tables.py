@@ -250,3 +250,41 @@ class DataComplianceTableTab(BaseTable):  # pylint: disable=nb-sub-class-name
             "valid",
             "message",
         ]
+
+
+class SlowestRulesTable(tables.Table):
+    """Table of the validation rules and Data Compliance classes that took the most time to evaluate."""
+
+    rule_type = tables.Column(verbose_name="Type")
+    rule = tables.Column()
+    model = tables.Column()
+    evaluations = tables.Column()
+    failures = tables.Column()
+    total_ms = tables.TemplateColumn("{{ value|floatformat:1 }}", verbose_name="Total (ms)")
+    mean_ms = tables.TemplateColumn("{{ value|floatformat:3 }}", verbose_name="Mean (ms)")
+    max_ms = tables.TemplateColumn("{{ value|floatformat:3 }}", verbose_name="Max (ms)")
+    queries = tables.Column()
+
+    class Meta:
+        """Meta class for SlowestRulesTable."""
+
+        attrs = {"class": "table table-hover table-headings"}
+        orderable = False
+
+
+class TopFailingRulesTable(tables.Table):
+    """Table of the Data Compliance classes and validated attributes with the most invalid results."""
+
+    content_type = tables.Column(verbose_name="Content Type")
+    compliance_class_name = tables.Column(verbose_name="Compliance Class")
+    validated_attribute = tables.Column(verbose_name="Attribute")
+    invalid = tables.TemplateColumn('<a href="{{ record.url }}">{{ value }}</a>')
+    valid = tables.Column()
+    total = tables.Column()
+    compliance = tables.TemplateColumn("{{ value|floatformat:1 }}%")
+
+    class Meta:
+        """Meta class for TopFailingRulesTable."""
+
+        attrs = {"class": "table table-hover table-headings"}
+        orderable = False
@@ -0,0 +1,116 @@
+"""Celery tasks running a single chunk of a parallel Data Compliance job, or summing up its run."""
+
+from django.apps import apps as global_apps
+from django.utils.dateparse import parse_datetime
+from nautobot.core.celery import nautobot_task
+from nautobot.extras.choices import LogLevelChoices
+from nautobot.extras.jobs import get_task_logger
+from nautobot.extras.models import JobResult
+
+from nautobot_data_validation_engine.audit import (
+    audit_queryset_with_builtin_rules,
+    audit_with_compliance_class,
+    get_builtin_rule_validators,
+    get_unique_evaluator,
+)
+from nautobot_data_validation_engine.custom_validators import get_data_compliance_rule_by_name
+from nautobot_data_validation_engine.incremental import (
+    filter_changed_objects,
+    filter_changed_objects_for_builtin_rules,
+    record_run,
+)
+from nautobot_data_validation_engine.instrumentation import rule_statistics
+from nautobot_data_validation_engine.results import DataComplianceResultWriter
+from nautobot_data_validation_engine.rule_cache import validation_scope
+from nautobot_data_validation_engine.snapshots import record_snapshot
+
+logger = get_task_logger(__name__)
+
+# The BulkUniquenessEvaluator of the most recent (job result, model) pair seen by this worker process, so that each
+# worker evaluates the unique rules of a model once per job run rather than once per chunk.
+_unique_evaluator = {}
+
+
+def _get_unique_evaluator(job_result_id, model_class):
+    key = (job_result_id, model_class._meta.label_lower)
+    if key not in _unique_evaluator:
+        _unique_evaluator.clear()
+        _unique_evaluator[key] = get_unique_evaluator(model_class)
+    return _unique_evaluator[key]
+
+
+@nautobot_task
+def run_data_compliance_rule_chunk(compliance_class_name, first_pk, last_pk, changed_since=None):
+    """Run the named DataComplianceRule class against the objects with pks from `first_pk` to `last_pk` included.
+
+    If `changed_since` is given, only the objects changed since then are audited.
+    """
+    compliance_class = get_data_compliance_rule_by_name(compliance_class_name)
+    if compliance_class is None:
+        raise ValueError(f"No Data Compliance rule class named {compliance_class_name} is registered.")
+    objects = filter_changed_objects(
+        compliance_class.get_queryset().filter(pk__gte=first_pk, pk__lte=last_pk).order_by("pk"),
+        parse_datetime(changed_since) if changed_since else None,
+    )
+    with validation_scope(), DataComplianceResultWriter() as result_writer:
+        count = audit_with_compliance_class(compliance_class, objects, result_writer)
+    rule_statistics.flush()
+    return {"objects": count, "results": result_writer.written}
+
+
+@nautobot_task
+def run_builtin_rules_chunk(job_result_id, model, first_pk, last_pk, changed_since=None):
+    """Run the built-in validation rules of `model` against the objects with pks from `first_pk` to `last_pk`.
+
+    If `changed_since` is given, only the objects that may have changed compliance since then are audited.
+    """
+    model_class = global_apps.get_model(model)
+    for validator, validated_model_class in get_builtin_rule_validators():
+        if validated_model_class is model_class:
+            break
+    else:
+        logger.info("No built-in validation rules target %s anymore.", model)
+        return {"objects": 0, "results": 0}
+
+    unique_evaluator = _get_unique_evaluator(job_result_id, model_class)
+    objects = filter_changed_objects_for_builtin_rules(
+        model_class.objects.filter(pk__gte=first_pk, pk__lte=last_pk).order_by("pk"),
+        validator,
+        parse_datetime(changed_since) if changed_since else None,
+        unique_evaluator=unique_evaluator,
+    )
+    with validation_scope(), DataComplianceResultWriter() as result_writer:
+        count = audit_queryset_with_builtin_rules(validator, objects, result_writer, unique_evaluator=unique_evaluator)
+    rule_statistics.flush()
+    return {"objects": count, "results": result_writer.written}
+
+
+@nautobot_task
+def finish_parallel_run(results, job_result_id, labels, fingerprints, started):
+    """Sum up the `results` of the chunks of a parallel RunRegisteredDataComplianceRules run, as its chord callback.
+
+    `labels` holds the name of the compliance class or validator of each chunk, in the order of `results`, and
+    `fingerprints` the fingerprint of each of them. The run is recorded as started at `started`, for the next
+    incremental run. The callback isn't called if any chunk failed, so that the failed chunks are audited again.
+    """
+    job_result = JobResult.objects.get(pk=job_result_id)
+    totals = {name: {"chunks": 0, "objects": 0, "results": 0} for name in fingerprints}
+    for label, result in zip(labels, results):
+        totals[label]["chunks"] += 1
+        totals[label]["objects"] += result["objects"]
+        totals[label]["results"] += result["results"]
+
+    started = parse_datetime(started)
+    for label, total in totals.items():
+        message = f"{label} audited {total['objects']} objects in {total['chunks']} chunks and wrote {total['results']} results"
+        logger.info(message)
+        job_result.log(message, level_choice=LogLevelChoices.LOG_INFO)
+        record_run(label, fingerprints[label], started)
+
+    rule_statistics.flush()
+    record_snapshot()
+    job_result.log(
+        "View Data Compliance results [here](/plugins/nautobot-data-validation-engine/data-compliance/)",
+        level_choice=LogLevelChoices.LOG_INFO,
+    )
+    return totals
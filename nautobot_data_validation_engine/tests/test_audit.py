@@ -0,0 +1,356 @@
+"""
+Bulk audit evaluation test cases
+"""
+
+from unittest.mock import patch
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from nautobot.core.celery import app
+from nautobot.dcim.models import Location, LocationType
+from nautobot.extras.models import JobResult, Status
+
+from nautobot_data_validation_engine.audit import (
+    BulkUniquenessEvaluator,
+    audit_with_builtin_rules,
+    bulk_audit_with_builtin_rules,
+    get_bulk_audit_fields,
+    get_pk_ranges,
+    get_unique_evaluator,
+    iterate_in_chunks,
+    iterate_orphaned_object_ids,
+    select_template_relations,
+)
+from nautobot_data_validation_engine.custom_validators import BaseValidator
+from nautobot_data_validation_engine.jobs import DeleteOrphanedDataComplianceData, RunRegisteredDataComplianceRules
+from nautobot_data_validation_engine.models import (
+    DataCompliance,
+    MinMaxValidationRule,
+    RegularExpressionValidationRule,
+    RequiredValidationRule,
+    UniqueValidationRule,
+)
+from nautobot_data_validation_engine.results import DataComplianceResultWriter
+from nautobot_data_validation_engine.rule_cache import rule_cache
+from nautobot_data_validation_engine.tests.test_data_compliance_rules import TestFailedDataComplianceRule
+
+
+class BulkUniquenessEvaluatorTestCase(TestCase):
+    """
+    Test cases related to the BulkUniquenessEvaluator
+    """
+
+    def setUp(self) -> None:
+        location_type = LocationType.objects.create(name="Region")
+        status = Status.objects.get_by_natural_key("Active")
+        self.locations = [
+            Location.objects.create(name=f"Location {i}", location_type=location_type, status=status, description=desc)
+            for i, desc in enumerate(["same", "same", "same", "other", "", ""])
+        ]
+        self.rule = UniqueValidationRule.objects.create(
+            name="Unique rule 1",
+            content_type=ContentType.objects.get_for_model(Location),
+            field="description",
+            max_instances=2,
+        )
+        return super().setUp()
+
+    def test_only_objects_holding_duplicate_values_are_violating(self):
+        with self.assertNumQueries(2):
+            evaluator = BulkUniquenessEvaluator(Location, [self.rule])
+        self.assertIn(self.rule, evaluator)
+        self.assertEqual(evaluator.violating_pks, {location.pk for location in self.locations[:3]})
+        self.assertTrue(evaluator.is_violated(self.rule, self.locations[0]))
+        self.assertFalse(evaluator.is_violated(self.rule, self.locations[3]))
+
+    def test_empty_values_are_ignored(self):
+        self.rule.max_instances = 1
+        evaluator = BulkUniquenessEvaluator(Location, [self.rule])
+        self.assertFalse(evaluator.is_violated(self.rule, self.locations[4]))
+
+    def test_no_duplicates_runs_a_single_query(self):
+        self.rule.max_instances = 3
+        with self.assertNumQueries(1):
+            evaluator = BulkUniquenessEvaluator(Location, [self.rule])
+        self.assertEqual(evaluator.violating_pks, set())
+
+    def test_report_for_validation_rules(self):
+        RunRegisteredDataComplianceRules.report_for_validation_rules()
+        results = DataCompliance.objects.filter(compliance_class_name="DcimLocationCustomValidator")
+        self.assertEqual(
+            set(results.values_list("object_id", flat=True)), {str(location.pk) for location in self.locations[:3]}
+        )
+        self.assertFalse(results.filter(valid=True).exists())
+
+
+class IterateInChunksTestCase(TestCase):
+    """
+    Test cases related to iterate_in_chunks
+    """
+
+    def setUp(self) -> None:
+        location_type = LocationType.objects.create(name="Region")
+        status = Status.objects.get_by_natural_key("Active")
+        self.locations = [
+            Location.objects.create(name=f"Location {i}", location_type=location_type, status=status) for i in range(5)
+        ]
+        return super().setUp()
+
+    def test_every_object_is_yielded_once_in_pk_order(self):
+        with self.assertNumQueries(3):
+            pks = [location.pk for location in iterate_in_chunks(Location.objects.all(), chunk_size=2)]
+        self.assertEqual(pks, sorted(location.pk for location in self.locations))
+
+    def test_exact_multiple_of_chunk_size(self):
+        with self.assertNumQueries(2):
+            self.assertEqual(len(list(iterate_in_chunks(Location.objects.all(), chunk_size=5))), 5)
+
+    def test_related_object_hints_are_applied_per_chunk(self):
+        queryset = Location.objects.select_related("location_type")
+        with self.assertNumQueries(3):
+            for location in iterate_in_chunks(queryset, chunk_size=2):
+                self.assertEqual(location.location_type.name, "Region")
+
+    def test_pk_ranges(self):
+        pks = sorted(location.pk for location in self.locations)
+        self.assertEqual(
+            get_pk_ranges(Location.objects.all(), chunk_size=2), [(pks[0], pks[1]), (pks[2], pks[3]), (pks[4], pks[4])]
+        )
+        self.assertEqual(get_pk_ranges(Location.objects.none(), chunk_size=2), [])
+
+
+class BulkAuditTestCase(TestCase):
+    """
+    Test cases related to the column by column evaluation of the built-in rules
+    """
+
+    def setUp(self) -> None:
+        self.locations = self.create_locations()
+        content_type = ContentType.objects.get_for_model(Location)
+        RegularExpressionValidationRule.objects.create(
+            name="Regex rule 1", content_type=content_type, field="name", regular_expression="^Location"
+        )
+        MinMaxValidationRule.objects.create(
+            name="Min/max rule 1", content_type=content_type, field="asn", min=64512, max=65534, enabled=False
+        )
+        RequiredValidationRule.objects.create(name="Required rule 1", content_type=content_type, field="description")
+        UniqueValidationRule.objects.create(name="Unique rule 1", content_type=content_type, field="description")
+        rule_cache.clear()
+        self.addCleanup(rule_cache.clear)
+        self.validator = type("DcimLocationCustomValidator", (BaseValidator,), {"model": "dcim.location"})
+        # A stale result, to be deleted as its object no longer fails the rule
+        DataCompliance.objects.create(
+            compliance_class_name="DcimLocationCustomValidator",
+            content_type=content_type,
+            object_id=str(self.locations[5].pk),
+            validated_attribute="name",
+            valid=False,
+        )
+        return super().setUp()
+
+    @staticmethod
+    def create_locations(suffix=""):
+        """Create a location passing every rule, and one failing each of them."""
+        location_type, _ = LocationType.objects.get_or_create(name="Region")
+        status = Status.objects.get_by_natural_key("Active")
+        return [
+            Location.objects.create(
+                name=f"{name}{suffix}", location_type=location_type, status=status, description=description, asn=asn
+            )
+            for name, description, asn in [
+                ("Location 1", f"same{suffix}", 65000),
+                ("Location 2", f"same{suffix}", None),
+                ("Location 3", "", 65000),
+                ("Invalid 4", "other", 65000),
+                ("Location 5", f"unique{suffix}", 70000),
+                ("Location 6", f"valid{suffix}", 65000),
+            ]
+        ]
+
+    def audit(self):
+        """Audit every location column by column, returning the number of locations audited."""
+        with DataComplianceResultWriter() as result_writer:
+            return bulk_audit_with_builtin_rules(
+                self.validator, Location.objects.all(), result_writer, unique_evaluator=get_unique_evaluator(Location)
+            )
+
+    def get_results(self):
+        """Return the results of the built-in rules, as sets of their object id, attribute, value and message."""
+        return set(
+            DataCompliance.objects.filter(compliance_class_name="DcimLocationCustomValidator").values_list(
+                "object_id", "validated_attribute", "validated_attribute_value", "validated_object_str", "message"
+            )
+        )
+
+    def test_fields(self):
+        self.assertEqual(
+            get_bulk_audit_fields(self.validator, Location, unique_evaluator=get_unique_evaluator(Location)),
+            ["name", "asn", "description"],
+        )
+
+    def test_same_results_as_auditing_object_by_object(self):
+        unique_evaluator = get_unique_evaluator(Location)
+        with DataComplianceResultWriter() as result_writer:
+            audit_with_builtin_rules(
+                self.validator, Location.objects.all(), result_writer, unique_evaluator=unique_evaluator
+            )
+        expected = self.get_results()
+        DataCompliance.objects.all().delete()
+        DataCompliance.objects.create(
+            compliance_class_name="DcimLocationCustomValidator",
+            content_type=ContentType.objects.get_for_model(Location),
+            object_id=str(self.locations[5].pk),
+            validated_attribute="name",
+            valid=False,
+        )
+
+        self.assertEqual(self.audit(), len(self.locations))
+        self.assertEqual(self.get_results(), expected)
+        self.assertEqual(
+            {result[:2] for result in expected},
+            {
+                (str(self.locations[0].pk), "description"),
+                (str(self.locations[1].pk), "asn"),
+                (str(self.locations[2].pk), "description"),
+                (str(self.locations[3].pk), "name"),
+                (str(self.locations[4].pk), "asn"),
+            },
+        )
+
+    def test_queries_do_not_grow_with_objects(self):
+        # Delete the stale result, which deletes its related objects as well, and warm the caches
+        self.audit()
+        with CaptureQueriesContext(connection) as queries:
+            self.audit()
+        self.create_locations(suffix=" bis")
+        with self.assertNumQueries(len(queries)):
+            self.assertEqual(self.audit(), 2 * len(self.locations))
+
+    def test_rules_requiring_instances_are_audited_object_by_object(self):
+        self.assertIsNone(get_bulk_audit_fields(self.validator, Location))
+        RegularExpressionValidationRule.objects.update(context_processing=True)
+        rule_cache.clear()
+        self.assertIsNone(
+            get_bulk_audit_fields(self.validator, Location, unique_evaluator=get_unique_evaluator(Location))
+        )
+
+    def test_related_objects_rendered_by_rules_are_fetched_with_the_objects(self):
+        RegularExpressionValidationRule.objects.update(
+            context_processing=True,
+            regular_expression="^{{ object.location_type.name }}|{{ object.tags.all()|length }}|{{ object.foo }}",
+        )
+        rule_cache.clear()
+        queryset = select_template_relations(
+            Location.objects.all(), rule_cache.get_for_model("dcim.location", exclude_disabled_rules=False).regex_rules
+        )
+        self.assertEqual(queryset.query.select_related, {"location_type": {}})
+        self.assertEqual(queryset._prefetch_related_lookups, ("tags",))  # pylint: disable=protected-access
+
+
+class ParallelComplianceJobTestCase(TestCase):
+    """
+    Test cases related to the parallel mode of RunRegisteredDataComplianceRules
+    """
+
+    def setUp(self) -> None:
+        location_type = LocationType.objects.create(name="Region")
+        status = Status.objects.get_by_natural_key("Active")
+        self.locations = [
+            Location.objects.create(name=f"Location {i}", location_type=location_type, status=status, description=desc)
+            for i, desc in enumerate(["same", "same", "other", "", ""])
+        ]
+        UniqueValidationRule.objects.create(
+            name="Unique rule 1",
+            content_type=ContentType.objects.get_for_model(Location),
+            field="description",
+        )
+        # Run the subtasks in process, as with a worker.
+        always_eager = app.conf.task_always_eager
+        app.conf.task_always_eager = True
+        self.addCleanup(setattr, app.conf, "task_always_eager", always_eager)
+        self.job = RunRegisteredDataComplianceRules()
+        self.job.job_result = JobResult.objects.create(name=self.job.name)
+        # Write the job logs within the test transaction, rather than through the separate "job_logs" connection.
+        job_logs_patcher = patch("nautobot.extras.models.jobs.JOB_LOGS", None)
+        job_logs_patcher.start()
+        self.addCleanup(job_logs_patcher.stop)
+        return super().setUp()
+
+    @patch("nautobot_data_validation_engine.tasks.get_data_compliance_rule_by_name")
+    def test_compliance_class_chunks(self, mock_get_rule):
+        mock_get_rule.return_value = TestFailedDataComplianceRule
+        self.job.run_in_parallel([TestFailedDataComplianceRule], False, chunk_size=2)
+        results = DataCompliance.objects.filter(compliance_class_name="TestFailedDataComplianceRule")
+        self.assertEqual(
+            set(results.values_list("object_id", flat=True)), {str(location.pk) for location in self.locations}
+        )
+        self.assertEqual(results.count(), 5 * len(self.locations))
+        # The callback of the chunks logs their totals to the job result.
+        self.assertTrue(
+            self.job.job_result.job_log_entries.filter(
+                message__startswith=f"TestFailedDataComplianceRule audited {len(self.locations)} objects in 3 chunks"
+            ).exists()
+        )
+
+    def test_builtin_rules_chunks(self):
+        self.job.run_in_parallel([], True, chunk_size=2)
+        results = DataCompliance.objects.filter(compliance_class_name="DcimLocationCustomValidator")
+        self.assertEqual(
+            set(results.values_list("object_id", flat=True)), {str(location.pk) for location in self.locations[:2]}
+        )
+
+    @patch("nautobot_data_validation_engine.tasks.get_data_compliance_rule_by_name")
+    def test_failed_chunks_fail_the_job(self, mock_get_rule):
+        mock_get_rule.return_value = None
+        # Run in process, the chord raises the error of the first failed chunk instead of calling its callback.
+        with self.assertRaises(ValueError):
+            self.job.run_in_parallel([TestFailedDataComplianceRule], False, chunk_size=2)
+        self.assertFalse(self.job.job_result.job_log_entries.filter(message__contains=" audited ").exists())
+
+
+class OrphanedDataComplianceTestCase(TestCase):
+    """
+    Test cases related to the cleanup of orphaned DataCompliance objects
+    """
+
+    def setUp(self) -> None:
+        location_type = LocationType.objects.create(name="Region")
+        status = Status.objects.get_by_natural_key("Active")
+        self.locations = [
+            Location.objects.create(name=f"Location {i}", location_type=location_type, status=status) for i in range(5)
+        ]
+        self.content_type = ContentType.objects.get_for_model(Location)
+        for location in self.locations:
+            for attribute in ("__all__", "name"):
+                DataCompliance.objects.create(
+                    compliance_class_name="TestCompliance",
+                    content_type=self.content_type,
+                    object_id=location.pk,
+                    validated_attribute=attribute,
+                    valid=True,
+                )
+        DataCompliance.objects.create(
+            compliance_class_name="TestCompliance",
+            content_type=self.content_type,
+            object_id="not-a-uuid",
+            validated_attribute="__all__",
+            valid=True,
+        )
+        self.orphaned_ids = {str(location.pk) for location in self.locations[1:3]} | {"not-a-uuid"}
+        Location.objects.filter(pk__in=[location.pk for location in self.locations[1:3]]).delete()
+        return super().setUp()
+
+    def test_orphaned_object_ids(self):
+        chunks = list(iterate_orphaned_object_ids(self.content_type, chunk_size=2))
+        self.assertEqual({object_id for chunk in chunks for object_id in chunk}, self.orphaned_ids)
+
+    def test_dry_run_only_counts(self):
+        DeleteOrphanedDataComplianceData().run(dryrun=True)
+        self.assertEqual(DataCompliance.objects.count(), 11)
+
+    def test_orphans_are_deleted(self):
+        DeleteOrphanedDataComplianceData().run(dryrun=False)
+        self.assertEqual(DataCompliance.objects.count(), 6)
+        self.assertFalse(DataCompliance.objects.filter(object_id__in=self.orphaned_ids).exists())
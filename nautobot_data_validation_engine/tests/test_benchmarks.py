@@ -0,0 +1,265 @@
+"""
+Benchmarks for the save-time validators and the Data Compliance jobs
+
+The benchmarks tagged with `benchmark` are too slow for the regular test runs, and are run with `invoke benchmark`.
+Their results are printed and, if the `BENCHMARK_RESULTS_FILE` environment variable is set, written to that file as
+JSON, so that runs against different releases can be compared.
+"""
+
+import json
+import os
+import platform
+import time
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test import TestCase, tag
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from nautobot.dcim.models import Location, LocationType, Manufacturer
+from nautobot.extras.models import Status
+
+from nautobot_data_validation_engine import __version__
+from nautobot_data_validation_engine.audit import audit_with_compliance_class, iterate_in_chunks
+from nautobot_data_validation_engine.custom_validators import BaseValidator, ComplianceError, DataComplianceRule
+from nautobot_data_validation_engine.jobs import RunRegisteredDataComplianceRules
+from nautobot_data_validation_engine.models import (
+    DataCompliance,
+    RegularExpressionValidationRule,
+    RequiredValidationRule,
+    UniqueValidationRule,
+)
+from nautobot_data_validation_engine.results import DataComplianceResultWriter
+from nautobot_data_validation_engine.rule_cache import rule_cache
+
+ITERATIONS = 1000
+REGEX_RULE_FIELDS = (
+    "name",
+    "description",
+    "facility",
+    "physical_address",
+    "shipping_address",
+    "contact_name",
+    "contact_phone",
+    "contact_email",
+    "comments",
+)
+RULE_COUNTS = (1, 3, len(REGEX_RULE_FIELDS))
+OBJECT_COUNTS = [int(count) for count in os.getenv("BENCHMARK_OBJECT_COUNTS", "1000").split(",")]
+RESULTS_FILE = os.getenv("BENCHMARK_RESULTS_FILE")
+
+_results = []
+
+
+def record_result(benchmark, elapsed, iterations, queries, units=1, **parameters):  # pylint: disable=too-many-arguments
+    """Record and print the result of a benchmark of `iterations` iterations processing `units` items each."""
+    result = {
+        "benchmark": benchmark,
+        "parameters": parameters,
+        "iterations": iterations,
+        "total_seconds": elapsed,
+        "mean_microseconds": elapsed / iterations * 1e6,
+        "units_per_second": units * iterations / elapsed if elapsed else None,
+        "queries": queries,
+    }
+    _results.append(result)
+    print(
+        f"\n{benchmark} {parameters}: {result['mean_microseconds']:.1f}us per iteration, {queries} queries"
+        f" over {iterations} iterations"
+    )
+
+
+def write_results():
+    """Write all the results recorded so far to the BENCHMARK_RESULTS_FILE, if set."""
+    if not RESULTS_FILE:
+        return
+    with open(RESULTS_FILE, "w", encoding="utf-8") as results_file:
+        json.dump(
+            {
+                "version": __version__,
+                "python": platform.python_version(),
+                "database": connection.vendor,
+                "date": timezone.now().isoformat(),
+                "results": _results,
+            },
+            results_file,
+            indent=2,
+        )
+
+
+class ManufacturerNameComplianceRule(DataComplianceRule):
+    """DataComplianceRule auditing the names of manufacturers."""
+
+    model = "dcim.manufacturer"
+
+    def audit(self):
+        """Fail the manufacturers whose name doesn't start with "Manufacturer"."""
+        if not self.context["object"].name.startswith("Manufacturer"):
+            raise ComplianceError({"name": "Name must start with Manufacturer."})
+
+
+class BenchmarkTestCase(TestCase):
+    """Base class of the benchmarks, recording their measurements."""
+
+    @classmethod
+    def tearDownClass(cls):
+        """Write the results recorded so far."""
+        super().tearDownClass()
+        write_results()
+
+    def measure(self, benchmark, func, iterations=1, units=1, **parameters):
+        """Call `func` `iterations` times and record the elapsed time and number of queries."""
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            for _ in range(iterations):
+                func()
+            elapsed = time.perf_counter() - start
+        record_result(benchmark, elapsed, iterations, len(queries), units=units, **parameters)
+
+    def create_manufacturers(self, count):
+        """Create manufacturers until there are `count` of them, half of them with a non-compliant description."""
+        existing = Manufacturer.objects.count()
+        Manufacturer.objects.bulk_create(
+            Manufacturer(name=f"Manufacturer {i}", description="" if i % 2 else f"Invalid {i}")
+            for i in range(existing, count)
+        )
+
+
+@tag("performance", "benchmark")
+class RuleLessModelBenchmark(BenchmarkTestCase):
+    """
+    Measure the per-save overhead of the validators on a model that no rule targets
+    """
+
+    def setUp(self) -> None:
+        RegularExpressionValidationRule.objects.create(
+            name="Regex rule 1",
+            content_type=ContentType.objects.get_for_model(LocationType),
+            field="name",
+            regular_expression="^.*$",
+        )
+        rule_cache.clear()
+        self.addCleanup(rule_cache.clear)
+        self.location = Location(
+            name="Location 1",
+            location_type=LocationType.objects.create(name="Region"),
+            status=Status.objects.get_by_natural_key("Active"),
+        )
+        self.validator = type("DcimLocationCustomValidator", (BaseValidator,), {"model": "dcim.location"})
+        return super().setUp()
+
+    def test_rule_less_model_clean_overhead(self):
+        # Warm the cache, as the first save after a rule change would.
+        self.validator(self.location).clean()
+
+        self.measure("rule_less_model_clean", lambda: self.validator(self.location).clean(), ITERATIONS)
+
+
+@tag("performance", "benchmark")
+class BaseValidatorBenchmark(BenchmarkTestCase):
+    """
+    Measure the save-time latency and query count of BaseValidator.clean as the number of rules grows
+    """
+
+    def setUp(self) -> None:
+        self.location = Location.objects.create(
+            name="Location 1",
+            location_type=LocationType.objects.create(name="Region"),
+            status=Status.objects.get_by_natural_key("Active"),
+            description="Description",
+        )
+        self.validator = type("DcimLocationCustomValidator", (BaseValidator,), {"model": "dcim.location"})
+        content_type = ContentType.objects.get_for_model(Location)
+        RequiredValidationRule.objects.create(name="Required rule", content_type=content_type, field="description")
+        UniqueValidationRule.objects.create(name="Unique rule", content_type=content_type, field="description")
+        self.addCleanup(rule_cache.clear)
+        return super().setUp()
+
+    def test_clean_latency_by_rule_count(self):
+        content_type = ContentType.objects.get_for_model(Location)
+        for rule_count in RULE_COUNTS:
+            # Regex rules are unique per field, so each one targets another field.
+            for field in REGEX_RULE_FIELDS[RegularExpressionValidationRule.objects.count() : rule_count]:
+                RegularExpressionValidationRule.objects.create(
+                    name=f"Regex rule {field}", content_type=content_type, field=field, regular_expression="^.*$"
+                )
+            rule_cache.clear()
+            # Warm the cache, as the first save after a rule change would.
+            self.validator(self.location).clean()
+            self.measure(
+                "base_validator_clean",
+                lambda: self.validator(self.location).clean(),
+                ITERATIONS,
+                regex_rules=rule_count,
+            )
+
+
+@tag("performance", "benchmark")
+class ComplianceJobBenchmark(BenchmarkTestCase):
+    """
+    Measure the throughput of the Data Compliance job as the number of audited objects grows
+    """
+
+    def setUp(self) -> None:
+        RegularExpressionValidationRule.objects.create(
+            name="Regex rule 1",
+            content_type=ContentType.objects.get_for_model(Manufacturer),
+            field="description",
+            regular_expression="^$",
+        )
+        rule_cache.clear()
+        self.addCleanup(rule_cache.clear)
+        return super().setUp()
+
+    def test_compliance_class_throughput(self):
+        for object_count in OBJECT_COUNTS:
+            self.create_manufacturers(object_count)
+
+            def run():
+                with DataComplianceResultWriter() as result_writer:
+                    audit_with_compliance_class(
+                        ManufacturerNameComplianceRule,
+                        iterate_in_chunks(ManufacturerNameComplianceRule.get_queryset()),
+                        result_writer,
+                    )
+
+            self.measure("compliance_class_run", run, units=object_count, objects=object_count)
+
+    def test_builtin_rules_throughput(self):
+        for object_count in OBJECT_COUNTS:
+            self.create_manufacturers(object_count)
+            self.measure(
+                "builtin_rules_run",
+                RunRegisteredDataComplianceRules.report_for_validation_rules,
+                units=object_count,
+                objects=object_count,
+            )
+
+
+@tag("performance", "benchmark")
+class DataComplianceWriteBenchmark(BenchmarkTestCase):
+    """
+    Measure the rate at which DataCompliance results are written
+    """
+
+    def test_write_rate(self):
+        for object_count in OBJECT_COUNTS:
+            self.create_manufacturers(object_count)
+            manufacturers = list(Manufacturer.objects.all())
+            for skip_unchanged in (False, True):
+
+                def write(skip_unchanged=skip_unchanged, manufacturers=manufacturers):
+                    with DataComplianceResultWriter(skip_unchanged=skip_unchanged) as result_writer:
+                        for manufacturer in manufacturers:
+                            result_writer.add("BenchmarkCompliance", manufacturer, "name", message="", valid=True)
+
+                self.measure(
+                    "data_compliance_write",
+                    write,
+                    units=object_count,
+                    results=object_count,
+                    skip_unchanged=skip_unchanged,
+                )
+            self.assertEqual(
+                DataCompliance.objects.filter(compliance_class_name="BenchmarkCompliance").count(), object_count
+            )
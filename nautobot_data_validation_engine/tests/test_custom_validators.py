@@ -2,19 +2,29 @@
 Model test cases
 """
 
+from unittest.mock import patch
+
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ValidationError
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from nautobot.dcim.models import Location, LocationType, Rack
 from nautobot.extras.models import Status
 from nautobot.extras.plugins.validators import wrap_model_clean_methods
 
+from nautobot_data_validation_engine.custom_validators import (
+    BaseValidator,
+    DataComplianceRule,
+    get_unchanged_fields,
+)
 from nautobot_data_validation_engine.models import (
+    DataCompliance,
     MinMaxValidationRule,
     RegularExpressionValidationRule,
     RequiredValidationRule,
     UniqueValidationRule,
 )
+from nautobot_data_validation_engine.rule_cache import rule_cache
+from nautobot_data_validation_engine.tests.utils import get_plugins_config
 
 
 class RegularExpressionValidationRuleModelTestCase(TestCase):
@@ -458,3 +468,101 @@ class UniqueValidationRuleModelTestCase(TestCase):
 
         with self.assertRaises(ValidationError):
             location3.clean()
+
+
+class ChangeAwareDataComplianceRule(DataComplianceRule):
+    """DataComplianceRule depending on the name of locations only."""
+
+    model = "dcim.location"
+    depends_on_fields = ("name",)
+
+    def audit(self):
+        """No exception means the audit passes."""
+
+
+@override_settings(PLUGINS_CONFIG=get_plugins_config(change_aware_validation=True))
+class ChangeAwareValidationTestCase(TestCase):
+    """
+    Test cases related to skipping the rules of unchanged fields
+    """
+
+    def setUp(self) -> None:
+        wrap_model_clean_methods()
+        self.location = Location.objects.create(
+            name="Location 1",
+            location_type=LocationType.objects.create(name="Region"),
+            status=Status.objects.get_by_natural_key("Active"),
+        )
+        RegularExpressionValidationRule.objects.create(
+            name="Regex rule 1",
+            content_type=ContentType.objects.get_for_model(Location),
+            field="name",
+            regular_expression="^ABC",
+        )
+        rule_cache.clear()
+        self.addCleanup(rule_cache.clear)
+        return super().setUp()
+
+    def test_unchanged_fields_are_not_validated(self):
+        self.location.description = "Changed"
+        self.location.validated_save()
+        self.location.name = "Location 2"
+        with self.assertRaises(ValidationError):
+            self.location.validated_save()
+
+    def test_new_objects_are_validated(self):
+        location = Location(name="Location 2", location_type=self.location.location_type, status=self.location.status)
+        with self.assertRaises(ValidationError):
+            location.validated_save()
+
+    @override_settings(PLUGINS_CONFIG=get_plugins_config(change_aware_validation=False))
+    def test_disabled(self):
+        self.location.description = "Changed"
+        with self.assertRaises(ValidationError):
+            self.location.validated_save()
+
+    def test_get_unchanged_fields(self):
+        self.location.description = "Changed"
+        self.location.status = Status.objects.get_by_natural_key("Planned")
+        with self.assertNumQueries(1):
+            unchanged = get_unchanged_fields(self.location, ["name", "description", "status", "tags", "missing"])
+        self.assertEqual(unchanged, {"name"})
+
+    @patch("nautobot_data_validation_engine.custom_validators.get_data_compliance_rules_map")
+    def test_compliance_classes_of_unchanged_fields_are_skipped(self, get_data_compliance_rules_map):
+        get_data_compliance_rules_map.return_value = {"dcim.location": [ChangeAwareDataComplianceRule]}
+        RegularExpressionValidationRule.objects.all().delete()
+        rule_cache.clear()
+        self.location.validated_save()
+        self.assertFalse(DataCompliance.objects.exists())
+        self.location.name = "Location 2"
+        self.location.validated_save()
+        self.assertTrue(DataCompliance.objects.filter(compliance_class_name="ChangeAwareDataComplianceRule").exists())
+
+
+class RuleLessModelTestCase(TestCase):
+    """
+    Test cases related to validating a model that no rule targets
+    """
+
+    def setUp(self) -> None:
+        RegularExpressionValidationRule.objects.create(
+            name="Regex rule 1",
+            content_type=ContentType.objects.get_for_model(LocationType),
+            field="name",
+            regular_expression="^.*$",
+        )
+        rule_cache.clear()
+        self.addCleanup(rule_cache.clear)
+        self.location = Location(
+            name="Location 1",
+            location_type=LocationType.objects.create(name="Region"),
+            status=Status.objects.get_by_natural_key("Active"),
+        )
+        self.validator = type("DcimLocationCustomValidator", (BaseValidator,), {"model": "dcim.location"})
+        return super().setUp()
+
+    def test_clean_runs_no_queries_once_the_cache_is_warm(self):
+        self.validator(self.location).clean()
+        with self.assertNumQueries(0):
+            self.validator(self.location).clean()
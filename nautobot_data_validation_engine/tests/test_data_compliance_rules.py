@@ -1,11 +1,20 @@
 """DataComplianceRule test cases."""
 
-from django.test import TestCase
-from nautobot.dcim.models import Location, LocationType
-from nautobot.extras.models import Status
+from unittest.mock import patch
 
-from nautobot_data_validation_engine.custom_validators import ComplianceError, DataComplianceRule
+from django.test import TestCase, override_settings
+from nautobot.dcim.models import Location, LocationType
+from nautobot.extras.models import GitRepository, Status
+
+from nautobot_data_validation_engine.custom_validators import (
+    ComplianceError,
+    DataComplianceRule,
+    get_classes_from_git_repo,
+    get_git_data_compliance_rules_map,
+)
 from nautobot_data_validation_engine.models import DataCompliance
+from nautobot_data_validation_engine.rule_cache import rule_cache
+from nautobot_data_validation_engine.tests.utils import get_plugins_config
 
 
 class TestFailedDataComplianceRule(DataComplianceRule):
@@ -78,3 +87,95 @@ class TestCompliance(TestCase):
             len(DataCompliance.objects.filter(compliance_class_name=TestFailedDataComplianceRule.__name__)),
             5,
         )
+
+    def test_mark_existing_attributes_as_valid(self):
+        fixed = type(
+            "TestFixedDataComplianceRule", (TestPassedDataComplianceRule,), {"name": "TestFailedDataComplianceRule"}
+        )
+        with self.assertNumQueries(2):
+            fixed(self.s).mark_existing_attributes_as_valid(exclude_attributes=["description"])
+
+        results = DataCompliance.objects.filter(compliance_class_name="TestFailedDataComplianceRule")
+        self.assertEqual(
+            set(results.filter(valid=True).values_list("validated_attribute", flat=True)), {"tenant", "name", "status"}
+        )
+        self.assertEqual(
+            set(results.filter(valid=False).values_list("validated_attribute", flat=True)), {"__all__", "description"}
+        )
+        result = results.get(validated_attribute="name")
+        self.assertEqual(result.message, "Name is valid.")
+        self.assertEqual(result.validated_attribute_value, "Test 1")
+        self.assertEqual(results.get(validated_attribute="tenant").validated_attribute_value, "")
+        self.assertEqual(results.get(validated_attribute="status").validated_attribute_value, "Active")
+
+    @override_settings(PLUGINS_CONFIG=get_plugins_config(skip_unchanged_compliance_results=True))
+    def test_mark_existing_attributes_as_valid_skips_unchanged_results(self):
+        fixed = type(
+            "TestFixedDataComplianceRule", (TestPassedDataComplianceRule,), {"name": "TestFailedDataComplianceRule"}
+        )
+        fixed(self.s).mark_existing_attributes_as_valid()
+        results = DataCompliance.objects.filter(compliance_class_name="TestFailedDataComplianceRule")
+        last_updated = dict(results.values_list("validated_attribute", "last_updated"))
+
+        self.s.description = "Changed"
+        self.s.save()
+        rule = fixed(self.s)
+        with self.assertNumQueries(3):
+            rule.mark_existing_attributes_as_valid()
+
+        for result in results.exclude(validated_attribute="__all__"):
+            self.assertTrue(result.valid)
+            self.assertEqual(result.last_validation_date, rule.result_date)
+            if result.validated_attribute == "description":
+                self.assertEqual(result.validated_attribute_value, "Changed")
+                self.assertGreater(result.last_updated, last_updated["description"])
+            else:
+                self.assertEqual(result.last_updated, last_updated[result.validated_attribute])
+
+    def test_get_queryset_applies_related_object_hints(self):
+        self.assertEqual(list(TestPassedDataComplianceRule.get_queryset()), [self.s])
+
+        hinted = type(
+            "TestHintedDataComplianceRule",
+            (TestPassedDataComplianceRule,),
+            {"select_related": ["location_type"], "prefetch_related": ["tags"]},
+        )
+        queryset = hinted.get_queryset()
+        self.assertEqual(queryset.query.select_related, {"location_type": {}})
+        self.assertEqual(queryset._prefetch_related_lookups, ("tags",))  # pylint: disable=protected-access
+
+
+@patch("nautobot_data_validation_engine.custom_validators.load_classes_from_git_repo")
+class TestGitRepositoryComplianceClasses(TestCase):
+    """Test loading DataComplianceRule classes from Git repositories."""
+
+    def setUp(self):
+        self.repo = GitRepository.objects.create(
+            name="Compliance Rules",
+            remote_url="http://localhost/git/compliance-rules.git",
+            branch="main",
+            current_head="a" * 40,
+            provided_contents=["nautobot_data_validation_engine.data_compliance_rules"],
+        )
+        rule_cache.clear()
+        self.addCleanup(rule_cache.clear)
+
+    def test_classes_loaded_once_per_head(self, mock_load):
+        mock_load.return_value = [TestPassedDataComplianceRule]
+        self.assertEqual(get_classes_from_git_repo(self.repo), [TestPassedDataComplianceRule])
+        self.assertEqual(get_classes_from_git_repo(self.repo), [TestPassedDataComplianceRule])
+        self.assertEqual(mock_load.call_count, 1)
+
+        self.repo.current_head = "b" * 40
+        get_classes_from_git_repo(self.repo)
+        self.assertEqual(mock_load.call_count, 2)
+
+        get_classes_from_git_repo(self.repo, refresh=True)
+        self.assertEqual(mock_load.call_count, 3)
+
+    def test_git_rules_map(self, mock_load):
+        mock_load.return_value = [TestPassedDataComplianceRule]
+        self.assertEqual(get_git_data_compliance_rules_map(), {"dcim.location": [TestPassedDataComplianceRule]})
+        with self.assertNumQueries(0):
+            get_git_data_compliance_rules_map()
+        self.assertEqual(mock_load.call_count, 1)
@@ -0,0 +1,131 @@
+"""
+Streaming DataCompliance export test cases
+"""
+
+import csv
+import io
+import json
+
+from django.contrib.contenttypes.models import ContentType
+from django.urls import reverse
+from nautobot.core.testing import APITestCase, TestCase
+from nautobot.dcim.models import Location
+
+from nautobot_data_validation_engine.export import EXPORT_FIELDS, iterate_csv, iterate_ndjson
+from nautobot_data_validation_engine.models import DataCompliance
+from nautobot_data_validation_engine.tests.utils import ViewPermissionTestMixin, create_locations
+
+
+def create_results():
+    """Create a valid and an invalid name result for each of locations 0 to 2."""
+    content_type = ContentType.objects.get_for_model(Location)
+    for location in create_locations(*({"name": f"Location {i}"} for i in range(3))):
+        for compliance_class_name, valid in (("ValidCompliance", True), ("InvalidCompliance", False)):
+            DataCompliance.objects.create(
+                compliance_class_name=compliance_class_name,
+                content_type=content_type,
+                object_id=location.pk,
+                validated_object_str=location.name,
+                validated_attribute="name",
+                validated_attribute_value=location.name,
+                valid=valid,
+                message="Bad, name" if not valid else "",
+            )
+
+
+class ExportTestCase(TestCase):
+    """
+    Test cases related to iterate_csv and iterate_ndjson
+    """
+
+    def setUp(self) -> None:
+        super().setUp()
+        create_results()
+
+    def test_csv(self):
+        rows = list(csv.DictReader(io.StringIO("".join(iterate_csv(DataCompliance.objects.filter(valid=False))))))
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(tuple(rows[0]), EXPORT_FIELDS)
+        self.assertEqual(rows[0]["content_type"], "dcim.location")
+        self.assertEqual(rows[0]["message"], "Bad, name")
+        self.assertEqual(rows[0]["valid"], "False")
+
+    def test_ndjson(self):
+        rows = [json.loads(line) for line in iterate_ndjson(DataCompliance.objects.all(), chunk_size=2)]
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(
+            {(row["compliance_class_name"], row["valid"]) for row in rows},
+            {("ValidCompliance", True), ("InvalidCompliance", False)},
+        )
+
+
+class ExportAPITestCase(ViewPermissionTestMixin, APITestCase):
+    """
+    Test cases related to the export action of the DataCompliance API
+    """
+
+    def setUp(self) -> None:
+        super().setUp()
+        create_results()
+        self.url = self.get_url("csv")
+
+    def get_url(self, export_format):
+        """Return the URL of the export action in the given format."""
+        return reverse(
+            "plugins-api:nautobot_data_validation_engine-api:datacompliance-export",
+            kwargs={"export_format": export_format},
+        )
+
+    def test_export_honors_filters(self):
+        self.add_permissions("nautobot_data_validation_engine.view_datacompliance")
+        response = self.client.get(f"{self.get_url('ndjson')}?q=invalid", **self.header)
+        self.assertHttpStatus(response, 200)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        rows = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+        self.assertEqual(len(rows), 3)
+        self.assertEqual({row["compliance_class_name"] for row in rows}, {"InvalidCompliance"})
+        response = self.client.get(f"{self.get_url('csv')}?valid=False&validated_object_str=Location 1", **self.header)
+        self.assertHttpStatus(response, 200)
+        rows = list(csv.DictReader(io.StringIO(b"".join(response.streaming_content).decode())))
+        self.assertEqual(
+            [(row["compliance_class_name"], row["validated_object_str"]) for row in rows],
+            [("InvalidCompliance", "Location 1")],
+        )
+
+    def test_unknown_filter(self):
+        self.add_permissions("nautobot_data_validation_engine.view_datacompliance")
+        response = self.client.get(f"{self.get_url('csv')}?unknown=1", **self.header)
+        self.assertHttpStatus(response, 400)
+
+
+class DataComplianceExportViewTestCase(ViewPermissionTestMixin, TestCase):
+    """
+    Test cases related to the DataComplianceExportView
+    """
+
+    def setUp(self) -> None:
+        super().setUp()
+        create_results()
+        self.url = reverse(
+            "plugins:nautobot_data_validation_engine:datacompliance_export", kwargs={"export_format": "csv"}
+        )
+
+    def test_view(self):
+        self.add_permissions("nautobot_data_validation_engine.view_datacompliance")
+        response = self.client.get(f"{self.url}?compliance_class_name=ValidCompliance&per_page=1")
+        self.assertHttpStatus(response, 200)
+        rows = list(csv.DictReader(io.StringIO(b"".join(response.streaming_content).decode())))
+        self.assertEqual({row["compliance_class_name"] for row in rows}, {"ValidCompliance"})
+        self.assertEqual(len(rows), 3)
+
+    def test_list_view_links_to_export(self):
+        self.add_permissions("nautobot_data_validation_engine.view_datacompliance")
+        response = self.client.get(
+            reverse("plugins:nautobot_data_validation_engine:datacompliance_list") + "?valid=False"
+        )
+        self.assertHttpStatus(response, 200)
+        self.assertIn(
+            reverse("plugins:nautobot_data_validation_engine:datacompliance_export", kwargs={"export_format": "ndjson"})
+            + "?valid=False",
+            response.content.decode(response.charset),
+        )
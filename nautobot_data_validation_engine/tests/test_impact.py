@@ -0,0 +1,270 @@
+"""
+Impact analysis of proposed rules test cases
+"""
+
+import itertools
+import json
+from unittest import skipUnless
+from unittest.mock import patch
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import OperationalError, connection
+from django.urls import reverse
+from nautobot.core.testing import APITestCase, TestCase
+from nautobot.dcim.models import Location
+
+from nautobot_data_validation_engine.impact import count_within, get_rule_impact, iterate_rule_impact
+from nautobot_data_validation_engine.models import (
+    DataCompliance,
+    MinMaxValidationRule,
+    RegularExpressionValidationRule,
+    UniqueValidationRule,
+)
+from nautobot_data_validation_engine.tests.utils import create_locations
+
+# Locations 1 to 5, with descriptions and ASNs, the even ones named differently.
+LOCATIONS = tuple(
+    {"name": f"Location {i}" if i % 2 else f"Invalid {i}", "description": f"Location {i}", "asn": 65000 + i}
+    for i in range(1, 6)
+)
+
+
+class RuleImpactTestCase(TestCase):
+    """
+    Test cases related to iterate_rule_impact and get_rule_impact
+    """
+
+    def setUp(self) -> None:
+        self.locations = create_locations(*LOCATIONS)
+        self.content_type = ContentType.objects.get_for_model(Location)
+        return super().setUp()
+
+    def test_regex_rule(self):
+        rule = RegularExpressionValidationRule(
+            name="Regex rule 1", content_type=self.content_type, field="name", regular_expression="^Location"
+        )
+        result = get_rule_impact(rule)
+        self.assertEqual(result["method"], "pushdown" if connection.vendor in ("postgresql", "mysql") else "columns")
+        self.assertTrue(result["complete"])
+        self.assertEqual(result["total"], 5)
+        self.assertEqual(result["evaluated"], 5)
+        self.assertEqual(result["violations"], 2)
+        self.assertEqual({violation["value"] for violation in result["sample"]}, {"Invalid 2", "Invalid 4"})
+        self.assertEqual(
+            result["sample"][0]["url"], Location.objects.get(name=result["sample"][0]["value"]).get_absolute_url()
+        )
+        # Nothing is written.
+        self.assertFalse(RegularExpressionValidationRule.objects.exists())
+        self.assertFalse(DataCompliance.objects.exists())
+
+    def test_context_processing_regex_rule(self):
+        rule = RegularExpressionValidationRule(
+            name="Regex rule 1",
+            content_type=self.content_type,
+            field="description",
+            regular_expression="^{{ object.name }}$",
+            context_processing=True,
+        )
+        result = get_rule_impact(rule)
+        self.assertEqual(result["method"], "objects")
+        self.assertEqual(result["violations"], 2)
+
+    def test_min_max_rule(self):
+        rule = MinMaxValidationRule(
+            name="Min/max rule 1", content_type=self.content_type, field="asn", min=65002, max=65003
+        )
+        result = get_rule_impact(rule, queryset=Location.objects.exclude(pk=self.locations[0].pk), sample_size=1)
+        self.assertEqual(result["total"], 4)
+        self.assertEqual(result["violations"], 2)
+        self.assertEqual(len(result["sample"]), 1)
+
+    def test_unique_rule(self):
+        Location.objects.filter(pk__in=[location.pk for location in self.locations[:2]]).update(description="Shared")
+        rule = UniqueValidationRule(
+            name="Unique rule 1", content_type=self.content_type, field="description", max_instances=1
+        )
+        result = get_rule_impact(rule)
+        self.assertTrue(result["complete"])
+        self.assertEqual(result["evaluated"], 5)
+        self.assertEqual(result["violations"], 2)
+
+    def test_unique_rule_out_of_time_budget(self):
+        rule = UniqueValidationRule(
+            name="Unique rule 1", content_type=self.content_type, field="description", max_instances=1
+        )
+        # As raised when the queries finding the duplicate values are cancelled.
+        with patch("nautobot_data_validation_engine.impact.BulkUniquenessEvaluator", side_effect=OperationalError):
+            result = get_rule_impact(rule)
+        self.assertEqual(result["total"], 5)
+        self.assertFalse(result["complete"])
+        self.assertEqual(result["evaluated"], 0)
+
+    def test_progress(self):
+        rule = MinMaxValidationRule(name="Min/max rule 1", content_type=self.content_type, field="asn", min=65002)
+        with patch("nautobot_data_validation_engine.impact.get_rule_violation_filter", return_value=None):
+            results = list(iterate_rule_impact(rule, chunk_size=2))
+        self.assertEqual([result["evaluated"] for result in results], [2, 4, 5, 5])
+        self.assertEqual(results[-1]["method"], "columns")
+        self.assertEqual(results[-1]["violations"], 1)
+
+    def test_time_budget(self):
+        rule = MinMaxValidationRule(name="Min/max rule 1", content_type=self.content_type, field="asn", min=65002)
+        with patch("nautobot_data_validation_engine.impact.get_rule_violation_filter", return_value=None):
+            # The objects are counted right away, then each chunk takes 5 seconds.
+            with patch(
+                "nautobot_data_validation_engine.impact.time.monotonic",
+                side_effect=itertools.chain([0, 0], itertools.count(5, 5)),
+            ):
+                result = get_rule_impact(rule, chunk_size=2, time_budget=1)
+        self.assertFalse(result["complete"])
+        self.assertEqual(result["evaluated"], 2)
+
+    def test_count_out_of_time_budget(self):
+        rule = MinMaxValidationRule(name="Min/max rule 1", content_type=self.content_type, field="asn", min=65002)
+        with patch("nautobot_data_validation_engine.impact.count_within", return_value=None):
+            results = list(iterate_rule_impact(rule))
+        self.assertEqual(len(results), 1)
+        self.assertIsNone(results[0]["total"])
+        self.assertFalse(results[0]["complete"])
+        self.assertEqual(results[0]["evaluated"], 0)
+
+    @skipUnless(connection.vendor == "postgresql", "Requires PostgreSQL")
+    def test_count_within(self):
+        self.assertEqual(count_within(Location.objects.all(), 10), len(self.locations))
+        slow = Location.objects.extra(where=["pg_sleep(0.2) IS NOT NULL"])
+        self.assertIsNone(count_within(slow, 0.05))
+        # The statement timeout of the connection is left as it was.
+        with connection.cursor() as cursor:
+            cursor.execute("SHOW statement_timeout")
+            self.assertEqual(cursor.fetchone()[0], "0")
+
+
+class RuleImpactAnalysisAPITestCase(APITestCase):
+    """
+    Test cases related to the impact-analysis actions of the rule API
+    """
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.locations = create_locations(*LOCATIONS)
+        self.add_permissions("dcim.view_location")
+
+    def get_results(self, response):
+        """Return the JSON lines streamed by the given response."""
+        return [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+
+    def test_new_rule(self):
+        self.add_permissions("nautobot_data_validation_engine.view_regularexpressionvalidationrule")
+        response = self.client.post(
+            reverse("plugins-api:nautobot_data_validation_engine-api:regularexpressionvalidationrule-impact-analysis"),
+            {"name": "Regex rule 1", "content_type": "dcim.location", "field": "name", "regular_expression": "^Loc"},
+            format="json",
+            **self.header,
+        )
+        self.assertHttpStatus(response, 200)
+        results = self.get_results(response)
+        self.assertEqual(results[-1]["violations"], 2)
+        self.assertEqual(len(results[-1]["sample"]), 2)
+        self.assertFalse(RegularExpressionValidationRule.objects.exists())
+
+    def test_edited_rule(self):
+        self.add_permissions("nautobot_data_validation_engine.view_minmaxvalidationrule")
+        rule = MinMaxValidationRule.objects.create(
+            name="Min/max rule 1", content_type=ContentType.objects.get_for_model(Location), field="asn", min=65000
+        )
+        response = self.client.post(
+            reverse(
+                "plugins-api:nautobot_data_validation_engine-api:minmaxvalidationrule-edit-impact-analysis",
+                kwargs={"pk": rule.pk},
+            )
+            + "?sample_size=0",
+            {"min": 65004},
+            format="json",
+            **self.header,
+        )
+        self.assertHttpStatus(response, 200)
+        result = self.get_results(response)[-1]
+        self.assertEqual(result["violations"], 3)
+        self.assertEqual(result["sample"], [])
+        rule.refresh_from_db()
+        self.assertEqual(rule.min, 65000)
+
+    def test_invalid_rule(self):
+        self.add_permissions("nautobot_data_validation_engine.view_regularexpressionvalidationrule")
+        response = self.client.post(
+            reverse("plugins-api:nautobot_data_validation_engine-api:regularexpressionvalidationrule-impact-analysis"),
+            {"name": "Regex rule 1", "content_type": "dcim.location", "field": "name", "regular_expression": "[a"},
+            format="json",
+            **self.header,
+        )
+        self.assertHttpStatus(response, 400)
+
+    def test_invalid_sample_size(self):
+        self.add_permissions("nautobot_data_validation_engine.view_regularexpressionvalidationrule")
+        response = self.client.post(
+            reverse("plugins-api:nautobot_data_validation_engine-api:regularexpressionvalidationrule-impact-analysis")
+            + "?sample_size=1000",
+            {"name": "Regex rule 1", "content_type": "dcim.location", "field": "name", "regular_expression": "^Loc"},
+            format="json",
+            **self.header,
+        )
+        self.assertHttpStatus(response, 400)
+
+    def test_requires_permission(self):
+        response = self.client.post(
+            reverse("plugins-api:nautobot_data_validation_engine-api:regularexpressionvalidationrule-impact-analysis"),
+            {"name": "Regex rule 1", "content_type": "dcim.location", "field": "name", "regular_expression": "^Loc"},
+            format="json",
+            **self.header,
+        )
+        self.assertHttpStatus(response, 403)
+
+
+class RuleImpactAnalysisViewTestCase(TestCase):
+    """
+    Test cases related to the RuleImpactAnalysisView
+    """
+
+    def setUp(self) -> None:
+        super().setUp()
+        create_locations(*LOCATIONS)
+        self.add_permissions("dcim.view_location")
+        self.data = {
+            "name": "Regex rule 1",
+            "content_type": ContentType.objects.get_for_model(Location).pk,
+            "field": "name",
+            "regular_expression": "^Location",
+        }
+
+    def test_view_requires_permission(self):
+        response = self.client.post(
+            reverse(
+                "plugins:nautobot_data_validation_engine:rule_impact_analysis",
+                kwargs={"model": "regularexpressionvalidationrule"},
+            ),
+            self.data,
+        )
+        self.assertHttpStatus(response, 403)
+
+    def test_view_renders_impact(self):
+        self.add_permissions("nautobot_data_validation_engine.view_regularexpressionvalidationrule")
+        response = self.client.post(
+            reverse(
+                "plugins:nautobot_data_validation_engine:rule_impact_analysis",
+                kwargs={"model": "regularexpressionvalidationrule"},
+            ),
+            self.data,
+        )
+        self.assertHttpStatus(response, 200)
+        content = response.content.decode(response.charset)
+        self.assertIn("Invalid 2", content)
+        self.assertNotIn("Location 1", content)
+        self.assertFalse(RegularExpressionValidationRule.objects.exists())
+
+    def test_unknown_model(self):
+        self.add_permissions("nautobot_data_validation_engine.view_regularexpressionvalidationrule")
+        response = self.client.post(
+            reverse("plugins:nautobot_data_validation_engine:rule_impact_analysis", kwargs={"model": "location"}),
+            self.data,
+        )
+        self.assertHttpStatus(response, 404)
@@ -0,0 +1,110 @@
+"""
+Incremental Data Compliance run test cases
+"""
+
+from unittest.mock import patch
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+from nautobot.dcim.models import Location, LocationType
+from nautobot.extras.models import Status
+
+from nautobot_data_validation_engine.audit import audit_queryset_with_builtin_rules
+from nautobot_data_validation_engine.incremental import (
+    STATE_CACHE_KEY,
+    filter_changed_objects_for_builtin_rules,
+    get_builtin_rules_fingerprint,
+    get_changed_since,
+    get_compliance_class_fingerprint,
+    record_run,
+)
+from nautobot_data_validation_engine.jobs import RunRegisteredDataComplianceRules
+from nautobot_data_validation_engine.models import RegularExpressionValidationRule
+from nautobot_data_validation_engine.rule_cache import rule_cache
+from nautobot_data_validation_engine.tests.test_data_compliance_rules import (
+    TestFailedDataComplianceRule,
+    TestPassedDataComplianceRule,
+)
+
+
+class IncrementalRunTestCase(TestCase):
+    """
+    Test cases related to incremental Data Compliance runs
+    """
+
+    def setUp(self) -> None:
+        location_type = LocationType.objects.create(name="Region")
+        status = Status.objects.get_by_natural_key("Active")
+        self.locations = [
+            Location.objects.create(name=f"Location {i}", location_type=location_type, status=status, description=desc)
+            for i, desc in enumerate(["bad", "ok", "ok", "ok"])
+        ]
+        self.rule = RegularExpressionValidationRule.objects.create(
+            name="Regex rule 1",
+            content_type=ContentType.objects.get_for_model(Location),
+            field="description",
+            regular_expression="^ok$",
+        )
+        rule_cache.clear()
+        self.addCleanup(rule_cache.clear)
+        for name in ("DcimLocationCustomValidator", "TestCompliance"):
+            self.addCleanup(cache.delete, STATE_CACHE_KEY.format(name))
+        return super().setUp()
+
+    def test_changed_since_requires_a_matching_previous_run(self):
+        started = timezone.now()
+        self.assertIsNone(get_changed_since("TestCompliance", Location, "abc"))
+        record_run("TestCompliance", "abc", started)
+        self.assertEqual(get_changed_since("TestCompliance", Location, "abc"), started)
+        self.assertIsNone(get_changed_since("TestCompliance", Location, "def"))
+        self.assertIsNone(get_changed_since("TestCompliance", Location, None))
+
+    def test_changed_since_requires_last_updated(self):
+        record_run("TestCompliance", "abc", timezone.now())
+        self.assertIsNone(get_changed_since("TestCompliance", ContentType, "abc"))
+
+    def test_compliance_class_fingerprint(self):
+        self.assertEqual(
+            get_compliance_class_fingerprint(TestFailedDataComplianceRule),
+            get_compliance_class_fingerprint(TestFailedDataComplianceRule),
+        )
+        self.assertNotEqual(
+            get_compliance_class_fingerprint(TestFailedDataComplianceRule),
+            get_compliance_class_fingerprint(TestPassedDataComplianceRule),
+        )
+
+    def test_builtin_rules_fingerprint_changes_with_rules(self):
+        fingerprint = get_builtin_rules_fingerprint(Location)
+        self.rule.regular_expression = "^o"
+        self.rule.save()
+        rule_cache.clear()
+        self.assertNotEqual(get_builtin_rules_fingerprint(Location), fingerprint)
+
+    @patch("nautobot_data_validation_engine.jobs.audit_queryset_with_builtin_rules")
+    def test_only_changed_and_invalid_objects_are_audited_again(self, mock_audit):
+        audited = []
+
+        def audit(validator, queryset, *args, **kwargs):
+            audited.append(set(queryset.values_list("pk", flat=True)))
+            return audit_queryset_with_builtin_rules(validator, queryset, *args, **kwargs)
+
+        mock_audit.side_effect = audit
+        RunRegisteredDataComplianceRules.report_for_validation_rules(incremental=True)
+        self.assertEqual(audited[-1], {location.pk for location in self.locations})
+
+        self.locations[2].save()
+        RunRegisteredDataComplianceRules.report_for_validation_rules(incremental=True)
+        self.assertEqual(audited[-1], {self.locations[0].pk, self.locations[2].pk})
+
+        RunRegisteredDataComplianceRules.report_for_validation_rules()
+        self.assertEqual(audited[-1], {location.pk for location in self.locations})
+
+    def test_invalid_objects_are_found_with_a_subquery(self):
+        RunRegisteredDataComplianceRules.report_for_validation_rules()
+        validator = type("DcimLocationCustomValidator", (), {})
+        ContentType.objects.get_for_model(Location)
+        with self.assertNumQueries(0):
+            queryset = filter_changed_objects_for_builtin_rules(Location.objects.all(), validator, timezone.now())
+        self.assertEqual(list(queryset.values_list("pk", flat=True)), [self.locations[0].pk])
@@ -0,0 +1,163 @@
+"""
+Rule instrumentation test cases
+"""
+
+import time
+from unittest.mock import patch
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.urls import reverse
+from nautobot.core.testing import TestCase
+from nautobot.dcim.models import Location, LocationType
+from nautobot.extras.models import Status
+from prometheus_client import REGISTRY
+
+from nautobot_data_validation_engine.custom_validators import BaseValidator
+from nautobot_data_validation_engine.instrumentation import (
+    STATS_BUCKET_SECONDS,
+    STATS_CACHE_KEY,
+    measure_rule,
+    rule_statistics,
+)
+from nautobot_data_validation_engine.models import RegularExpressionValidationRule, RequiredValidationRule
+from nautobot_data_validation_engine.rule_cache import rule_cache
+
+APP_SETTINGS = {"rule_metrics": True, "log_rule_evaluations": False, "rule_statistics_window": 60}
+
+
+def get_evaluations(rule, result):
+    """Return the value of the evaluations counter of the given test rule and result."""
+    return REGISTRY.get_sample_value(
+        "nautobot_data_validation_engine_rule_evaluations_total",
+        {"rule_type": "test", "rule": rule, "model": "dcim.location", "result": result},
+    )
+
+
+def clear_statistics():
+    """Discard the rule statistics of this process and of the cache."""
+    rule_statistics.flush()
+    current = int(time.time() // STATS_BUCKET_SECONDS)
+    cache.delete_many([STATS_CACHE_KEY.format(current - i) for i in range(-1, APP_SETTINGS["rule_statistics_window"])])
+
+
+class MeasureRuleTestCase(TestCase):
+    """
+    Test cases related to measure_rule
+    """
+
+    def setUp(self) -> None:
+        clear_statistics()
+        self.addCleanup(clear_statistics)
+        patcher = patch(
+            "nautobot_data_validation_engine.instrumentation.get_app_settings", return_value=dict(APP_SETTINGS)
+        )
+        self.app_settings = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+        return super().setUp()
+
+    def test_results_are_counted(self):
+        with measure_rule("test", "Counted rule", "dcim.location"):
+            pass
+        with self.assertRaises(ValidationError):
+            with measure_rule("test", "Counted rule", "dcim.location"):
+                raise ValidationError("Invalid")
+        with self.assertRaises(ValueError):
+            with measure_rule("test", "Counted rule", "dcim.location"):
+                raise ValueError("Broken")
+        self.assertEqual(get_evaluations("Counted rule", "pass"), 1)
+        self.assertEqual(get_evaluations("Counted rule", "fail"), 1)
+        self.assertEqual(get_evaluations("Counted rule", "error"), 1)
+
+    def test_queries_are_counted(self):
+        with measure_rule("test", "Querying rule", "dcim.location"):
+            list(Location.objects.all())
+            list(LocationType.objects.all())
+        [rule] = rule_statistics.get_slowest_rules()
+        self.assertEqual(rule["rule"], "Querying rule")
+        self.assertEqual(rule["evaluations"], 1)
+        self.assertEqual(rule["queries"], 2)
+        self.assertEqual(
+            REGISTRY.get_sample_value(
+                "nautobot_data_validation_engine_rule_queries_total",
+                {"rule_type": "test", "rule": "Querying rule", "model": "dcim.location"},
+            ),
+            2,
+        )
+
+    def test_disabled(self):
+        self.app_settings["rule_metrics"] = False
+        with measure_rule("test", "Disabled rule", "dcim.location"):
+            pass
+        self.assertIsNone(get_evaluations("Disabled rule", "pass"))
+        self.assertEqual(rule_statistics.get_slowest_rules(), [])
+
+    def test_evaluations_are_logged(self):
+        self.app_settings["log_rule_evaluations"] = True
+        with self.assertLogs("nautobot_data_validation_engine.rules") as logs:
+            with measure_rule("test", "Logged rule", "dcim.location"):
+                pass
+        [record] = logs.records
+        self.assertEqual(record.rule, "Logged rule")
+        self.assertEqual(record.result, "pass")
+        self.assertEqual(record.queries, 0)
+
+    def test_slowest_rules_are_sorted_by_total_time(self):
+        rule_statistics.record(("test", "Fast rule", "dcim.location"), 0.001, 0, False)
+        rule_statistics.record(("test", "Slow rule", "dcim.location"), 0.5, 1, True)
+        rule_statistics.record(("test", "Slow rule", "dcim.location"), 0.25, 1, False)
+        rule_statistics.flush()
+        # Statistics flushed by another process are merged into the same bucket.
+        rule_statistics.record(("test", "Fast rule", "dcim.location"), 0.003, 0, False)
+        slowest = rule_statistics.get_slowest_rules()
+        self.assertEqual([rule["rule"] for rule in slowest], ["Slow rule", "Fast rule"])
+        self.assertEqual(slowest[0]["evaluations"], 2)
+        self.assertEqual(slowest[0]["failures"], 1)
+        self.assertAlmostEqual(slowest[0]["max_ms"], 500)
+        self.assertAlmostEqual(slowest[1]["total_ms"], 4)
+        self.assertEqual(len(rule_statistics.get_slowest_rules(limit=1)), 1)
+
+    def test_base_validator_measures_each_rule(self):
+        content_type = ContentType.objects.get_for_model(Location)
+        RegularExpressionValidationRule.objects.create(
+            name="Regex rule 1", content_type=content_type, field="name", regular_expression="^Location"
+        )
+        RequiredValidationRule.objects.create(name="Required rule 1", content_type=content_type, field="description")
+        rule_cache.clear()
+        self.addCleanup(rule_cache.clear)
+        location = Location(
+            name="Location 1",
+            location_type=LocationType.objects.create(name="Region"),
+            status=Status.objects.get_by_natural_key("Active"),
+        )
+        validator = type("DcimLocationCustomValidator", (BaseValidator,), {"model": "dcim.location"})
+        with self.assertRaises(ValidationError):
+            validator(location).clean()
+        slowest = {rule["rule"]: rule for rule in rule_statistics.get_slowest_rules()}
+        self.assertEqual(slowest["Regex rule 1"]["rule_type"], "regex")
+        self.assertEqual(slowest["Regex rule 1"]["failures"], 0)
+        self.assertEqual(slowest["Required rule 1"]["rule_type"], "required")
+        self.assertEqual(slowest["Required rule 1"]["failures"], 1)
+
+
+class SlowestRulesViewTestCase(TestCase):
+    """
+    Test cases related to the SlowestRulesView
+    """
+
+    def setUp(self) -> None:
+        clear_statistics()
+        self.addCleanup(clear_statistics)
+        rule_statistics.record(("regex", "Regex rule 1", "dcim.location"), 0.5, 0, False)
+        return super().setUp()
+
+    def test_view_requires_permission(self):
+        response = self.client.get(reverse("plugins:nautobot_data_validation_engine:slowest_rules"))
+        self.assertHttpStatus(response, 403)
+
+    def test_view_lists_rules(self):
+        self.add_permissions("nautobot_data_validation_engine.view_datacompliance")
+        response = self.client.get(reverse("plugins:nautobot_data_validation_engine:slowest_rules"))
+        self.assertHttpStatus(response, 200)
+        self.assertIn("Regex rule 1", response.content.decode(response.charset))
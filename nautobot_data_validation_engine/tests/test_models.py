@@ -4,16 +4,19 @@ Model test cases
 
 from django.contrib.contenttypes.models import ContentType
 from django.core.validators import ValidationError
+from django.db import connection
 from django.db.utils import IntegrityError
 from django.test import TestCase
-from nautobot.dcim.models import Cable, Device, Location, PowerFeed
-from nautobot.extras.models import Job
+from nautobot.dcim.models import Cable, Device, Location, LocationType, PowerFeed
+from nautobot.extras.models import Job, Status
 
 from nautobot_data_validation_engine.models import (
+    DataCompliance,
     MinMaxValidationRule,
     RegularExpressionValidationRule,
     RequiredValidationRule,
     UniqueValidationRule,
+    get_template_object_attributes,
 )
 
 
@@ -97,6 +100,26 @@ class RegularExpressionValidationRuleModelTestCase(TestCase):
         except ValidationError as e:
             self.fail(f"rule.clean() failed validation: {e}")
 
+    def test_invalid_template_fails_validation(self):
+        """Test that an invalid Jinja2 template fails validation when context processing is enabled."""
+        rule = RegularExpressionValidationRule.objects.create(
+            name="Regex rule 1",
+            content_type=ContentType.objects.get_for_model(Device),
+            field="name",
+            regular_expression="{{ object.name",  # this is an invalid jinja2 template
+            context_processing=True,
+        )
+
+        with self.assertRaises(ValidationError):
+            rule.clean()
+
+    def test_template_object_attributes(self):
+        """Test that the object attributes read by a template are found."""
+        self.assertEqual(
+            get_template_object_attributes('{{ object.location.name[0:3] }}-{{ object["role"] }}-{{ other.name }}'),
+            ["location", "role"],
+        )
+
 
 class MinMaxValidationRuleModelTestCase(TestCase):
     """
@@ -296,3 +319,51 @@ class UniqueValidationRuleModelTestCase(TestCase):
             )
 
             rule.clean()
+
+
+class DataComplianceModelTestCase(TestCase):
+    """
+    Test cases related to the DataCompliance model
+    """
+
+    def setUp(self) -> None:
+        self.location = Location.objects.create(
+            name="Location 1",
+            location_type=LocationType.objects.create(name="Region"),
+            status=Status.objects.get_by_natural_key("Active"),
+        )
+        self.result = DataCompliance.objects.create(
+            compliance_class_name="TestCompliance",
+            content_type=ContentType.objects.get_for_model(Location),
+            object_id=self.location.pk,
+            validated_attribute="__all__",
+            valid=False,
+        )
+        return super().setUp()
+
+    def test_get_for_object(self):
+        self.assertEqual(list(DataCompliance.objects.get_for_object(self.location)), [self.result])
+        self.assertFalse(DataCompliance.objects.get_for_object(self.location.location_type).exists())
+
+    def assertUsesIndex(self, queryset, column):  # pylint: disable=invalid-name
+        """Assert that the query plan of `queryset` looks its rows up through an index on `column`."""
+        if connection.vendor != "postgresql":
+            self.skipTest("Only PostgreSQL can be kept from scanning a table this small sequentially")
+        with connection.cursor() as cursor:
+            # Rolled back along with the test transaction.
+            cursor.execute(f"ANALYZE {DataCompliance._meta.db_table}")
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        self.assertRegex(queryset.explain(), rf"Index Cond: .*\b{column}\b")
+
+    def test_object_lookups_are_index_backed(self):
+        self.assertUsesIndex(DataCompliance.objects.get_for_object(self.location), "object_id")
+
+    def test_invalid_results_lookups_are_index_backed(self):
+        queryset = DataCompliance.objects.filter(
+            compliance_class_name="TestCompliance", content_type=self.result.content_type, valid=False
+        )
+        self.assertUsesIndex(queryset, "compliance_class_name")
+
+    def test_last_validation_date_lookups_are_index_backed(self):
+        queryset = DataCompliance.objects.filter(last_validation_date__lt=self.result.last_validation_date)
+        self.assertUsesIndex(queryset, "last_validation_date")
@@ -0,0 +1,228 @@
+"""
+Asynchronous compliance evaluation test cases
+"""
+
+from unittest.mock import patch
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import transaction
+from django.test import TestCase, override_settings
+from nautobot.core.testing import TransactionTestCase
+from nautobot.dcim.models import Location, LocationType
+from nautobot.extras.models import Status
+
+from nautobot_data_validation_engine.custom_validators import DataComplianceRule
+from nautobot_data_validation_engine.models import DataCompliance, DataComplianceOutboxEntry
+from nautobot_data_validation_engine.outbox import (
+    DRAIN_SCHEDULED_CACHE_KEY,
+    _TransactionObjects,
+    drain_outbox,
+    record_objects,
+)
+from nautobot_data_validation_engine.rule_cache import rule_cache
+from nautobot_data_validation_engine.tests.utils import get_plugins_config
+
+
+def get_outbox_callbacks(callbacks):
+    """Return the on_commit callbacks recording objects in the outbox, e.g. not those updating the summary counts."""
+    return [callback for callback in callbacks if isinstance(callback, _TransactionObjects)]
+
+
+class AsyncDataComplianceRule(DataComplianceRule):
+    """Non-enforcing DataComplianceRule, run asynchronously."""
+
+    model = "dcim.location"
+
+    def audit(self):
+        """No exception means the audit passes."""
+
+
+class EnforcingDataComplianceRule(DataComplianceRule):
+    """Enforcing DataComplianceRule, always run while saving."""
+
+    model = "dcim.location"
+    enforce = True
+
+    def audit(self):
+        """No exception means the audit passes."""
+
+
+@override_settings(PLUGINS_CONFIG=get_plugins_config(async_compliance_evaluation=True))
+class OutboxTestCase(TestCase):
+    """
+    Test cases related to the asynchronous evaluation of non-enforcing DataComplianceRule classes
+    """
+
+    def setUp(self) -> None:
+        self.location_type = LocationType.objects.create(name="Region")
+        self.status = Status.objects.get_by_natural_key("Active")
+        patcher = patch(
+            "nautobot_data_validation_engine.custom_validators.get_data_compliance_rules_map",
+            return_value={"dcim.location": [AsyncDataComplianceRule, EnforcingDataComplianceRule]},
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch("nautobot_data_validation_engine.outbox.drain_compliance_outbox.apply_async")
+        self.apply_async = patcher.start()
+        self.addCleanup(patcher.stop)
+        cache.delete(DRAIN_SCHEDULED_CACHE_KEY)
+        self.addCleanup(cache.delete, DRAIN_SCHEDULED_CACHE_KEY)
+        rule_cache.clear()
+        self.addCleanup(rule_cache.clear)
+        return super().setUp()
+
+    def create_location(self, name):
+        """Create and validate a location with the given name."""
+        location = Location(name=name, location_type=self.location_type, status=self.status)
+        location.validated_save()
+        return location
+
+    def test_only_enforcing_classes_run_while_saving(self):
+        location = self.create_location("Location 1")
+        self.assertEqual(
+            list(DataCompliance.objects.get_for_object(location).values_list("compliance_class_name", flat=True)),
+            ["EnforcingDataComplianceRule"],
+        )
+
+    def test_saved_objects_are_recorded_once_committed(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            location = self.create_location("Location 1")
+            location.description = "Changed"
+            location.validated_save()
+            self.assertFalse(DataComplianceOutboxEntry.objects.exists())
+        self.assertEqual(len(get_outbox_callbacks(callbacks)), 1)
+        self.assertEqual(
+            list(DataComplianceOutboxEntry.objects.values_list("object_id", flat=True)), [str(location.pk)]
+        )
+        self.apply_async.assert_called_once()
+
+    def test_rolled_back_objects_are_not_recorded(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with self.assertRaises(RuntimeError):
+                with transaction.atomic():
+                    self.create_location("Location 1")
+                    raise RuntimeError
+            location = self.create_location("Location 2")
+        self.assertEqual(len(get_outbox_callbacks(callbacks)), 1)
+        self.assertEqual(
+            list(DataComplianceOutboxEntry.objects.values_list("object_id", flat=True)), [str(location.pk)]
+        )
+
+    def test_drain_is_scheduled_once(self):
+        location = self.create_location("Location 1")
+        content_type_id = ContentType.objects.get_for_model(Location).pk
+        record_objects({(content_type_id, str(location.pk))})
+        record_objects({(content_type_id, str(location.pk))})
+        self.assertEqual(DataComplianceOutboxEntry.objects.count(), 1)
+        self.apply_async.assert_called_once()
+        self.assertEqual(self.apply_async.call_args.kwargs["queue"], "data_compliance")
+
+    def test_drain(self):
+        locations = [self.create_location(f"Location {i}") for i in range(3)]
+        content_type_id = ContentType.objects.get_for_model(Location).pk
+        record_objects({(content_type_id, str(location.pk)) for location in locations})
+        locations[2].delete()
+        self.assertEqual(drain_outbox(batch_size=1), 2)
+        self.assertFalse(DataComplianceOutboxEntry.objects.exists())
+        self.assertEqual(
+            set(
+                DataCompliance.objects.filter(compliance_class_name="AsyncDataComplianceRule").values_list(
+                    "object_id", flat=True
+                )
+            ),
+            {str(locations[0].pk), str(locations[1].pk)},
+        )
+
+    def test_failed_drain_keeps_entries(self):
+        location = self.create_location("Location 1")
+        record_objects({(ContentType.objects.get_for_model(Location).pk, str(location.pk))})
+        with patch("nautobot_data_validation_engine.outbox.audit_claimed_entries", side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                drain_outbox()
+        self.assertEqual(
+            list(DataComplianceOutboxEntry.objects.values_list("object_id", flat=True)), [str(location.pk)]
+        )
+        # The scheduled drain isn't forgotten until the outbox is empty.
+        self.assertTrue(cache.get(DRAIN_SCHEDULED_CACHE_KEY))
+
+    def test_failed_audit_only_drops_its_entry(self):
+        locations = [self.create_location("Location 1"), self.create_location("Location 2")]
+        content_type_id = ContentType.objects.get_for_model(Location).pk
+        record_objects({(content_type_id, str(location.pk)) for location in locations})
+
+        def audit(rule):
+            if rule.context["object"] == locations[0]:
+                raise RuntimeError
+
+        with patch.object(AsyncDataComplianceRule, "audit", autospec=True, side_effect=audit):
+            with self.assertLogs("nautobot_data_validation_engine.outbox", "ERROR") as logs:
+                self.assertEqual(drain_outbox(), 1)
+
+        self.assertIn(str(locations[0].pk), logs.output[0])
+        self.assertFalse(DataComplianceOutboxEntry.objects.exists())
+        results = DataCompliance.objects.filter(compliance_class_name="AsyncDataComplianceRule")
+        self.assertEqual(list(results.values_list("object_id", flat=True)), [str(locations[1].pk)])
+
+    def test_drain_clears_scheduled_flag_once_empty(self):
+        location = self.create_location("Location 1")
+        record_objects({(ContentType.objects.get_for_model(Location).pk, str(location.pk))})
+        self.assertTrue(cache.get(DRAIN_SCHEDULED_CACHE_KEY))
+        self.assertEqual(drain_outbox(), 1)
+        self.assertIsNone(cache.get(DRAIN_SCHEDULED_CACHE_KEY))
+        self.apply_async.assert_called_once()
+
+    def test_drain_is_scheduled_again_for_entries_left(self):
+        location = self.create_location("Location 1")
+        content_type_id = ContentType.objects.get_for_model(Location).pk
+        record_objects({(content_type_id, str(location.pk))})
+        with patch(
+            "nautobot_data_validation_engine.outbox.DataComplianceOutboxEntry.objects.exists", return_value=True
+        ):
+            drain_outbox()
+        self.assertEqual(self.apply_async.call_count, 2)
+
+    @override_settings(PLUGINS_CONFIG=get_plugins_config(async_compliance_evaluation=False))
+    def test_disabled(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            location = self.create_location("Location 1")
+        self.assertEqual(get_outbox_callbacks(callbacks), [])
+        self.assertEqual(
+            DataCompliance.objects.get_for_object(location).filter(valid=True).count(),
+            2,
+        )
+
+
+@override_settings(PLUGINS_CONFIG=get_plugins_config(async_compliance_evaluation=True))
+class OutboxAutocommitTestCase(TransactionTestCase):
+    """
+    Test cases related to objects saved outside of a transaction, e.g. by scripts
+    """
+
+    def setUp(self) -> None:
+        super().setUp()
+        patcher = patch(
+            "nautobot_data_validation_engine.custom_validators.get_data_compliance_rules_map",
+            return_value={"dcim.location": [AsyncDataComplianceRule]},
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch("nautobot_data_validation_engine.outbox.drain_compliance_outbox.apply_async")
+        self.apply_async = patcher.start()
+        self.addCleanup(patcher.stop)
+        cache.delete(DRAIN_SCHEDULED_CACHE_KEY)
+        self.addCleanup(cache.delete, DRAIN_SCHEDULED_CACHE_KEY)
+        rule_cache.clear()
+        self.addCleanup(rule_cache.clear)
+
+    def test_saved_objects_are_recorded_right_away(self):
+        location = Location(
+            name="Location 1",
+            location_type=LocationType.objects.create(name="Region"),
+            status=Status.objects.get_by_natural_key("Active"),
+        )
+        location.validated_save()
+        self.assertEqual(
+            list(DataComplianceOutboxEntry.objects.values_list("object_id", flat=True)), [str(location.pk)]
+        )
+        self.apply_async.assert_called_once()
@@ -0,0 +1,192 @@
+"""
+SQL pushdown of the built-in rules test cases
+"""
+
+import re
+from unittest import skipUnless
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test import TestCase
+from nautobot.dcim.models import Location, LocationType
+from nautobot.extras.models import Status
+
+from nautobot_data_validation_engine.audit import (
+    audit_queryset_with_builtin_rules,
+    get_unique_evaluator,
+    pushdown_audit_with_builtin_rules,
+)
+from nautobot_data_validation_engine.custom_validators import BaseValidator
+from nautobot_data_validation_engine.models import (
+    DataCompliance,
+    MinMaxValidationRule,
+    RegularExpressionValidationRule,
+    RequiredValidationRule,
+    UniqueValidationRule,
+)
+from nautobot_data_validation_engine.pushdown import get_database_regex, get_violation_filter
+from nautobot_data_validation_engine.results import DataComplianceResultWriter
+from nautobot_data_validation_engine.rule_cache import rule_cache
+
+PORTABLE_PATTERNS = [
+    "^Location",
+    "^[A-Z][a-z0-9_]+$",
+    "(ams|lon)[0-9]{2,3}-.*",
+    "^\\.?a+b*c?$",
+    "^Loc.tion$",
+]
+UNSUPPORTED_PATTERNS = [
+    "^\\d+$",
+    "^[^a]",
+    "(?i)location",
+    "a*?",
+    "(a|)",
+    "^(a",
+    "a{1000}",
+    "[a-Z]",
+    "(?P<name>a)",
+    "a^b",
+    "(a)\\1",
+]
+VALUES = ["Location 1", "location", "Loc\ntion", "ams01-x", "lon999-y", "Aa_1", ".aaab", "aab\n", "", "x Location"]
+
+
+class DatabaseRegexTestCase(TestCase):
+    """
+    Test cases related to get_database_regex
+    """
+
+    def test_unsupported_patterns(self):
+        for pattern in UNSUPPORTED_PATTERNS:
+            with self.subTest(pattern=pattern):
+                self.assertIsNone(get_database_regex(pattern, "postgresql"))
+
+    def test_unsupported_vendor(self):
+        self.assertIsNone(get_database_regex("^Location", "sqlite"))
+
+    @skipUnless(connection.vendor == "postgresql", "PostgreSQL specific")
+    def test_postgresql_agrees_with_python(self):
+        location_type = LocationType.objects.create(name="Region")
+        status = Status.objects.get_by_natural_key("Active")
+        for i, value in enumerate(VALUES):
+            Location.objects.create(name=f"Location {i}", location_type=location_type, status=status, description=value)
+        for pattern in PORTABLE_PATTERNS:
+            database_regex = get_database_regex(pattern, connection.vendor)
+            with self.subTest(pattern=pattern):
+                self.assertIsNotNone(database_regex)
+                matched = set(
+                    Location.objects.filter(description__regex=database_regex).values_list("description", flat=True)
+                )
+                # The database may only be stricter, here with Python's `$` also matching before a trailing newline.
+                self.assertEqual(
+                    matched, {value for value in VALUES if re.match(pattern, value) and not value.endswith("\n")}
+                )
+                self.assertLessEqual(matched, {value for value in VALUES if re.match(pattern, value)})
+
+
+class ViolationFilterTestCase(TestCase):
+    """
+    Test cases related to get_violation_filter and pushdown_audit_with_builtin_rules
+    """
+
+    def setUp(self) -> None:
+        location_type = LocationType.objects.create(name="Region")
+        status = Status.objects.get_by_natural_key("Active")
+        self.locations = [
+            Location.objects.create(
+                name=name, location_type=location_type, status=status, description=description, asn=asn
+            )
+            for name, description, asn in [
+                ("Location 1", "same", 65000),
+                ("Location 2", "same", None),
+                ("Location 3", "", 65000),
+                ("Invalid 4", "other", 65000),
+                ("Location 5", "unique", 65535),
+                ("Location 6", "valid", 65000),
+                ("Location 7", "also valid", 64512),
+            ]
+        ]
+        self.content_type = ContentType.objects.get_for_model(Location)
+        RegularExpressionValidationRule.objects.create(
+            name="Regex rule 1", content_type=self.content_type, field="name", regular_expression="^Location"
+        )
+        # The bounds are compared to an integer field
+        MinMaxValidationRule.objects.create(
+            name="Min/max rule 1", content_type=self.content_type, field="asn", min=64512.5, max=65534.5
+        )
+        RequiredValidationRule.objects.create(
+            name="Required rule 1", content_type=self.content_type, field="description"
+        )
+        UniqueValidationRule.objects.create(name="Unique rule 1", content_type=self.content_type, field="description")
+        rule_cache.clear()
+        self.addCleanup(rule_cache.clear)
+        self.validator = type("DcimLocationCustomValidator", (BaseValidator,), {"model": "dcim.location"})
+        return super().setUp()
+
+    def test_only_violating_objects_match(self):
+        violation_filter = get_violation_filter(self.validator, Location)
+        if connection.vendor not in ("postgresql", "mysql"):
+            self.assertIsNone(violation_filter)
+            return
+        self.assertEqual(
+            set(Location.objects.filter(violation_filter).values_list("pk", flat=True)),
+            {location.pk for location in self.locations if location.name != "Location 6"},
+        )
+
+    def test_rules_without_filter(self):
+        RegularExpressionValidationRule.objects.update(regular_expression="^\\w")
+        rule_cache.clear()
+        self.assertIsNone(get_violation_filter(self.validator, Location))
+
+    def test_required_rules_without_exact_emptiness_filter(self):
+        # A JSONField holding "" is missing for the rule, but is not NULL.
+        RequiredValidationRule.objects.update(field="_custom_field_data")
+        rule_cache.clear()
+        self.assertIsNone(get_violation_filter(self.validator, Location))
+        Location.objects.filter(pk=self.locations[5].pk).update(_custom_field_data="")
+        with DataComplianceResultWriter() as result_writer:
+            audit_queryset_with_builtin_rules(
+                self.validator, Location.objects.all(), result_writer, unique_evaluator=get_unique_evaluator(Location)
+            )
+        self.assertTrue(
+            DataCompliance.objects.filter(
+                object_id=str(self.locations[5].pk), validated_attribute="_custom_field_data"
+            ).exists()
+        )
+
+    @skipUnless(connection.vendor in ("postgresql", "mysql"), "Requires a database supporting the regex pushdown")
+    def test_audit(self):
+        for location in self.locations[4:]:
+            DataCompliance.objects.create(
+                compliance_class_name="DcimLocationCustomValidator",
+                content_type=self.content_type,
+                object_id=str(location.pk),
+                validated_attribute="name",
+                valid=False,
+            )
+        with DataComplianceResultWriter() as result_writer:
+            count = pushdown_audit_with_builtin_rules(
+                self.validator,
+                Location.objects.all(),
+                get_violation_filter(self.validator, Location),
+                result_writer,
+                unique_evaluator=get_unique_evaluator(Location),
+                # Smaller than the number of stale results, which are checked a chunk at a time.
+                chunk_size=2,
+            )
+        self.assertEqual(count, len(self.locations))
+        self.assertEqual(
+            set(
+                DataCompliance.objects.filter(content_type=self.content_type).values_list(
+                    "object_id", "validated_attribute"
+                )
+            ),
+            {
+                (str(self.locations[0].pk), "description"),
+                (str(self.locations[1].pk), "asn"),
+                (str(self.locations[2].pk), "description"),
+                (str(self.locations[3].pk), "name"),
+                (str(self.locations[4].pk), "asn"),
+                (str(self.locations[6].pk), "asn"),
+            },
+        )
@@ -0,0 +1,105 @@
+"""
+DataCompliance result writer test cases
+"""
+
+from django.contrib.contenttypes.models import ContentType
+from django.test import TestCase
+from nautobot.dcim.models import Location, LocationType
+from nautobot.extras.models import Status
+
+from nautobot_data_validation_engine.models import DataCompliance
+from nautobot_data_validation_engine.results import DataComplianceResultWriter
+
+
+class DataComplianceResultWriterTestCase(TestCase):
+    """
+    Test cases related to the DataComplianceResultWriter
+    """
+
+    def setUp(self) -> None:
+        location_type = LocationType.objects.create(name="Region")
+        status = Status.objects.get_by_natural_key("Active")
+        self.locations = [
+            Location.objects.create(name=f"Location {i}", location_type=location_type, status=status) for i in range(5)
+        ]
+        return super().setUp()
+
+    def test_results_are_written_on_flush(self):
+        writer = DataComplianceResultWriter(batch_size=100)
+        for location in self.locations:
+            writer.add("TestCompliance", location, "name", message="OK", valid=True, attribute_value=location.name)
+        self.assertEqual(len(writer), 5)
+        self.assertFalse(DataCompliance.objects.exists())
+
+        # The existing results are loaded to keep the summary counts up to date.
+        with self.assertNumQueries(2):
+            writer.flush()
+        self.assertEqual(len(writer), 0)
+        self.assertEqual(writer.written, 5)
+        self.assertEqual(DataCompliance.objects.filter(valid=True).count(), 5)
+        result = DataCompliance.objects.get(object_id=self.locations[0].pk)
+        self.assertEqual(result.content_type, ContentType.objects.get_for_model(Location))
+        self.assertEqual(result.validated_object_str, "Location 0")
+        self.assertEqual(result.validated_attribute_value, "Location 0")
+
+    def test_existing_results_are_updated(self):
+        with DataComplianceResultWriter() as writer:
+            writer.add("TestCompliance", self.locations[0], "name", message="OK", valid=True)
+        existing = DataCompliance.objects.get()
+
+        with DataComplianceResultWriter() as writer:
+            writer.add("TestCompliance", self.locations[0], "name", message="Bad name", valid=False)
+            writer.add("TestCompliance", self.locations[0], "__all__", message="Bad location", valid=False)
+
+        self.assertEqual(DataCompliance.objects.count(), 2)
+        updated = DataCompliance.objects.get(validated_attribute="name")
+        self.assertEqual(updated.pk, existing.pk)
+        self.assertEqual(updated.message, "Bad name")
+        self.assertFalse(updated.valid)
+
+    def test_last_added_result_wins(self):
+        with DataComplianceResultWriter() as writer:
+            writer.add("TestCompliance", self.locations[0], "name", message="Bad name", valid=False)
+            writer.add("TestCompliance", self.locations[0], "name", message="OK", valid=True)
+            self.assertEqual(len(writer), 1)
+        self.assertTrue(DataCompliance.objects.get().valid)
+
+    def test_full_batches_are_flushed_automatically(self):
+        writer = DataComplianceResultWriter(batch_size=2)
+        for location in self.locations:
+            writer.add("TestCompliance", location, "name", message="OK", valid=True)
+        self.assertEqual(writer.written, 4)
+        self.assertEqual(len(writer), 1)
+        self.assertEqual(DataCompliance.objects.count(), 4)
+
+    def test_unchanged_results_are_skipped(self):
+        with DataComplianceResultWriter() as writer:
+            for location in self.locations[:2]:
+                writer.add("TestCompliance", location, "name", message="OK", valid=True, attribute_value=location.name)
+        unchanged = DataCompliance.objects.get(object_id=self.locations[0].pk)
+
+        writer = DataComplianceResultWriter(skip_unchanged=True)
+        writer.add("TestCompliance", self.locations[0], "name", message="OK", valid=True, attribute_value="Location 0")
+        writer.add(
+            "TestCompliance", self.locations[1], "name", message="Bad", valid=False, attribute_value="Location 1"
+        )
+        writer.add("TestCompliance", self.locations[2], "name", message="OK", valid=True, attribute_value="Location 2")
+        # Load the existing results, bump the unchanged one and upsert the others.
+        with self.assertNumQueries(3):
+            writer.flush()
+        self.assertEqual((writer.unchanged, writer.written), (1, 2))
+
+        result = DataCompliance.objects.get(object_id=self.locations[0].pk)
+        self.assertEqual(result.last_updated, unchanged.last_updated)
+        self.assertGreater(result.last_validation_date, unchanged.last_validation_date)
+        self.assertFalse(DataCompliance.objects.get(object_id=self.locations[1].pk).valid)
+        self.assertEqual(DataCompliance.objects.count(), 3)
+
+    def test_skip_unchanged_without_changes_writes_nothing(self):
+        with DataComplianceResultWriter() as writer:
+            writer.add("TestCompliance", self.locations[0], "name", message="OK", valid=True)
+        writer = DataComplianceResultWriter(skip_unchanged=True)
+        writer.add("TestCompliance", self.locations[0], "name", message="OK", valid=True)
+        with self.assertNumQueries(2):
+            writer.flush()
+        self.assertEqual((writer.unchanged, writer.written), (1, 0))
@@ -0,0 +1,222 @@
+"""
+Rule cache test cases
+"""
+
+import re
+from unittest.mock import patch
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import transaction
+from django.test import RequestFactory, TestCase
+from nautobot.dcim.models import Location, Rack
+
+from nautobot_data_validation_engine.custom_validators import get_models_with_rules
+from nautobot_data_validation_engine.middleware import ValidationScopeMiddleware
+from nautobot_data_validation_engine.models import (
+    MinMaxValidationRule,
+    RegularExpressionValidationRule,
+    RequiredValidationRule,
+    UniqueValidationRule,
+)
+from nautobot_data_validation_engine.rule_cache import (
+    GENERATION_CACHE_KEY,
+    CompiledPatternCache,
+    rule_cache,
+    validation_scope,
+)
+
+
+class RuleCacheTestCase(TestCase):
+    """
+    Test cases related to the per-process RuleCache
+    """
+
+    def setUp(self) -> None:
+        location_ct = ContentType.objects.get_for_model(Location)
+        self.regex_rule = RegularExpressionValidationRule.objects.create(
+            name="Regex rule 1", content_type=location_ct, field="name", regular_expression="^ABC$"
+        )
+        MinMaxValidationRule.objects.create(name="Min max rule 1", content_type=location_ct, field="latitude", min=1)
+        RequiredValidationRule.objects.create(
+            name="Required rule 1", content_type=location_ct, field="description", enabled=False
+        )
+        UniqueValidationRule.objects.create(name="Unique rule 1", content_type=location_ct, field="asn")
+        # Rules created inside an open transaction put the cache in pass-through mode; start from a clean slate.
+        rule_cache.clear()
+        self.addCleanup(rule_cache.clear)
+        return super().setUp()
+
+    def test_rules_are_grouped_by_content_type(self):
+        rules = rule_cache.get_for_model("dcim.location", exclude_disabled_rules=False)
+        self.assertEqual([rule.name for rule in rules.regex_rules], ["Regex rule 1"])
+        self.assertEqual([rule.name for rule in rules.min_max_rules], ["Min max rule 1"])
+        self.assertEqual([rule.name for rule in rules.required_rules], ["Required rule 1"])
+        self.assertEqual([rule.name for rule in rules.unique_rules], ["Unique rule 1"])
+        self.assertFalse(rule_cache.get_for_model("dcim.rack"))
+
+    def test_disabled_rules_are_excluded_by_default(self):
+        self.assertEqual(rule_cache.get_for_model("dcim.location").required_rules, ())
+
+    def test_rules_are_loaded_once(self):
+        with self.assertNumQueries(4):
+            rule_cache.get_for_model("dcim.location")
+        with self.assertNumQueries(0):
+            rule_cache.get_for_model("dcim.location")
+            rule_cache.get_for_model("dcim.rack")
+
+    def test_rule_changes_invalidate_the_cache(self):
+        rule_cache.get_for_model("dcim.location")
+        RegularExpressionValidationRule.objects.create(
+            name="Regex rule 2",
+            content_type=ContentType.objects.get_for_model(Rack),
+            field="name",
+            regular_expression="^ABC$",
+        )
+        self.assertEqual(len(rule_cache.get_for_model("dcim.rack").regex_rules), 1)
+
+        self.regex_rule.delete()
+        self.assertEqual(rule_cache.get_for_model("dcim.location").regex_rules, ())
+
+    def test_committed_rule_changes_are_cached_again(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.regex_rule.delete()
+        rule_cache.get_for_model("dcim.location")
+        with transaction.atomic(), self.assertNumQueries(0):
+            rule_cache.get_for_model("dcim.location")
+            rule_cache.get_for_model("dcim.rack")
+
+    def test_rolled_back_rule_changes_are_cached_again(self):
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            self.regex_rule.delete()
+            raise RuntimeError
+        self.assertEqual(len(rule_cache.get_for_model("dcim.location").regex_rules), 1)
+        with transaction.atomic(), self.assertNumQueries(0):
+            rule_cache.get_for_model("dcim.location")
+
+    def test_generation_change_reloads_the_cache(self):
+        rule_cache.get_for_model("dcim.location")
+        # Simulate another process committing a rule change.
+        cache.set(GENERATION_CACHE_KEY, (cache.get(GENERATION_CACHE_KEY) or 0) + 1, timeout=None)
+        with self.assertNumQueries(4):
+            rule_cache.get_for_model("dcim.location")
+
+    def test_models_with_rules(self):
+        self.assertIn("dcim.location", get_models_with_rules())
+        self.assertNotIn("dcim.rack", get_models_with_rules())
+
+        RequiredValidationRule.objects.create(
+            name="Required rule 2",
+            content_type=ContentType.objects.get_for_model(Rack),
+            field="serial",
+            enabled=False,
+        )
+        self.assertNotIn("dcim.rack", get_models_with_rules())
+        self.assertIn("dcim.rack", get_models_with_rules(exclude_disabled_rules=False))
+
+    def test_regex_rules_are_precompiled(self):
+        rule = rule_cache.get_for_model("dcim.location").regex_rules[0]
+        self.assertEqual(rule.compiled_pattern.pattern, "^ABC$")
+        self.assertIsNone(rule.pattern_cache)
+
+    def test_context_processed_regex_rules_share_a_pattern_cache(self):
+        self.regex_rule.context_processing = True
+        self.regex_rule.regular_expression = "{{ object.name }}"
+        self.regex_rule.save()
+        rule = rule_cache.get_for_model("dcim.location").regex_rules[0]
+        self.assertIsNone(rule.compiled_pattern)
+        self.assertIs(rule.pattern_cache, rule_cache.get_pattern_cache(rule))
+        self.assertIs(rule.template, rule_cache.get_template(rule)[0])
+        self.assertEqual(rule.context_object_attributes, ("name",))
+
+
+class ValidationScopeTestCase(TestCase):
+    """
+    Test cases related to validation_scope and the ValidationScopeMiddleware
+    """
+
+    def setUp(self) -> None:
+        RegularExpressionValidationRule.objects.create(
+            name="Regex rule 1",
+            content_type=ContentType.objects.get_for_model(Location),
+            field="name",
+            regular_expression="^ABC$",
+        )
+        rule_cache.clear()
+        self.addCleanup(rule_cache.clear)
+        patcher = patch("nautobot_data_validation_engine.rule_cache.cache", wraps=cache)
+        self.cache = patcher.start()
+        self.addCleanup(patcher.stop)
+        return super().setUp()
+
+    def test_generation_is_checked_once_per_scope(self):
+        with validation_scope():
+            for _ in range(3):
+                rule_cache.get_for_model("dcim.location")
+                get_models_with_rules()
+        self.assertEqual(self.cache.get.call_count, 1)
+        rule_cache.get_for_model("dcim.location")
+        self.assertEqual(self.cache.get.call_count, 2)
+
+    def test_generation_change_is_ignored_within_a_scope(self):
+        with validation_scope():
+            rule_cache.get_for_model("dcim.location")
+            cache.set(GENERATION_CACHE_KEY, (cache.get(GENERATION_CACHE_KEY) or 0) + 1, timeout=None)
+            with self.assertNumQueries(0):
+                rule_cache.get_for_model("dcim.location")
+        with self.assertNumQueries(4):
+            rule_cache.get_for_model("dcim.location")
+
+    def test_rule_changes_within_a_scope_are_seen(self):
+        with validation_scope():
+            self.assertEqual(len(rule_cache.get_for_model("dcim.location").regex_rules), 1)
+            RegularExpressionValidationRule.objects.create(
+                name="Regex rule 2",
+                content_type=ContentType.objects.get_for_model(Location),
+                field="description",
+                regular_expression="^ABC$",
+            )
+            self.assertEqual(len(rule_cache.get_for_model("dcim.location").regex_rules), 2)
+
+    def test_nested_scopes_share_values(self):
+        with validation_scope():
+            rule_cache.get_for_model("dcim.location")
+            with validation_scope():
+                rule_cache.get_for_model("dcim.location")
+            rule_cache.get_for_model("dcim.location")
+        self.assertEqual(self.cache.get.call_count, 1)
+
+    def test_middleware(self):
+        def get_response(request):  # pylint: disable=unused-argument
+            rule_cache.get_for_model("dcim.location")
+            rule_cache.get_for_model("dcim.location")
+            return "response"
+
+        self.assertEqual(ValidationScopeMiddleware(get_response)(RequestFactory().get("/")), "response")
+        self.assertEqual(self.cache.get.call_count, 1)
+
+
+class CompiledPatternCacheTestCase(TestCase):
+    """
+    Test cases related to the CompiledPatternCache LRU
+    """
+
+    def test_hits_and_misses(self):
+        patterns = CompiledPatternCache(maxsize=2)
+        self.assertIs(patterns.compile("^a$"), patterns.compile("^a$"))
+        self.assertEqual((patterns.hits, patterns.misses), (1, 1))
+
+    def test_least_recently_used_pattern_is_evicted(self):
+        patterns = CompiledPatternCache(maxsize=2)
+        first = patterns.compile("^a$")
+        patterns.compile("^b$")
+        patterns.compile("^a$")
+        patterns.compile("^c$")
+        self.assertEqual(len(patterns), 2)
+        self.assertIs(patterns.compile("^a$"), first)
+        patterns.compile("^b$")
+        self.assertEqual(patterns.misses, 4)
+
+    def test_invalid_pattern_raises(self):
+        with self.assertRaises(re.error):
+            CompiledPatternCache(maxsize=2).compile("[")
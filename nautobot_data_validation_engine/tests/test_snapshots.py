@@ -0,0 +1,134 @@
+"""
+Daily Data Compliance snapshot test cases
+"""
+
+import datetime
+
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from nautobot.core.testing import APITestCase, TestCase
+from nautobot.dcim.models import Device, Location
+
+from nautobot_data_validation_engine.models import DataComplianceSnapshot, DataComplianceSummary
+from nautobot_data_validation_engine.snapshots import get_trend, record_snapshot
+from nautobot_data_validation_engine.tests.utils import ViewPermissionTestMixin, create_summaries, get_plugins_config
+
+
+def create_test_summaries():
+    """Create the summary counts of two validated attributes of a compliance class on locations, and of devices."""
+    create_summaries(Location, "TestCompliance", ("name", True, 6), ("name", False, 1), ("description", False, 3))
+    create_summaries(Device, "DeviceCompliance", ("name", True, 5))
+
+
+class DataComplianceSnapshotTestCase(TestCase):
+    """
+    Test cases related to recording and reading the daily DataComplianceSnapshot rows
+    """
+
+    def setUp(self) -> None:
+        super().setUp()
+        create_test_summaries()
+        self.today = timezone.localdate()
+
+    def test_record_snapshot(self):
+        self.assertEqual(record_snapshot(), 2)
+        snapshot = DataComplianceSnapshot.objects.get(compliance_class_name="TestCompliance")
+        self.assertEqual(snapshot.date, self.today)
+        self.assertEqual((snapshot.valid, snapshot.invalid), (6, 4))
+
+        # Recording the snapshot of the same day again replaces it.
+        DataComplianceSummary.objects.filter(compliance_class_name="DeviceCompliance").delete()
+        self.assertEqual(record_snapshot(), 1)
+        self.assertEqual(
+            list(DataComplianceSnapshot.objects.values_list("compliance_class_name", flat=True)), ["TestCompliance"]
+        )
+
+    @override_settings(PLUGINS_CONFIG=get_plugins_config(compliance_snapshot_retention_days=30))
+    def test_expired_snapshots_are_deleted(self):
+        record_snapshot(date=self.today - datetime.timedelta(days=30))
+        record_snapshot(date=self.today - datetime.timedelta(days=29))
+        record_snapshot()
+        self.assertEqual(
+            set(DataComplianceSnapshot.objects.values_list("date", flat=True)),
+            {self.today - datetime.timedelta(days=29), self.today},
+        )
+
+    def test_get_trend(self):
+        record_snapshot(date=self.today - datetime.timedelta(days=10))
+        DataComplianceSummary.objects.filter(valid=False).update(count=0)
+        record_snapshot()
+        self.assertEqual(
+            get_trend(),
+            [
+                {"date": self.today - datetime.timedelta(days=10), "valid": 11, "invalid": 4, "total": 15},
+                {"date": self.today, "valid": 11, "invalid": 0, "total": 11},
+            ],
+        )
+        self.assertEqual(len(get_trend(days=10)), 1)
+        self.assertEqual(
+            get_trend(days=10, group_by=("content_type",), content_types=["dcim.location"]),
+            [{"date": self.today, "content_type": "dcim.location", "valid": 6, "invalid": 0, "total": 6}],
+        )
+
+
+class DataComplianceTrendAPITestCase(ViewPermissionTestMixin, APITestCase):
+    """
+    Test cases related to the trend action of the DataCompliance API
+    """
+
+    def setUp(self) -> None:
+        super().setUp()
+        create_test_summaries()
+        record_snapshot()
+        self.url = reverse("plugins-api:nautobot_data_validation_engine-api:datacompliance-trend")
+
+    def test_trend(self):
+        self.add_permissions("nautobot_data_validation_engine.view_datacompliance")
+        response = self.client.get(f"{self.url}?group_by=compliance_class_name&days=7", **self.header)
+        self.assertHttpStatus(response, 200)
+        self.assertEqual(
+            response.json()["results"],
+            [
+                {
+                    "date": timezone.localdate().isoformat(),
+                    "compliance_class_name": "DeviceCompliance",
+                    "valid": 5,
+                    "invalid": 0,
+                    "total": 5,
+                },
+                {
+                    "date": timezone.localdate().isoformat(),
+                    "compliance_class_name": "TestCompliance",
+                    "valid": 6,
+                    "invalid": 4,
+                    "total": 10,
+                },
+            ],
+        )
+
+    def test_invalid_days(self):
+        self.add_permissions("nautobot_data_validation_engine.view_datacompliance")
+        response = self.client.get(f"{self.url}?days=0", **self.header)
+        self.assertHttpStatus(response, 400)
+
+
+class ComplianceTrendViewTestCase(ViewPermissionTestMixin, TestCase):
+    """
+    Test cases related to the ComplianceTrendView
+    """
+
+    def setUp(self) -> None:
+        super().setUp()
+        create_test_summaries()
+        record_snapshot()
+        self.url = reverse("plugins:nautobot_data_validation_engine:compliance_trend")
+
+    def test_view(self):
+        self.add_permissions("nautobot_data_validation_engine.view_datacompliance")
+        response = self.client.get(f"{self.url}?days=30&content_type=dcim.location")
+        self.assertHttpStatus(response, 200)
+        content = response.content.decode(response.charset)
+        # Today is the 30th day of the chart, with 60% of valid results.
+        self.assertIn('points="29,40.00"', content)
+        self.assertIn("4 invalid of 10", content)
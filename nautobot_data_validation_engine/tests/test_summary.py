@@ -0,0 +1,219 @@
+"""
+Data Compliance summary test cases
+"""
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.urls import reverse
+from nautobot.core.testing import APITestCase, TestCase
+from nautobot.dcim.models import Location
+
+from nautobot_data_validation_engine.custom_validators import BaseValidator, DataComplianceRule
+from nautobot_data_validation_engine.models import DataCompliance, DataComplianceSummary
+from nautobot_data_validation_engine.results import DataComplianceResultWriter
+from nautobot_data_validation_engine.summary import get_summary, get_top_failing, rebuild_summary
+from nautobot_data_validation_engine.tests.utils import ViewPermissionTestMixin, create_locations, create_summaries
+
+
+class PassingDataComplianceRule(DataComplianceRule):
+    """DataComplianceRule whose results are named after the TestCompliance class."""
+
+    model = "dcim.location"
+    name = "TestCompliance"
+
+    def audit(self):
+        """No exception means the audit passes."""
+
+
+def get_counts():
+    """Return the summary counts, by (compliance class name, validated attribute, valid)."""
+    return {
+        (compliance_class_name, validated_attribute, valid): count
+        for compliance_class_name, validated_attribute, valid, count in DataComplianceSummary.objects.values_list(
+            "compliance_class_name", "validated_attribute", "valid", "count"
+        )
+    }
+
+
+class DataComplianceSummaryTestCase(TestCase):
+    """
+    Test cases related to keeping the DataComplianceSummary counts up to date
+    """
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.locations = create_locations(*({"name": f"Location {i}"} for i in range(5)))
+
+    def write_results(self, *results):
+        """Write the given (location, attribute, valid) results with a DataComplianceResultWriter."""
+        with self.captureOnCommitCallbacks(execute=True):
+            with DataComplianceResultWriter() as writer:
+                for location, attribute, valid in results:
+                    writer.add("TestCompliance", location, attribute, message="", valid=valid)
+
+    def test_written_results_are_counted(self):
+        self.write_results(*((location, "name", location is not self.locations[0]) for location in self.locations))
+        self.assertEqual(get_counts(), {("TestCompliance", "name", True): 4, ("TestCompliance", "name", False): 1})
+
+        # Only a changed validity changes the counts.
+        self.write_results((self.locations[0], "name", True), (self.locations[1], "name", True))
+        self.assertEqual(get_counts(), {("TestCompliance", "name", True): 5})
+
+    def test_deleted_results_are_counted(self):
+        self.write_results(*((location, "name", False) for location in self.locations))
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            DataCompliance.objects.filter(object_id__in=[str(location.pk) for location in self.locations[:3]]).delete()
+        # The counts changed by the deletion of each result are applied together.
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(get_counts(), {("TestCompliance", "name", False): 2})
+
+    def test_saved_results_are_counted(self):
+        content_type = ContentType.objects.get_for_model(Location)
+        with self.captureOnCommitCallbacks(execute=True):
+            result = DataCompliance.objects.create(
+                compliance_class_name="TestCompliance",
+                content_type=content_type,
+                object_id=self.locations[0].pk,
+                validated_attribute="name",
+                valid=False,
+            )
+        self.assertEqual(get_counts(), {("TestCompliance", "name", False): 1})
+        with self.captureOnCommitCallbacks(execute=True):
+            result, _ = DataCompliance.objects.update_or_create(pk=result.pk, defaults={"valid": True})
+        self.assertEqual(get_counts(), {("TestCompliance", "name", True): 1})
+        # Saved again, the result moves from the count it was last saved with.
+        result.valid = False
+        with self.captureOnCommitCallbacks(execute=True):
+            result.save()
+            result.save()
+        self.assertEqual(get_counts(), {("TestCompliance", "name", False): 1})
+
+    def test_compliance_results_are_counted(self):
+        validator = BaseValidator(self.locations[0])
+        with self.captureOnCommitCallbacks(execute=True):
+            result = validator.get_compliance_result(
+                message="Invalid", instance=self.locations[0], attribute="name", valid=False
+            )
+        self.assertFalse(result.valid)
+        self.assertEqual(get_counts(), {("DcimLocationCustomValidator", "name", False): 1})
+        with self.captureOnCommitCallbacks(execute=True):
+            validator.get_compliance_result(message="", instance=self.locations[0], attribute="name", valid=True)
+        self.assertEqual(get_counts(), {("DcimLocationCustomValidator", "name", True): 1})
+
+    def test_results_marked_as_valid_are_counted(self):
+        self.write_results((self.locations[0], "name", False), (self.locations[0], "description", False))
+        with self.captureOnCommitCallbacks(execute=True):
+            PassingDataComplianceRule(self.locations[0]).clean()
+        self.assertEqual(
+            get_counts(),
+            {
+                ("TestCompliance", "name", True): 1,
+                ("TestCompliance", "description", True): 1,
+                ("TestCompliance", "__all__", True): 1,
+            },
+        )
+
+    def test_rolled_back_changes_are_not_counted(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(RuntimeError):
+                with transaction.atomic():
+                    with DataComplianceResultWriter() as writer:
+                        writer.add("TestCompliance", self.locations[0], "name", message="", valid=False)
+                    raise RuntimeError
+            with DataComplianceResultWriter() as writer:
+                writer.add("TestCompliance", self.locations[1], "name", message="", valid=True)
+        self.assertEqual(get_counts(), {("TestCompliance", "name", True): 1})
+
+    def test_rebuild_summary(self):
+        self.write_results(*((location, "name", False) for location in self.locations))
+        DataComplianceSummary.objects.update(count=42)
+        self.assertEqual(rebuild_summary(), 1)
+        self.assertEqual(get_counts(), {("TestCompliance", "name", False): 5})
+
+    def test_get_summary(self):
+        self.write_results(
+            (self.locations[0], "name", False),
+            (self.locations[1], "name", True),
+            (self.locations[0], "description", False),
+            (self.locations[1], "description", False),
+        )
+        self.assertEqual(
+            get_summary(),
+            [
+                {
+                    "content_type": "dcim.location",
+                    "compliance_class_name": "TestCompliance",
+                    "validated_attribute": "description",
+                    "valid": 0,
+                    "invalid": 2,
+                    "total": 2,
+                },
+                {
+                    "content_type": "dcim.location",
+                    "compliance_class_name": "TestCompliance",
+                    "validated_attribute": "name",
+                    "valid": 1,
+                    "invalid": 1,
+                    "total": 2,
+                },
+            ],
+        )
+        self.assertEqual(get_summary(group_by=()), [{"valid": 1, "invalid": 3, "total": 4}])
+        self.assertEqual(get_summary(content_types=["dcim.device"]), [])
+        [top_failing] = get_top_failing(limit=1)
+        self.assertEqual(top_failing["validated_attribute"], "description")
+        self.assertEqual(top_failing["compliance"], 0)
+        self.assertIn("validated_attribute=description", top_failing["url"])
+
+
+class DataComplianceSummaryAPITestCase(ViewPermissionTestMixin, APITestCase):
+    """
+    Test cases related to the summary action of the DataCompliance API
+    """
+
+    def setUp(self) -> None:
+        super().setUp()
+        create_summaries(Location, "TestCompliance", ("name", True, 3), ("name", False, 2))
+        self.url = reverse("plugins-api:nautobot_data_validation_engine-api:datacompliance-summary")
+
+    def test_summary(self):
+        self.add_permissions("nautobot_data_validation_engine.view_datacompliance")
+        response = self.client.get(f"{self.url}?group_by=content_type", **self.header)
+        self.assertHttpStatus(response, 200)
+        self.assertEqual(
+            response.json(),
+            {
+                "valid": 3,
+                "invalid": 2,
+                "total": 5,
+                "results": [{"content_type": "dcim.location", "valid": 3, "invalid": 2, "total": 5}],
+            },
+        )
+
+    def test_unknown_group_by_field(self):
+        self.add_permissions("nautobot_data_validation_engine.view_datacompliance")
+        response = self.client.get(f"{self.url}?group_by=message", **self.header)
+        self.assertHttpStatus(response, 400)
+
+
+class TopFailingRulesViewTestCase(ViewPermissionTestMixin, TestCase):
+    """
+    Test cases related to the TopFailingRulesView and the home page panel
+    """
+
+    def setUp(self) -> None:
+        super().setUp()
+        create_summaries(Location, "TestCompliance", ("name", False, 2))
+        self.url = reverse("plugins:nautobot_data_validation_engine:top_failing_rules")
+
+    def test_view(self):
+        self.add_permissions("nautobot_data_validation_engine.view_datacompliance")
+        response = self.client.get(self.url)
+        self.assertHttpStatus(response, 200)
+        self.assertIn("TestCompliance", response.content.decode(response.charset))
+
+    def test_home_page_panel(self):
+        self.add_permissions("nautobot_data_validation_engine.view_datacompliance")
+        response = self.client.get(reverse("home"))
+        self.assertHttpStatus(response, 200)
+        self.assertIn("2 invalid", response.content.decode(response.charset))
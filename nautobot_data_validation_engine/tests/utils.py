@@ -0,0 +1,47 @@
+"""Helpers shared by the test cases."""
+
+import copy
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from nautobot.dcim.models import Location, LocationType
+from nautobot.extras.models import Status
+
+from nautobot_data_validation_engine.models import DataComplianceSummary
+
+
+def get_plugins_config(**app_settings):
+    """Return the PLUGINS_CONFIG setting with the given settings of the app overridden."""
+    plugins_config = copy.deepcopy(settings.PLUGINS_CONFIG)
+    plugins_config["nautobot_data_validation_engine"].update(app_settings)
+    return plugins_config
+
+
+def create_locations(*locations):
+    """Create active locations of a new "Region" location type, from a dictionary of the fields of each location."""
+    location_type = LocationType.objects.create(name="Region")
+    status = Status.objects.get_by_natural_key("Active")
+    return [Location.objects.create(location_type=location_type, status=status, **fields) for fields in locations]
+
+
+def create_summaries(model, compliance_class_name, *counts):
+    """Create the summary counts of a compliance class on `model`, from (validated attribute, valid, count) tuples."""
+    content_type = ContentType.objects.get_for_model(model)
+    return [
+        DataComplianceSummary.objects.create(
+            content_type=content_type,
+            compliance_class_name=compliance_class_name,
+            validated_attribute=validated_attribute,
+            valid=valid,
+            count=count,
+        )
+        for validated_attribute, valid, count in counts
+    ]
+
+
+class ViewPermissionTestMixin:
+    """Test that the `url` of the test case requires the permission to view the Data Compliance results."""
+
+    def test_requires_permission(self):
+        response = self.client.get(self.url, **getattr(self, "header", {}))
+        self.assertHttpStatus(response, 403)
@@ -28,6 +28,11 @@ urlpatterns = [
         name="datacompliance_notes",
         kwargs={"model": models.DataCompliance},
     ),
+    path(
+        "data-compliance/export/<str:export_format>/",
+        views.DataComplianceExportView.as_view(),
+        name="datacompliance_export",
+    ),
     path(
         "data-compliance/<model>/<uuid:id>/",
         views.DataComplianceObjectView.as_view(),
@@ -81,5 +86,9 @@ urlpatterns = [
         name="uniquevalidationrule_notes",
         kwargs={"model": models.UniqueValidationRule},
     ),
+    path("impact-analysis/<str:model>/", views.RuleImpactAnalysisView.as_view(), name="rule_impact_analysis"),
+    path("slowest-rules/", views.SlowestRulesView.as_view(), name="slowest_rules"),
+    path("top-failing-rules/", views.TopFailingRulesView.as_view(), name="top_failing_rules"),
+    path("compliance-trend/", views.ComplianceTrendView.as_view(), name="compliance_trend"),
     path("docs/", RedirectView.as_view(url=static("nautobot_data_validation_engine/docs/index.html")), name="docs"),
 ] + router.urls
@@ -0,0 +1,13 @@
+"""Helpers shared by the modules of nautobot_data_validation_engine."""
+
+from django.db import transaction
+
+
+def is_on_commit_pending(func, using=None):
+    """Return whether `func` is still registered to run once the current transaction on `using` is committed.
+
+    A rolled back transaction or savepoint drops the callbacks registered within it, and a committed one runs them.
+    """
+    # Each registered callback is kept in a tuple of its savepoint ids, the callback and, on Django 4.2 and later,
+    # whether it is robust.
+    return any(func in hook[1:] for hook in transaction.get_connection(using).run_on_commit)
@@ -1,7 +1,12 @@
 """Django views."""
 
+import copy
+import datetime
+
 from django.apps import apps as global_apps
-from django.contrib.contenttypes.models import ContentType
+from django.http import Http404, HttpResponseBadRequest
+from django.shortcuts import get_object_or_404, render
+from django.utils import timezone
 from django_tables2 import RequestConfig
 from nautobot.apps.views import (
     ObjectBulkDestroyViewMixin,
@@ -9,13 +14,17 @@ from nautobot.apps.views import (
     ObjectDetailViewMixin,
     ObjectListViewMixin,
 )
-from nautobot.core.views.generic import ObjectView
+from nautobot.core.views.generic import GenericView, ObjectView
+from nautobot.core.views.mixins import ContentTypePermissionRequiredMixin
 from nautobot.core.views.paginator import EnhancedPaginator, get_paginate_count
 from nautobot.core.views.viewsets import NautobotUIViewSet
 from nautobot.extras.utils import get_base_template
 
 from nautobot_data_validation_engine import filters, forms, tables
 from nautobot_data_validation_engine.api import serializers
+from nautobot_data_validation_engine.export import EXPORT_FORMATS, get_export_response
+from nautobot_data_validation_engine.impact import get_rule_impact
+from nautobot_data_validation_engine.instrumentation import get_app_settings, rule_statistics
 from nautobot_data_validation_engine.models import (
     DataCompliance,
     MinMaxValidationRule,
@@ -23,6 +32,8 @@ from nautobot_data_validation_engine.models import (
     RequiredValidationRule,
     UniqueValidationRule,
 )
+from nautobot_data_validation_engine.snapshots import MAX_TREND_DAYS, get_trend
+from nautobot_data_validation_engine.summary import get_top_failing
 
 #
 # RegularExpressionValidationRules
@@ -111,6 +122,27 @@ class DataComplianceListView(  # pylint: disable=W0223
     action_buttons = ("export",)
 
 
+class DataComplianceExportView(ContentTypePermissionRequiredMixin, GenericView):
+    """View streaming the DataCompliance objects matching the filters of the list view, as CSV or NDJSON."""
+
+    def get_required_permission(self):
+        """Require the permission to view DataCompliance objects."""
+        return "nautobot_data_validation_engine.view_datacompliance"
+
+    def get(self, request, export_format):
+        """Stream the DataCompliance objects the user can view that match the filters given as query parameters."""
+        if export_format not in EXPORT_FORMATS:
+            raise Http404
+        # The parameters of the list view that aren't filters, e.g. its page, are dropped as the list view does.
+        filter_params = DataComplianceListView().get_filter_params(request)
+        filterset = filters.DataComplianceFilterSet(
+            filter_params, DataCompliance.objects.restrict(request.user, "view")
+        )
+        if not filterset.is_valid():
+            return HttpResponseBadRequest(filterset.errors.as_text())
+        return get_export_response(filterset.qs, export_format)
+
+
 class DataComplianceObjectView(ObjectView):
     """View for the Audit Results tab dynamically generated on specific object detail views."""
 
@@ -125,12 +157,136 @@ class DataComplianceObjectView(ObjectView):
 
     def get_extra_context(self, request, instance):
         """Generate extra context for rendering the DataComplianceObjectView template."""
-        compliance_objects = DataCompliance.objects.filter(
-            content_type=ContentType.objects.get_for_model(instance), object_id=instance.id
-        )
+        compliance_objects = DataCompliance.objects.get_for_object(instance)
         compliance_table = tables.DataComplianceTableTab(compliance_objects)
         base_template = get_base_template(None, instance)
 
         paginate = {"paginator_class": EnhancedPaginator, "per_page": get_paginate_count(request)}
         RequestConfig(request, paginate).configure(compliance_table)
         return {"active_tab": request.GET["tab"], "table": compliance_table, "base_template": base_template}
+
+
+class SlowestRulesView(ContentTypePermissionRequiredMixin, GenericView):
+    """View of the validation rules and Data Compliance classes that took the most time over the recent window."""
+
+    template_name = "nautobot_data_validation_engine/slowest_rules.html"
+
+    def get_required_permission(self):
+        """Require the permission to view DataCompliance objects."""
+        return "nautobot_data_validation_engine.view_datacompliance"
+
+    def get(self, request):
+        """Render the slowest rules over the configured window."""
+        app_settings = get_app_settings()
+        table = tables.SlowestRulesTable(rule_statistics.get_slowest_rules())
+        return render(
+            request,
+            self.template_name,
+            {
+                "table": table,
+                "enabled": app_settings["rule_metrics"],
+                "window": app_settings["rule_statistics_window"],
+            },
+        )
+
+
+class TopFailingRulesView(ContentTypePermissionRequiredMixin, GenericView):
+    """View of the Data Compliance classes and validated attributes with the most invalid results."""
+
+    template_name = "nautobot_data_validation_engine/top_failing_rules.html"
+
+    def get_required_permission(self):
+        """Require the permission to view DataCompliance objects."""
+        return "nautobot_data_validation_engine.view_datacompliance"
+
+    def get(self, request):
+        """Render the compliance classes and attributes with the most invalid results, from the summary counts."""
+        return render(request, self.template_name, {"table": tables.TopFailingRulesTable(get_top_failing())})
+
+
+class ComplianceTrendView(ContentTypePermissionRequiredMixin, GenericView):
+    """View charting the daily percentage of valid Data Compliance results, from the daily snapshots."""
+
+    template_name = "nautobot_data_validation_engine/compliance_trend.html"
+    periods = (30, 90, 365)
+
+    def get_required_permission(self):
+        """Require the permission to view DataCompliance objects."""
+        return "nautobot_data_validation_engine.view_datacompliance"
+
+    def get(self, request):
+        """Render the trend over the last `days` days, optionally of the given content type and compliance class."""
+        try:
+            days = min(max(int(request.GET.get("days", 365)), 1), MAX_TREND_DAYS)
+        except ValueError:
+            days = 365
+        content_type = request.GET.get("content_type", "")
+        compliance_class_name = request.GET.get("compliance_class_name", "")
+        rows = get_trend(
+            days=days,
+            content_types=[content_type] if content_type else None,
+            compliance_class_names=[compliance_class_name] if compliance_class_name else None,
+        )
+        # One unit of the chart's width per day, 100 units of its height for 0 to 100% valid results.
+        first_date = timezone.localdate() - datetime.timedelta(days=days - 1)
+        points = []
+        for row in rows:
+            row["compliance"] = 100 * row["valid"] / row["total"] if row["total"] else 100
+            points.append(f"{(row['date'] - first_date).days},{100 - row['compliance']:.2f}")
+        return render(
+            request,
+            self.template_name,
+            {
+                "rows": rows,
+                "latest": rows[-1] if rows else None,
+                "points": " ".join(points),
+                "days": days,
+                "first_date": first_date,
+                "periods": self.periods,
+                "content_type": content_type,
+                "compliance_class_name": compliance_class_name,
+            },
+        )
+
+
+class RuleImpactAnalysisView(ContentTypePermissionRequiredMixin, GenericView):
+    """View analyzing the impact of the rule proposed by a submitted rule form, without saving it."""
+
+    template_name = "nautobot_data_validation_engine/rule_impact_analysis.html"
+    rule_forms = {
+        "regularexpressionvalidationrule": (RegularExpressionValidationRule, forms.RegularExpressionValidationRuleForm),
+        "minmaxvalidationrule": (MinMaxValidationRule, forms.MinMaxValidationRuleForm),
+    }
+
+    def get_required_permission(self):
+        """Require the permission to view rules of the analyzed model."""
+        if self.kwargs["model"] not in self.rule_forms:
+            raise Http404
+        return f"nautobot_data_validation_engine.view_{self.kwargs['model']}"
+
+    def post(self, request, model):
+        """Validate the submitted rule form and render the impact of the rule it proposes."""
+        model_class, form_class = self.rule_forms[model]
+        instance = None
+        if request.GET.get("pk"):
+            # Copied so that the form doesn't alter a rule held by the caches.
+            instance = copy.copy(
+                get_object_or_404(model_class.objects.restrict(request.user, "view"), pk=request.GET["pk"])
+            )
+        form = form_class(data=request.POST, instance=instance)
+        result = None
+        if form.is_valid():
+            rule = form.instance
+            validated_model = rule.content_type.model_class()
+            queryset = validated_model._default_manager.restrict(request.user, "view")  # pylint: disable=protected-access
+            result = get_rule_impact(rule, queryset=queryset)
+        return render(
+            request,
+            self.template_name,
+            {
+                "form": form,
+                "rule": form.instance,
+                "verbose_name": model_class._meta.verbose_name,
+                "result": result,
+            },
+        )
@@ -822,7 +822,8 @@ def unittest(  # noqa: PLR0913
     verbose=False,
 ):
     """Run Nautobot unit tests."""
-    command = f"coverage run --module nautobot.core.cli test {label}"
+    # Benchmarks are run separately, with `invoke benchmark`
+    command = f"coverage run --module nautobot.core.cli test {label} --exclude-tag=benchmark"
 
     if keepdb:
         command += " --keepdb"
@@ -846,6 +847,26 @@ def unittest_coverage(context):
     run_command(context, command)
 
 
+@task(
+    help={
+        "keepdb": "save and re-use test database between test runs for faster re-testing.",
+        "object_counts": "comma-separated numbers of objects to audit in the job benchmarks (default: 1000,10000,100000)",
+        "output": "JSON file to write the benchmark results to (default: benchmark_results.json)",
+    }
+)
+def benchmark(context, keepdb=False, object_counts="1000,10000,100000", output="benchmark_results.json"):
+    """Run the benchmarks of the app and write their results to a JSON file."""
+    command = "nautobot-server test nautobot_data_validation_engine.tests.test_benchmarks --tag=benchmark"
+    if keepdb:
+        command += " --keepdb"
+
+    run_command(
+        context,
+        command,
+        command_env={"BENCHMARK_OBJECT_COUNTS": object_counts, "BENCHMARK_RESULTS_FILE": output},
+    )
+
+
 @task(
     help={
         "failfast": "fail as soon as a single test fails don't run the entire test suite. (default: False)",